@@ -1,30 +1,117 @@
+import asyncio
 import openai
 import anthropic
-from backend.database.models import AIConversation, NetworkDevice, OperationLog, User
+from backend.database.models import AIConversation, User
 from backend.database.database import get_db
 from sqlalchemy.orm import Session
 import json
 import os
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple, Callable, Awaitable, AsyncIterator
 from datetime import datetime, timezone
 import logging
 
+from backend.ai.request_gate import LLMRequestGate, llm_request_gate
+from backend.ai.response_cache import LLMResponseCache, llm_response_cache, make_cache_key
+from backend.ai.single_flight import SingleFlight, llm_single_flight
+from backend.ai.provider_router import CircuitOpenError, ProviderRouter, llm_router
+from backend.ai.offline_llm import OFFLINE_MODEL, OfflineLLM
+from backend.ai.conversation_context import (
+    ChatTurn, ConversationContextBuilder, SessionContext, conversation_context_builder, extractive_summary
+)
+from backend.ai.system_context import SystemContextCache, load_system_context
+from backend.ai.system_context import system_context_cache as _system_context_cache
+from backend.ai.prompt_cache import PromptCacheStats, anthropic_system
+from backend.ai.prompt_cache import prompt_cache_stats as _prompt_cache_stats
+from backend.utils.config import config
+
 logger = logging.getLogger(__name__)
 
+# Models used for completions
+OPENAI_MODEL = "gpt-4"
+ANTHROPIC_MODEL = "claude-3-sonnet-20240229"
+
+CONFIG_GENERATION_SYSTEM_PROMPT = "You are an expert Cisco network engineer. Generate accurate, secure, and production-ready configurations."
+CONFIG_VALIDATION_SYSTEM_PROMPT = "You are a network security expert. Analyze configurations thoroughly for errors, security issues, and best practices."
+# Static instructions go in the system prompt so every request shares a cacheable prefix
+CONFIG_VALIDATION_INSTRUCTIONS = f"""{CONFIG_VALIDATION_SYSTEM_PROMPT}
+
+Analyze each configuration you are given for:
+1. Syntax errors
+2. Security vulnerabilities
+3. Best practice violations
+4. Potential issues
+
+Provide a structured analysis with:
+- Overall status (valid/invalid/warning)
+- List of issues found
+- Recommendations for improvement
+- Risk level assessment"""
+CHAT_UNAVAILABLE_MESSAGE = "I apologize, but I'm experiencing technical difficulties connecting to AI services. Please check your API configuration and try again later."
+REQUIREMENTS_SYSTEM_PROMPT = "You are a network design expert. Enhance user requirements with technical depth and best practices."
+AUDIT_SYSTEM_PROMPT = "You are an expert Cisco network engineer and security analyst. Provide detailed, structured analysis of network configurations with specific findings, recommendations, and risk assessments."
+TROUBLESHOOTING_SYSTEM_PROMPT = "You are a senior network engineer with expertise in Cisco technologies and network troubleshooting. Provide systematic, actionable troubleshooting guidance."
+BASELINE_SYSTEM_PROMPT = "You are a network architecture expert specializing in Cisco technologies. Generate comprehensive, production-ready baseline configurations."
+CONVERSATION_SUMMARY_SYSTEM_PROMPT = "You maintain a running summary of a network operations chat. Merge the new messages into the existing summary, keeping device names, addresses, configuration decisions and open questions. Reply with the updated summary only."
+
+
+class LLMUnavailableError(Exception):
+    """Raised when no AI provider is configured"""
+
 class AIService:
     """Service class for AI operations matching PRD specifications"""
     
-    def __init__(self):
-        self.openai_client = None
-        self.anthropic_client = None
-        self._initialize_clients()
+    def __init__(
+        self,
+        *,
+        openai_client=None,
+        anthropic_client=None,
+        async_openai_client=None,
+        async_anthropic_client=None,
+        offline_llm: Optional[OfflineLLM] = None,
+        request_gate: Optional[LLMRequestGate] = None,
+        response_cache: Optional[LLMResponseCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        router: Optional[ProviderRouter] = None,
+        context_builder: Optional[ConversationContextBuilder] = None,
+        system_context_cache: Optional[SystemContextCache] = None,
+        prompt_cache_stats: Optional[PromptCacheStats] = None,
+        configure_clients: bool = True
+    ):
+        """Collaborators default to the process-wide instances
+        
+        Provider clients are built from configuration unless some are passed
+        in or configure_clients is False.
+        """
+        self.openai_client = openai_client
+        self.anthropic_client = anthropic_client
+        self.async_openai_client = async_openai_client
+        self.async_anthropic_client = async_anthropic_client
+        self.offline_llm = offline_llm
+        self.request_gate = llm_request_gate if request_gate is None else request_gate
+        self.response_cache = llm_response_cache if response_cache is None else response_cache
+        self.single_flight = llm_single_flight if single_flight is None else single_flight
+        self.router = llm_router if router is None else router
+        self.context_builder = conversation_context_builder if context_builder is None else context_builder
+        self.system_context_cache = _system_context_cache if system_context_cache is None else system_context_cache
+        self.prompt_cache_stats = _prompt_cache_stats if prompt_cache_stats is None else prompt_cache_stats
+        clients = (openai_client, anthropic_client, async_openai_client, async_anthropic_client, offline_llm)
+        if configure_clients and all(client is None for client in clients):
+            self._initialize_clients()
     
     def _initialize_clients(self):
         """Initialize AI service clients"""
+        if config.LLM_OFFLINE_MODE:
+            # Load testing: never reach a real provider
+            self.offline_llm = OfflineLLM(config.LLM_OFFLINE_LATENCY, config.LLM_OFFLINE_TOKENS_PER_SECOND)
+            logger.info("Offline LLM initialized")
+            return
+        
+        timeout = config.LLM_REQUEST_TIMEOUT
         try:
             openai_key = os.environ.get('OPENAI_API_KEY')
             if openai_key and openai_key != 'your_openai_api_key':
-                self.openai_client = openai.OpenAI(api_key=openai_key)
+                self.openai_client = openai.OpenAI(api_key=openai_key, timeout=timeout)
+                self.async_openai_client = openai.AsyncOpenAI(api_key=openai_key, timeout=timeout)
                 logger.info("OpenAI client initialized")
         except Exception as e:
             logger.warning(f"Failed to initialize OpenAI client: {e}")
@@ -32,141 +119,436 @@ class AIService:
         try:
             anthropic_key = os.environ.get('ANTHROPIC_API_KEY')
             if anthropic_key and anthropic_key != 'your_anthropic_api_key':
-                self.anthropic_client = anthropic.Anthropic(api_key=anthropic_key)
+                self.anthropic_client = anthropic.Anthropic(api_key=anthropic_key, timeout=timeout)
+                self.async_anthropic_client = anthropic.AsyncAnthropic(api_key=anthropic_key, timeout=timeout)
                 logger.info("Anthropic client initialized")
         except Exception as e:
             logger.warning(f"Failed to initialize Anthropic client: {e}")
     
-    def get_response(self, user_message: str, session_id: str, user_id: str, db: Session) -> str:
-        """Get AI response to user message"""
+    @property
+    def active_model(self) -> str:
+        """Provider and model that completions are currently sent to"""
+        if self.openai_client:
+            return f"openai:{OPENAI_MODEL}"
+        if self.anthropic_client:
+            return f"anthropic:{ANTHROPIC_MODEL}"
+        if self.offline_llm:
+            return f"offline:{OFFLINE_MODEL}"
+        return "none"
+    
+    def _cache_key(
+        self,
+        provider: str,
+        system: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float
+    ) -> str:
+        model = {'openai': OPENAI_MODEL, 'anthropic': ANTHROPIC_MODEL, 'offline': OFFLINE_MODEL}[provider]
+        return make_cache_key(provider, model, system, messages, temperature, max_tokens)
+    
+    def _cached_request(self, cache_key: str, request: Callable[[], str]) -> str:
+        """Answer from the response cache, or join/start the single in-flight request for the key"""
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        def call():
+            text = request()
+            self.response_cache.put(cache_key, text)
+            return text
+        return self.single_flight.do(cache_key, call)
+    
+    async def _cached_request_async(self, cache_key: str, request: Callable[[], Awaitable[str]]) -> str:
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        async def call():
+            text = await request()
+            self.response_cache.put(cache_key, text)
+            return text
+        return await self.single_flight.do_async(cache_key, call)
+    
+    def _complete(
+        self,
+        system: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float
+    ) -> str:
+        """Send a completion to the healthiest configured provider, failing over to the next on errors
+        
+        Identical requests are answered from the response cache, and concurrent
+        identical requests share one upstream call.
+        """
+        attempts = []
+        
+        if self.openai_client:
+            def openai_request():
+                response = self.openai_client.chat.completions.create(
+                    model=OPENAI_MODEL,
+                    messages=[{"role": "system", "content": system}] + messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature
+                )
+                self.prompt_cache_stats.record_openai(getattr(response, 'usage', None))
+                return response.choices[0].message.content
+            openai_key = self._cache_key('openai', system, messages, max_tokens, temperature)
+            attempts.append(('openai', lambda: self._cached_request(
+                openai_key, self.router.measured('openai', openai_request)
+            )))
+        
+        if self.anthropic_client:
+            def anthropic_request():
+                response = self.anthropic_client.messages.create(
+                    model=ANTHROPIC_MODEL,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    messages=messages,
+                    system=anthropic_system(system, config.LLM_PROMPT_CACHE_ENABLED)
+                )
+                self.prompt_cache_stats.record_anthropic(getattr(response, 'usage', None))
+                return response.content[0].text
+            anthropic_key = self._cache_key('anthropic', system, messages, max_tokens, temperature)
+            attempts.append(('anthropic', lambda: self._cached_request(
+                anthropic_key, self.router.measured('anthropic', anthropic_request)
+            )))
+        
+        if self.offline_llm:
+            offline_key = self._cache_key('offline', system, messages, max_tokens, temperature)
+            attempts.append(('offline', lambda: self._cached_request(
+                offline_key, self.router.measured('offline', lambda: self.offline_llm.complete(system, messages))
+            )))
+        
+        if not attempts:
+            raise LLMUnavailableError("No AI service available")
+        return self.router.call(attempts)
+    
+    async def _complete_async(
+        self,
+        system: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float
+    ) -> str:
+        """Async _complete that waits for a request slot and enforces the response timeout
+        
+        With hedging enabled, a request running past the provider's p95 latency
+        is raced against the next provider. Cancelling the caller cancels the
+        in-flight HTTP request once no other caller is waiting on it.
+        """
+        attempts = []
+        
+        if self.async_openai_client:
+            async def openai_request():
+                response = await self.request_gate.run(lambda: self.async_openai_client.chat.completions.create(
+                    model=OPENAI_MODEL,
+                    messages=[{"role": "system", "content": system}] + messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature
+                ))
+                self.prompt_cache_stats.record_openai(getattr(response, 'usage', None))
+                return response.choices[0].message.content
+            openai_key = self._cache_key('openai', system, messages, max_tokens, temperature)
+            attempts.append(('openai', lambda: self._cached_request_async(
+                openai_key, self.router.measured_async('openai', openai_request)
+            )))
+        
+        if self.async_anthropic_client:
+            async def anthropic_request():
+                response = await self.request_gate.run(lambda: self.async_anthropic_client.messages.create(
+                    model=ANTHROPIC_MODEL,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    messages=messages,
+                    system=anthropic_system(system, config.LLM_PROMPT_CACHE_ENABLED)
+                ))
+                self.prompt_cache_stats.record_anthropic(getattr(response, 'usage', None))
+                return response.content[0].text
+            anthropic_key = self._cache_key('anthropic', system, messages, max_tokens, temperature)
+            attempts.append(('anthropic', lambda: self._cached_request_async(
+                anthropic_key, self.router.measured_async('anthropic', anthropic_request)
+            )))
+        
+        if self.offline_llm:
+            async def offline_request():
+                return await self.request_gate.run(lambda: self.offline_llm.complete_async(system, messages))
+            offline_key = self._cache_key('offline', system, messages, max_tokens, temperature)
+            attempts.append(('offline', lambda: self._cached_request_async(
+                offline_key, self.router.measured_async('offline', offline_request)
+            )))
+        
+        if not attempts:
+            raise LLMUnavailableError("No AI service available")
+        return await self.router.call_async(attempts)
+    
+    async def _iter_with_timeout(self, deltas: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Re-yield a stream, failing if the provider goes quiet for longer than the response timeout"""
+        while True:
+            try:
+                delta = await asyncio.wait_for(deltas.__anext__(), self.request_gate.timeout)
+            except StopAsyncIteration:
+                return
+            yield delta
+    
+    async def _openai_stream(
+        self, system: str, messages: List[Dict[str, str]], max_tokens: int, temperature: float
+    ) -> AsyncIterator[str]:
+        stream = await self.async_openai_client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=[{"role": "system", "content": system}] + messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
         try:
-            # Get conversation context
-            context = self._get_conversation_context(session_id, user_id, db)
-            
-            # Get system context (device info, recent operations)
-            system_context = self._get_system_context(user_id, db)
-            
-            # Prepare messages for AI
-            messages = [
-                {
-                    "role": "system",
-                    "content": f"""You are a GENAI network assistant specialized in Cisco network automation. 
-                    You help with network configuration, troubleshooting, and automation tasks.
-                    
-                    Current system context:
-                    {json.dumps(system_context, indent=2)}
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                elif getattr(chunk, 'usage', None):
+                    # Sent in a final chunk without choices
+                    self.prompt_cache_stats.record_openai(chunk.usage)
+        finally:
+            await stream.close()
+    
+    async def _anthropic_stream(
+        self, system: str, messages: List[Dict[str, str]], max_tokens: int, temperature: float
+    ) -> AsyncIterator[str]:
+        stream = await self.async_anthropic_client.messages.create(
+            model=ANTHROPIC_MODEL,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=messages,
+            system=anthropic_system(system, config.LLM_PROMPT_CACHE_ENABLED),
+            stream=True
+        )
+        try:
+            async for event in stream:
+                if event.type == "content_block_delta" and getattr(event.delta, "text", None):
+                    yield event.delta.text
+                elif event.type == "message_start" and getattr(event, "message", None):
+                    self.prompt_cache_stats.record_anthropic(event.message.usage)
+        finally:
+            await stream.close()
+    
+    async def _stream_complete_async(
+        self,
+        system: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float
+    ) -> AsyncIterator[str]:
+        """Streaming _complete_async yielding text deltas as the provider produces them
+        
+        Providers are tried in health order, failing over only before the first
+        token; a cached response is yielded as a single delta.
+        """
+        streams = {}
+        if self.async_openai_client:
+            streams['openai'] = self._openai_stream
+        if self.async_anthropic_client:
+            streams['anthropic'] = self._anthropic_stream
+        if self.offline_llm:
+            streams['offline'] = lambda system, messages, max_tokens, temperature: self.offline_llm.stream(system, messages)
+        if not streams:
+            raise LLMUnavailableError("No AI service available")
+        providers = self.router.select(list(streams))
+        if not providers:
+            raise CircuitOpenError(f"All LLM provider circuits are open: {', '.join(streams)}")
+        last_error = None
+        
+        for provider in providers:
+            open_stream = streams[provider]
+            cache_key = self._cache_key(provider, system, messages, max_tokens, temperature)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+            
+            parts = []
+            try:
+                async with self.request_gate.slot():
+                    deltas = open_stream(system, messages, max_tokens, temperature)
+                    try:
+                        async for delta in self._iter_with_timeout(deltas):
+                            parts.append(delta)
+                            yield delta
+                    finally:
+                        await deltas.aclose()
+            except Exception as e:
+                self.router.record_failure(provider)
+                if parts:
+                    raise
+                logger.warning(f"{provider} streaming request failed: {e}")
+                last_error = e
+                continue
+            
+            self.router.record_success(provider)
+            self.response_cache.put(cache_key, ''.join(parts))
+            return
+        
+        raise last_error
+    
+    def _summary_prompt(self, previous: str, turns: List[ChatTurn]) -> str:
+        transcript = '\n'.join(f"{turn.role}: {turn.content}" for turn in turns)
+        return f"""Existing summary:
+        {previous or '(none)'}
+        
+        New messages:
+        {transcript}
+        
+        Write the updated summary in at most {config.CHAT_SUMMARY_MAX_TOKENS * 3 // 4} words."""
+    
+    def _fold_summary(
+        self, db: Session, context: SessionContext, previous: str, summarized: List[ChatTurn], summary: Optional[str]
+    ):
+        """Store the updated rolling summary, falling back to an extractive one
+        
+        previous and summarized are the snapshot the summary was written from,
+        so turns evicted by a concurrent load stay pending for the next fold.
+        """
+        if not summary:
+            summary = extractive_summary(previous, summarized, config.CHAT_SUMMARY_MAX_TOKENS)
+        self.context_builder.save_summary(db, context, summary.strip(), summarized)
+    
+    def _load_conversation_context(self, session_id: str, user_id: str, db: Session) -> SessionContext:
+        """Session context with turns evicted from the window folded into the summary"""
+        try:
+            context = self.context_builder.load(db, session_id, user_id)
+        except Exception as e:
+            logger.error(f"Error getting conversation context: {e}")
+            return SessionContext(session_id, user_id)
+        previous, pending = context.pending_snapshot()
+        if pending:
+            summary = None
+            try:
+                summary = self._complete(
+                    CONVERSATION_SUMMARY_SYSTEM_PROMPT,
+                    [{"role": "user", "content": self._summary_prompt(previous, pending)}],
+                    max_tokens=config.CHAT_SUMMARY_MAX_TOKENS, temperature=0.2
+                )
+            except Exception as e:
+                logger.warning(f"Conversation summary failed, using extractive summary: {e}")
+            self._fold_summary(db, context, previous, pending, summary)
+        return context
+    
+    async def _load_conversation_context_async(self, session_id: str, user_id: str, db: Session) -> SessionContext:
+        try:
+            context = self.context_builder.load(db, session_id, user_id)
+        except Exception as e:
+            logger.error(f"Error getting conversation context: {e}")
+            return SessionContext(session_id, user_id)
+        previous, pending = context.pending_snapshot()
+        if pending:
+            summary = None
+            try:
+                summary = await self._complete_async(
+                    CONVERSATION_SUMMARY_SYSTEM_PROMPT,
+                    [{"role": "user", "content": self._summary_prompt(previous, pending)}],
+                    max_tokens=config.CHAT_SUMMARY_MAX_TOKENS, temperature=0.2
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Conversation summary failed, using extractive summary: {e}")
+            self._fold_summary(db, context, previous, pending, summary)
+        return context
+    
+    def _chat_messages(
+        self, user_message: str, user_id: str, context: SessionContext, db: Session
+    ) -> Tuple[str, List[Dict[str, str]]]:
+        # Get system context (device info, recent operations)
+        system_context = self._get_system_context(user_id, db)
+        
+        earlier = f"""
                     
+                    Summary of earlier conversation:
+                    {context.summary}""" if context.summary else ""
+        
+        # Fixed instructions first, then the per-user context, then the per-session summary,
+        # so consecutive turns share the longest possible cached prefix
+        system = f"""You are a GENAI network assistant specialized in Cisco network automation. 
+                    You help with network configuration, troubleshooting, and automation tasks.
                     Provide helpful, accurate responses about network operations. If you need to perform 
                     actions on devices, explain what you would do but note that actual device operations 
-                    require manual confirmation."""
-                }
-            ]
-            
-            # Add conversation history
-            for msg in context:
-                messages.append({
-                    "role": msg.message_role,
-                    "content": msg.message_content
-                })
-            
-            # Add current user message
-            messages.append({
-                "role": "user",
-                "content": user_message
-            })
-            
-            # Try OpenAI first
-            if self.openai_client:
-                try:
-                    response = self.openai_client.chat.completions.create(
-                        model="gpt-4",
-                        messages=messages,
-                        max_tokens=1000,
-                        temperature=0.7
-                    )
-                    return response.choices[0].message.content
-                except Exception as e:
-                    logger.warning(f"OpenAI request failed: {e}")
-            
-            # Fallback to Anthropic Claude
-            if self.anthropic_client:
-                try:
-                    response = self.anthropic_client.messages.create(
-                        model="claude-3-sonnet-20240229",
-                        max_tokens=1000,
-                        messages=messages[1:],  # Claude doesn't need system message in messages array
-                        system=messages[0]["content"]
-                    )
-                    return response.content[0].text
-                except Exception as e:
-                    logger.warning(f"Anthropic request failed: {e}")
-            
-            # Fallback response
-            return "I apologize, but I'm experiencing technical difficulties connecting to AI services. Please check your API configuration and try again later."
-            
+                    require manual confirmation.
+                    
+                    Current system context:
+                    {system_context}{earlier}"""
+        
+        # Recent turns within the token budget
+        messages = context.messages()
+        
+        # Add current user message unless it was already saved to the session
+        if not messages or messages[-1] != {"role": "user", "content": user_message}:
+            messages.append({"role": "user", "content": user_message})
+        return system, messages
+    
+    def _build_chat_messages(
+        self, user_message: str, session_id: str, user_id: str, db: Session
+    ) -> Tuple[str, List[Dict[str, str]]]:
+        """System prompt and message history for a chat turn"""
+        context = self._load_conversation_context(session_id, user_id, db)
+        return self._chat_messages(user_message, user_id, context, db)
+    
+    async def _build_chat_messages_async(
+        self, user_message: str, session_id: str, user_id: str, db: Session
+    ) -> Tuple[str, List[Dict[str, str]]]:
+        context = await self._load_conversation_context_async(session_id, user_id, db)
+        return self._chat_messages(user_message, user_id, context, db)
+    
+    def get_response(self, user_message: str, session_id: str, user_id: str, db: Session) -> str:
+        """Get AI response to user message"""
+        try:
+            system, messages = self._build_chat_messages(user_message, session_id, user_id, db)
+            return self._complete(system, messages, max_tokens=1000, temperature=0.7)
         except Exception as e:
             logger.error(f"AI service error: {e}")
-            return f"An error occurred while processing your request: {str(e)}"
+            return CHAT_UNAVAILABLE_MESSAGE
     
-    def _get_conversation_context(self, session_id: str, user_id: str, db: Session, limit: int = 10) -> List[AIConversation]:
-        """Get recent conversation context"""
+    async def get_response_async(self, user_message: str, session_id: str, user_id: str, db: Session) -> str:
+        """Get AI response to user message without blocking the event loop"""
         try:
-            return db.query(AIConversation).filter(
-                AIConversation.session_id == session_id,
-                AIConversation.user_id == user_id
-            ).order_by(
-                AIConversation.created_at.desc()
-            ).limit(limit).all()[::-1]  # Reverse to get chronological order
+            system, messages = await self._build_chat_messages_async(user_message, session_id, user_id, db)
+            return await self._complete_async(system, messages, max_tokens=1000, temperature=0.7)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.error(f"Error getting conversation context: {e}")
-            return []
+            logger.error(f"AI service error: {e}")
+            return CHAT_UNAVAILABLE_MESSAGE
     
-    def _get_system_context(self, user_id: str, db: Session) -> Dict[str, Any]:
-        """Get current system context for AI"""
+    async def stream_response_async(
+        self, user_message: str, session_id: str, user_id: str, db: Session
+    ) -> AsyncIterator[str]:
+        """Stream the AI response to a user message as text deltas
+        
+        If no provider answers, the unavailable message is yielded instead;
+        errors after the first delta are raised to the caller.
+        """
+        system, messages = await self._build_chat_messages_async(user_message, session_id, user_id, db)
+        started = False
         try:
-            # Get device information for this user
-            devices = db.query(NetworkDevice).filter(NetworkDevice.owner_id == user_id).all()
-            device_summary = []
-            
-            for device in devices:
-                device_summary.append({
-                    'name': device.name,
-                    'ip': device.ip_address,
-                    'model': device.model,
-                    'status': device.status,
-                    'uptime': device.uptime_formatted
-                })
-            
-            # Get recent operations for this user
-            recent_operations = db.query(OperationLog).filter(
-                OperationLog.user_id == user_id
-            ).order_by(
-                OperationLog.created_at.desc()
-            ).limit(5).all()
-            
-            operation_summary = []
-            for op in recent_operations:
-                operation_summary.append({
-                    'type': op.operation_type,
-                    'status': op.status,
-                    'device': op.device.name if op.device else 'Unknown',
-                    'timestamp': op.created_at.isoformat(),
-                    'error': op.error_message
-                })
-            
-            return {
-                'devices': device_summary,
-                'recent_operations': operation_summary,
-                'total_devices': len(devices),
-                'online_devices': len([d for d in devices if d.status == 'online'])
-            }
+            async for delta in self._stream_complete_async(system, messages, max_tokens=1000, temperature=0.7):
+                started = True
+                yield delta
+        except Exception as e:
+            if started:
+                raise
+            logger.error(f"AI service error: {e}")
+            yield CHAT_UNAVAILABLE_MESSAGE
+    
+    def _get_system_context(self, user_id: str, db: Session) -> str:
+        """Compact device and recent-operation summary for the chat system prompt"""
+        try:
+            return self.system_context_cache.get(user_id, lambda: load_system_context(db, user_id)).text
         except Exception as e:
             logger.error(f"Error getting system context: {e}")
-            return {'devices': [], 'recent_operations': [], 'total_devices': 0, 'online_devices': 0}
+            return "Devices: 0 total, 0 online"
     
-    def generate_configuration(self, config_type: str, parameters: Dict[str, Any]) -> str:
-        """Generate network configuration using AI"""
-        prompt = f"""Generate a Cisco IOS configuration for {config_type} with the following parameters:
+    def _configuration_prompt(self, config_type: str, parameters: Dict[str, Any]) -> str:
+        return f"""Generate a Cisco IOS configuration for {config_type} with the following parameters:
         {json.dumps(parameters, indent=2)}
         
         Provide a complete, production-ready configuration with:
@@ -176,54 +558,61 @@ class AIService:
         4. Error handling where applicable
         
         Format the response as a code block with proper indentation."""
+    
+    def generate_configuration(self, config_type: str, parameters: Dict[str, Any]) -> str:
+        """Generate network configuration using AI"""
+        prompt = self._configuration_prompt(config_type, parameters)
         
         try:
-            if self.openai_client:
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are an expert Cisco network engineer. Generate accurate, secure, and production-ready configurations."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    max_tokens=2000,
-                    temperature=0.3  # Lower temperature for more consistent technical output
-                )
-                return response.choices[0].message.content
-            
-            elif self.anthropic_client:
-                response = self.anthropic_client.messages.create(
-                    model="claude-3-sonnet-20240229",
-                    max_tokens=2000,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    system="You are an expert Cisco network engineer. Generate accurate, secure, and production-ready configurations."
-                )
-                return response.content[0].text
-            
-            else:
-                raise Exception("No AI service available")
-                
+            # Lower temperature for more consistent technical output
+            return self._complete(
+                CONFIG_GENERATION_SYSTEM_PROMPT,
+                [{"role": "user", "content": prompt}],
+                max_tokens=2000,
+                temperature=0.3
+            )
         except Exception as e:
             logger.error(f"Configuration generation error: {e}")
             raise Exception(f"Failed to generate configuration: {str(e)}")
     
-    async def generate_configuration_async(self, requirements: Dict[str, Any], device_type: str) -> str:
+    async def generate_configuration_async(
+        self,
+        requirements: Dict[str, Any],
+        device_type: str,
+        config_type: str = "ai_generated"
+    ) -> str:
         """Asynchronous configuration generation using AI"""
-        return self.generate_configuration("ai_generated", requirements)
+        prompt = self._configuration_prompt(config_type, requirements)
+        
+        try:
+            return await self._complete_async(
+                CONFIG_GENERATION_SYSTEM_PROMPT,
+                [{"role": "user", "content": prompt}],
+                max_tokens=2000,
+                temperature=0.3
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Configuration generation error: {e}")
+            raise Exception(f"Failed to generate configuration: {str(e)}")
 
     async def validate_configuration_async(self, config: str, device_type: str, validation_level: str) -> Dict[str, Any]:
         """Asynchronous configuration validation"""
-        validation = self.validate_configuration(config, device_type)
+        prompt = self._validation_prompt(config, device_type)
+        
+        try:
+            analysis_text = await self._complete_async(
+                CONFIG_VALIDATION_INSTRUCTIONS,
+                [{"role": "user", "content": prompt}],
+                max_tokens=1500,
+                temperature=0.2
+            )
+            validation = self._validation_result(analysis_text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            validation = self._validation_error(e)
         validation['level'] = validation_level
         return validation
 
@@ -253,26 +642,17 @@ class AIService:
             4. Implementation steps
             """
             
-            if self.openai_client:
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a network design expert. Enhance user requirements with technical depth and best practices."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
+            if self.async_openai_client or self.async_anthropic_client or self.offline_llm:
+                enhanced = await self._complete_async(
+                    REQUIREMENTS_SYSTEM_PROMPT,
+                    [{"role": "user", "content": prompt}],
                     max_tokens=1500,
                     temperature=0.4
                 )
                 
                 return {
                     "original": requirements,
-                    "enhanced": response.choices[0].message.content,
+                    "enhanced": enhanced,
                     "device_type": device_type,
                     "parameters": params
                 }
@@ -284,6 +664,8 @@ class AIService:
                 "device_type": device_type,
                 "parameters": params
             }
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logger.error(f"Requirements enhancement error: {e}")
             return {
@@ -293,7 +675,10 @@ class AIService:
                 "parameters": params
             }
 
-    def save_conversation(self, user_id: str, session_id: str, role: str, content: str, db: Session, metadata: Optional[Dict] = None) -> AIConversation:
+    def save_conversation(
+        self, user_id: str, session_id: str, role: str, content: str, db: Session,
+        metadata: Optional[Dict] = None, message_id: Optional[str] = None
+    ) -> AIConversation:
         try:
             conversation = AIConversation(
                 user_id=user_id,
@@ -302,6 +687,8 @@ class AIService:
                 message_content=content,
                 metadata=metadata
             )
+            if message_id:
+                conversation.id = message_id
             db.add(conversation)
             db.commit()
             db.refresh(conversation)
@@ -311,105 +698,70 @@ class AIService:
             db.rollback()
             raise
     
-    def validate_configuration(self, config_content: str, device_type: str = "ios") -> Dict[str, Any]:
-        """Validate network configuration using AI"""
-        prompt = f"""Analyze the following {device_type.upper()} configuration for:
-        1. Syntax errors
-        2. Security vulnerabilities
-        3. Best practice violations
-        4. Potential issues
-        
-        Configuration:
+    def _validation_prompt(self, config_content: str, device_type: str) -> str:
+        """Variable part of a validation request; the instructions are in CONFIG_VALIDATION_INSTRUCTIONS"""
+        return f"""Validate the following configuration (device type: {device_type.upper()}):
         ```
         {config_content}
-        ```
-        
-        Provide a structured analysis with:
-        - Overall status (valid/invalid/warning)
-        - List of issues found
-        - Recommendations for improvement
-        - Risk level assessment
-        """
-        
-        try:
-            if self.openai_client:
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a network security expert. Analyze configurations thoroughly for errors, security issues, and best practices."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    max_tokens=1500,
-                    temperature=0.2
-                )
-                
-                # Parse response and structure it
-                analysis_text = response.choices[0].message.content
-                return {
-                    'status': 'analyzed',
-                    'analysis': analysis_text,
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                }
-            
-            else:
-                return {
-                    'status': 'error',
-                    'message': 'AI validation service unavailable',
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                }
-                
-        except Exception as e:
-            logger.error(f"Configuration validation error: {e}")
+        ```"""
+    
+    def _validation_result(self, analysis_text: str) -> Dict[str, Any]:
+        return {
+            'status': 'analyzed',
+            'analysis': analysis_text,
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        }
+    
+    def _validation_error(self, error: Exception) -> Dict[str, Any]:
+        if isinstance(error, LLMUnavailableError):
             return {
                 'status': 'error',
-                'message': f'Validation failed: {str(e)}',
+                'message': 'AI validation service unavailable',
                 'timestamp': datetime.now(timezone.utc).isoformat()
             }
+        logger.error(f"Configuration validation error: {error}")
+        return {
+            'status': 'error',
+            'message': f'Validation failed: {str(error)}',
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        }
     
-    def get_configuration_analysis(self, prompt: str) -> str:
-        """Get AI analysis for configuration audit"""
+    def validate_configuration(self, config_content: str, device_type: str = "ios") -> Dict[str, Any]:
+        """Validate network configuration using AI"""
+        prompt = self._validation_prompt(config_content, device_type)
+        
         try:
-            if self.openai_client:
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are an expert Cisco network engineer and security analyst. Provide detailed, structured analysis of network configurations with specific findings, recommendations, and risk assessments."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    max_tokens=2000,
-                    temperature=0.3
-                )
-                return response.choices[0].message.content
-            
-            elif self.anthropic_client:
-                response = self.anthropic_client.messages.create(
-                    model="claude-3-sonnet-20240229",
-                    max_tokens=2000,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    system="You are an expert Cisco network engineer and security analyst. Provide detailed, structured analysis of network configurations with specific findings, recommendations, and risk assessments."
-                )
-                return response.content[0].text
-            
-            else:
-                return "AI configuration analysis service is currently unavailable. Please check your API configuration."
-                
+            analysis_text = self._complete(
+                CONFIG_VALIDATION_INSTRUCTIONS,
+                [{"role": "user", "content": prompt}],
+                max_tokens=1500,
+                temperature=0.2
+            )
+            return self._validation_result(analysis_text)
+        except Exception as e:
+            return self._validation_error(e)
+    
+    def analyze_configuration(self, prompt: str, instructions: Optional[str] = None) -> str:
+        """Get AI analysis for configuration audit, raising on failure
+        
+        Static instructions are appended to the system prompt, ahead of the
+        per-device prompt, so audits of many devices share a cached prefix.
+        Raises LLMUnavailableError when no provider is configured.
+        """
+        system = f"{AUDIT_SYSTEM_PROMPT}\n\n{instructions}" if instructions else AUDIT_SYSTEM_PROMPT
+        return self._complete(
+            system,
+            [{"role": "user", "content": prompt}],
+            max_tokens=2000,
+            temperature=0.3
+        )
+    
+    def get_configuration_analysis(self, prompt: str, instructions: Optional[str] = None) -> str:
+        """Get AI analysis for configuration audit, with failures described in the text"""
+        try:
+            return self.analyze_configuration(prompt, instructions)
+        except LLMUnavailableError:
+            return "AI configuration analysis service is currently unavailable. Please check your API configuration."
         except Exception as e:
             logger.error(f"Configuration analysis error: {e}")
             return f"Configuration analysis failed: {str(e)}"
@@ -435,59 +787,26 @@ class AIService:
             Format the response as JSON with structured diagnostic information.
             """
             
-            if self.openai_client:
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a senior network engineer with expertise in Cisco technologies and network troubleshooting. Provide systematic, actionable troubleshooting guidance."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    max_tokens=2000,
-                    temperature=0.4
-                )
-                
-                analysis_text = response.choices[0].message.content
-                
-                return {
-                    'status': 'completed',
-                    'analysis': analysis_text,
-                    'confidence': 'high',
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                }
+            analysis_text = self._complete(
+                TROUBLESHOOTING_SYSTEM_PROMPT,
+                [{"role": "user", "content": prompt}],
+                max_tokens=2000,
+                temperature=0.4
+            )
             
-            elif self.anthropic_client:
-                response = self.anthropic_client.messages.create(
-                    model="claude-3-sonnet-20240229",
-                    max_tokens=2000,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    system="You are a senior network engineer with expertise in Cisco technologies and network troubleshooting. Provide systematic, actionable troubleshooting guidance."
-                )
-                
-                return {
-                    'status': 'completed',
-                    'analysis': response.content[0].text,
-                    'confidence': 'high',
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                }
+            return {
+                'status': 'completed',
+                'analysis': analysis_text,
+                'confidence': 'high',
+                'timestamp': datetime.now(timezone.utc).isoformat()
+            }
             
-            else:
-                return {
-                    'status': 'error',
-                    'message': 'AI troubleshooting service unavailable',
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                }
-                
+        except LLMUnavailableError:
+            return {
+                'status': 'error',
+                'message': 'AI troubleshooting service unavailable',
+                'timestamp': datetime.now(timezone.utc).isoformat()
+            }
         except Exception as e:
             logger.error(f"Troubleshooting analysis error: {e}")
             return {
@@ -514,57 +833,26 @@ class AIService:
             Format as structured JSON with separate sections for each recommendation category.
             """
             
-            if self.openai_client:
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a network architecture expert specializing in Cisco technologies. Generate comprehensive, production-ready baseline configurations."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    max_tokens=2500,
-                    temperature=0.3
-                )
-                
-                return {
-                    'status': 'completed',
-                    'recommendations': response.choices[0].message.content,
-                    'confidence': 'high',
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                }
+            recommendations = self._complete(
+                BASELINE_SYSTEM_PROMPT,
+                [{"role": "user", "content": prompt}],
+                max_tokens=2500,
+                temperature=0.3
+            )
             
-            elif self.anthropic_client:
-                response = self.anthropic_client.messages.create(
-                    model="claude-3-sonnet-20240229",
-                    max_tokens=2500,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    system="You are a network architecture expert specializing in Cisco technologies. Generate comprehensive, production-ready baseline configurations."
-                )
-                
-                return {
-                    'status': 'completed',
-                    'recommendations': response.content[0].text,
-                    'confidence': 'high',
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                }
+            return {
+                'status': 'completed',
+                'recommendations': recommendations,
+                'confidence': 'high',
+                'timestamp': datetime.now(timezone.utc).isoformat()
+            }
             
-            else:
-                return {
-                    'status': 'error',
-                    'message': 'AI baseline service unavailable',
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                }
-                
+        except LLMUnavailableError:
+            return {
+                'status': 'error',
+                'message': 'AI baseline service unavailable',
+                'timestamp': datetime.now(timezone.utc).isoformat()
+            }
         except Exception as e:
             logger.error(f"Baseline generation error: {e}")
             return {
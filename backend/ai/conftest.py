@@ -0,0 +1,150 @@
+"""
+Shared fixtures for AI service tests: fake provider clients and an
+AIService wired to fresh (non-global) collaborators
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from backend.ai.ai_service import AIService
+from backend.ai.conversation_context import ConversationContextBuilder
+from backend.ai.prompt_cache import PromptCacheStats
+from backend.ai.provider_router import ProviderRouter
+from backend.ai.request_gate import LLMRequestGate
+from backend.ai.response_cache import LLMResponseCache
+from backend.ai.single_flight import SingleFlight
+from backend.ai.system_context import SystemContextCache
+
+
+class FakeStream:
+    """Async iterable of provider stream events that records being closed"""
+
+    def __init__(self, events):
+        self.events = events
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for event in self.events:
+            await asyncio.sleep(0)
+            yield event
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeClient:
+    """Records requests and answers with a fixed reply, stream tokens or an error"""
+
+    def __init__(self, reply='ok', tokens=None, error=None, delay=0.0, usage=None):
+        self.reply = reply
+        self.tokens = tokens or []
+        self.error = error
+        self.delay = delay
+        self.usage = usage
+        self.requests = []
+        self.streams = []
+
+    @property
+    def calls(self) -> int:
+        return len(self.requests)
+
+    def _respond(self, kwargs):
+        self.requests.append(kwargs)
+        if self.error:
+            raise self.error
+        if kwargs.get('stream'):
+            stream = FakeStream(self._stream_events())
+            self.streams.append(stream)
+            return stream
+        return self._response()
+
+
+class FakeOpenAIMixin:
+    def _response(self):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.reply))], usage=self.usage)
+
+    def _stream_events(self):
+        chunks = [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=t))]) for t in self.tokens]
+        return chunks + [SimpleNamespace(choices=[], usage=self.usage)]
+
+
+class FakeAnthropicMixin:
+    def _response(self):
+        return SimpleNamespace(content=[SimpleNamespace(text=self.reply)], usage=self.usage)
+
+    def _stream_events(self):
+        events = [SimpleNamespace(type='message_start')]
+        events += [SimpleNamespace(type='content_block_delta', delta=SimpleNamespace(text=t)) for t in self.tokens]
+        return events + [SimpleNamespace(type='message_stop')]
+
+
+class FakeOpenAI(FakeOpenAIMixin, FakeClient):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        time.sleep(self.delay)
+        return self._respond(kwargs)
+
+
+class FakeAsyncOpenAI(FakeOpenAI):
+    async def create(self, **kwargs):
+        await asyncio.sleep(self.delay)
+        return self._respond(kwargs)
+
+
+class FakeAnthropic(FakeAnthropicMixin, FakeClient):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.messages = SimpleNamespace(create=self.create)
+
+    def create(self, **kwargs):
+        time.sleep(self.delay)
+        return self._respond(kwargs)
+
+
+class FakeAsyncAnthropic(FakeAnthropic):
+    async def create(self, **kwargs):
+        await asyncio.sleep(self.delay)
+        return self._respond(kwargs)
+
+
+@pytest.fixture
+def llm_clients():
+    """Fake provider client classes"""
+    return SimpleNamespace(
+        OpenAI=FakeOpenAI,
+        AsyncOpenAI=FakeAsyncOpenAI,
+        Anthropic=FakeAnthropic,
+        AsyncAnthropic=FakeAsyncAnthropic
+    )
+
+
+@pytest.fixture
+def make_ai_service():
+    """Factory for AIService instances that share no state with the global one
+
+    Keyword arguments (clients or collaborators) override the fresh defaults;
+    provider clients are never built from the environment unless
+    configure_clients=True.
+    """
+    def make(**overrides):
+        collaborators = dict(
+            configure_clients=False,
+            request_gate=LLMRequestGate(max_concurrent=2, timeout=5),
+            response_cache=LLMResponseCache(),
+            single_flight=SingleFlight(),
+            router=ProviderRouter(),
+            context_builder=ConversationContextBuilder(),
+            system_context_cache=SystemContextCache(),
+            prompt_cache_stats=PromptCacheStats()
+        )
+        collaborators.update(overrides)
+        return AIService(**collaborators)
+    return make
@@ -0,0 +1,221 @@
+"""
+Conversation Context Builder
+Keeps a rolling summary per chat session plus a token-budgeted window of
+recent turns, loading only the messages added since the last build and
+caching the assembled history per session
+"""
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, load_only
+
+from backend.database.models import AIConversation, ConversationSummary
+from backend.network.config_chunker import estimate_tokens
+from backend.utils.config import config
+
+logger = logging.getLogger(__name__)
+
+# Fallback summary size when the summarizer is unavailable
+EXTRACTIVE_TURN_CHARS = 200
+
+
+class ChatTurn:
+    """One stored chat message"""
+
+    __slots__ = ('id', 'role', 'content', 'created_at', 'tokens')
+
+    def __init__(self, id: str, role: str, content: str, created_at: datetime):
+        self.id = id
+        self.role = role
+        self.content = content
+        self.created_at = created_at
+        self.tokens = estimate_tokens(content)
+
+    @property
+    def position(self) -> Tuple[datetime, str]:
+        return (self.created_at, self.id)
+
+
+class SessionContext:
+    """Summary and recent-turn window of one chat session"""
+
+    def __init__(self, session_id: str, user_id: str):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.summary = ''
+        self.summary_count = 0
+        self.turns: List[ChatTurn] = []
+        # Turns evicted from the window and not yet folded into the summary
+        self.pending: List[ChatTurn] = []
+        self.last_position: Optional[Tuple[datetime, str]] = None
+        self.loaded = False
+        self.lock = threading.Lock()
+        self._messages: Optional[List[Dict[str, str]]] = None
+
+    @property
+    def tokens(self) -> int:
+        return sum(turn.tokens for turn in self.turns)
+
+    def messages(self) -> List[Dict[str, str]]:
+        """Window turns in provider message format, rebuilt only when the window changes"""
+        if self._messages is None:
+            self._messages = [{"role": turn.role, "content": turn.content} for turn in self.turns]
+        return list(self._messages)
+
+    def changed(self):
+        self._messages = None
+
+    def pending_snapshot(self) -> Tuple[str, List[ChatTurn]]:
+        """Current summary and the turns waiting to be folded into it, copied under the lock"""
+        with self.lock:
+            return self.summary, list(self.pending)
+
+
+def extractive_summary(summary: str, turns: List[ChatTurn], max_tokens: int) -> str:
+    """Summary without an LLM: previous summary plus the start of each turn, trimmed from the front"""
+    lines = [summary] if summary else []
+    for turn in turns:
+        text = ' '.join(turn.content.split())
+        if len(text) > EXTRACTIVE_TURN_CHARS:
+            text = text[:EXTRACTIVE_TURN_CHARS] + '...'
+        lines.append(f"{turn.role}: {text}")
+    combined = '\n'.join(lines)
+    max_chars = max_tokens * 4
+    return combined[-max_chars:] if len(combined) > max_chars else combined
+
+
+class ConversationContextBuilder:
+    """LRU of per-session contexts backed by ai_conversations and ai_conversation_summaries"""
+
+    def __init__(self, token_budget: int = 4000, max_sessions: int = 1000):
+        self.token_budget = token_budget
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[Tuple[str, str], SessionContext]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, session_id: str, user_id: str) -> SessionContext:
+        key = (session_id, user_id)
+        with self._lock:
+            context = self._sessions.get(key)
+            if context is not None:
+                self._sessions.move_to_end(key)
+                return context
+            context = self._sessions[key] = SessionContext(session_id, user_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return context
+
+    def load(self, db: Session, session_id: str, user_id: str) -> SessionContext:
+        """Bring a session's context up to date with messages saved since the last load"""
+        context = self._get_or_create(session_id, user_id)
+        try:
+            with context.lock:
+                self._refresh(db, context)
+        except Exception:
+            # Drop the partially loaded session so the next load starts over
+            self.invalidate(session_id, user_id)
+            raise
+        return context
+
+    def _refresh(self, db: Session, context: SessionContext):
+        if not context.loaded:
+            stored = db.query(ConversationSummary).filter(
+                ConversationSummary.session_id == context.session_id,
+                ConversationSummary.user_id == context.user_id
+            ).first()
+            if stored:
+                context.summary = stored.summary
+                context.summary_count = stored.message_count or 0
+                context.last_position = (stored.summarized_through, stored.last_message_id)
+
+        # Only messages after the last one seen (or summarized) are read
+        query = db.query(AIConversation).options(load_only(
+            AIConversation.id, AIConversation.message_role, AIConversation.message_content, AIConversation.created_at
+        )).filter(
+            AIConversation.session_id == context.session_id,
+            AIConversation.user_id == context.user_id
+        )
+        if context.last_position is not None:
+            created_at, message_id = context.last_position
+            query = query.filter(or_(
+                AIConversation.created_at > created_at,
+                and_(AIConversation.created_at == created_at, AIConversation.id > message_id)
+            ))
+        rows = query.order_by(AIConversation.created_at, AIConversation.id).all()
+        context.loaded = True
+
+        if rows:
+            context.turns.extend(
+                ChatTurn(row.id, row.message_role, row.message_content, row.created_at) for row in rows
+            )
+            context.last_position = context.turns[-1].position
+            self._trim(context)
+            context.changed()
+
+    def _trim(self, context: SessionContext):
+        """Evict the oldest turns down to half the budget once the window exceeds it
+
+        Evicting to half amortizes summarization over several turns; the
+        window always keeps the latest turn and starts with a user message.
+        """
+        if context.tokens <= self.token_budget:
+            return
+        target = self.token_budget // 2
+        tokens = context.tokens
+        while len(context.turns) > 1 and (tokens > target or context.turns[0].role != 'user'):
+            turn = context.turns.pop(0)
+            tokens -= turn.tokens
+            context.pending.append(turn)
+
+    def save_summary(self, db: Session, context: SessionContext, summary: str, summarized: List[ChatTurn]):
+        """Fold summarized turns into the session summary and persist it"""
+        if not summarized:
+            return
+        with context.lock:
+            done = {turn.id for turn in summarized}
+            pending = [turn for turn in context.pending if turn.id not in done]
+            if len(pending) == len(context.pending):
+                # A concurrent request already folded these turns
+                return
+            context.summary_count += len(context.pending) - len(pending)
+            context.pending = pending
+            context.summary = summary
+            last = max(summarized, key=lambda turn: turn.position)
+            count = context.summary_count
+
+        try:
+            stored = db.query(ConversationSummary).filter(
+                ConversationSummary.session_id == context.session_id,
+                ConversationSummary.user_id == context.user_id
+            ).first()
+            if stored is None:
+                stored = ConversationSummary(session_id=context.session_id, user_id=context.user_id)
+                db.add(stored)
+            stored.summary = summary
+            stored.summarized_through = last.created_at
+            stored.last_message_id = last.id
+            stored.message_count = count
+            stored.updated_at = datetime.now(timezone.utc)
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error saving conversation summary: {e}")
+            db.rollback()
+
+    def invalidate(self, session_id: str, user_id: str):
+        with self._lock:
+            self._sessions.pop((session_id, user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+
+
+# Global conversation context cache
+conversation_context_builder = ConversationContextBuilder(
+    token_budget=config.CHAT_CONTEXT_TOKEN_BUDGET,
+    max_sessions=config.CHAT_CONTEXT_MAX_SESSIONS
+)
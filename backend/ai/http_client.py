@@ -0,0 +1,187 @@
+"""
+Pooled LLM HTTP Client
+Shared keep-alive connection pools (sync and async) for HTTP-based LLM APIs,
+using HTTP/2 when the h2 package is installed, with retry and exponential
+backoff on 429/5xx and transport errors
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
+
+from backend.utils.config import config
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401 - enables httpx HTTP/2 support
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class PooledHTTPClient:
+    """Lazily created httpx clients sharing limits, timeouts and the retry policy"""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 120.0,
+        connect_timeout: float = 10.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0
+    ):
+        if httpx is None:
+            raise ImportError("httpx library is not installed. Please install it with 'pip install httpx'.")
+        self.base_url = base_url
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retries = 0
+        self._client: Optional['httpx.Client'] = None
+        # AsyncClient pools are bound to the event loop that opened them; keyed
+        # weakly on the loop so a finished loop's pool can't be handed to a new
+        # loop that happens to reuse its id
+        self._async_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]' = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> 'httpx.Client':
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    base_url=self.base_url, timeout=self.timeout, limits=self.limits, http2=HTTP2_AVAILABLE
+                )
+            return self._client
+
+    @property
+    def async_client(self) -> 'httpx.AsyncClient':
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # Pooled connections keep their loop alive, so prune closed loops
+            # explicitly; their sockets can no longer be closed gracefully
+            for stale in [l for l in self._async_clients if l.is_closed()]:
+                del self._async_clients[stale]
+            client = self._async_clients.get(loop)
+            if client is None or client.is_closed:
+                client = self._async_clients[loop] = httpx.AsyncClient(
+                    base_url=self.base_url, timeout=self.timeout, limits=self.limits, http2=HTTP2_AVAILABLE
+                )
+            return client
+
+    def _backoff(self, attempt: int, response: Optional['httpx.Response'] = None) -> float:
+        """Delay before retry attempt, honouring a numeric Retry-After header"""
+        if response is not None:
+            try:
+                return min(self.backoff_max, float(response.headers['Retry-After']))
+            except (KeyError, ValueError):
+                pass
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    def _should_retry(self, attempt: int, response: Optional['httpx.Response'], error: Optional[Exception]) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        if error is not None:
+            return isinstance(error, httpx.TransportError)
+        return response.status_code in RETRY_STATUS_CODES
+
+    def post_json(self, path: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """POST a JSON body and return the decoded response, retrying transient failures"""
+        attempt = 0
+        while True:
+            response, error = None, None
+            try:
+                response = self.client.post(path, json=payload, headers=headers)
+            except httpx.HTTPError as e:
+                error = e
+            if not self._should_retry(attempt, response, error):
+                if error is not None:
+                    raise error
+                response.raise_for_status()
+                return response.json()
+            delay = self._backoff(attempt, response)
+            logger.warning(f"Retrying {self.base_url}{path} in {delay:.2f}s ({error or response.status_code})")
+            self.retries += 1
+            attempt += 1
+            time.sleep(delay)
+
+    async def apost_json(self, path: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        attempt = 0
+        while True:
+            response, error = None, None
+            try:
+                response = await self.async_client.post(path, json=payload, headers=headers)
+            except httpx.HTTPError as e:
+                error = e
+            if not self._should_retry(attempt, response, error):
+                if error is not None:
+                    raise error
+                response.raise_for_status()
+                return response.json()
+            delay = self._backoff(attempt, response)
+            logger.warning(f"Retrying {self.base_url}{path} in {delay:.2f}s ({error or response.status_code})")
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def close(self):
+        """Close the sync pool; async pools close with aclose() on their own loop"""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def aclose(self):
+        with self._lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+_shared_clients: Dict[str, PooledHTTPClient] = {}
+_shared_lock = threading.Lock()
+
+
+def get_http_client(base_url: str) -> PooledHTTPClient:
+    """Process-wide pooled client for an API base URL, configured from the LLM_HTTP_* settings"""
+    with _shared_lock:
+        client = _shared_clients.get(base_url)
+        if client is None:
+            client = _shared_clients[base_url] = PooledHTTPClient(
+                base_url,
+                timeout=config.LLM_REQUEST_TIMEOUT,
+                connect_timeout=config.LLM_HTTP_CONNECT_TIMEOUT,
+                max_connections=config.LLM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=config.LLM_HTTP_MAX_KEEPALIVE,
+                max_retries=config.LLM_HTTP_MAX_RETRIES,
+                backoff_base=config.LLM_HTTP_BACKOFF_BASE
+            )
+        return client
+
+
+def close_http_clients():
+    """Close every shared sync pool, e.g. on application shutdown"""
+    with _shared_lock:
+        clients = list(_shared_clients.values())
+    for client in clients:
+        client.close()
@@ -1,4 +1,5 @@
 from .llm_providers import LLMProvider, LLMFactory
+from .provider_router import llm_router
 
 class LLMSettings:
     """Data class for holding LLM provider settings."""
@@ -21,9 +22,10 @@ class LLMSettings:
 
 class LLMManager:
     """Manages the lifecycle and switching of LLM providers."""
-    def __init__(self):
+    def __init__(self, router=llm_router):
         self._providers = {}
         self._current_provider = None
+        self.router = router
 
     def add_provider(self, name: str, settings: LLMSettings):
         """Adds and instantiates a new provider based on settings."""
@@ -47,5 +49,17 @@ class LLMManager:
             raise ValueError("No active LLM provider. Please add and switch to a provider.")
         return self._current_provider
 
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        """Generate text with the current provider, failing over to the others by health.
+
+        Providers with an open circuit breaker are skipped.
+        """
+        current = self.current_provider
+        names = sorted(self._providers, key=lambda name: self._providers[name] is not current)
+        return self.router.call([
+            (name, self.router.measured(name, lambda provider=self._providers[name]: provider.generate_text(prompt, **kwargs)))
+            for name in names
+        ])
+
 # Global instance to be used across the application
 llm_manager = LLMManager()
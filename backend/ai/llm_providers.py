@@ -1,5 +1,11 @@
+import asyncio
 from abc import ABC, abstractmethod
 
+from backend.ai.http_client import get_http_client, httpx
+from backend.ai.offline_llm import OFFLINE_MODEL, OfflineLLM
+from backend.ai.response_cache import llm_response_cache, make_cache_key
+from backend.ai.single_flight import llm_single_flight
+
 # Placeholder imports - we will manage dependencies later
 try:
     from openai import OpenAI
@@ -11,22 +17,69 @@ try:
 except ImportError:
     Groq = None
 
-# We'll use requests directly to call the OpenRouter API
-try:
-    import requests
-    OpenRouter = object  # Use a placeholder to indicate the dependency is available
-except ImportError:
-    requests = None
-    OpenRouter = None
+from backend.utils.config import config
 
 class LLMProvider(ABC):
     """Abstract base class for all LLM providers."""
 
-    @abstractmethod
+    provider_name = "llm"
+    model = None
+    default_params = {}
+    response_cache = llm_response_cache
+    single_flight = llm_single_flight
+
+    def _prepare_request(self, prompt: str, kwargs: dict):
+        request_params = self.default_params.copy()
+        request_params.update(kwargs)
+        cache_key = make_cache_key(
+            self.provider_name,
+            self.model,
+            None,
+            [{"role": "user", "content": prompt}],
+            request_params.get("temperature"),
+            request_params.get("max_tokens")
+        )
+        return request_params, cache_key
+
     def generate_text(self, prompt: str, **kwargs) -> str:
-        """Generate a text response from a prompt."""
+        """Generate a text response from a prompt.
+
+        Repeats are answered from the response cache and concurrent identical
+        prompts share one upstream call.
+        """
+        request_params, cache_key = self._prepare_request(prompt, kwargs)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        def call():
+            text = self._generate_text(prompt, **request_params)
+            self.response_cache.put(cache_key, text)
+            return text
+        return self.single_flight.do(cache_key, call)
+
+    async def agenerate_text(self, prompt: str, **kwargs) -> str:
+        """Async generate_text sharing the same cache and in-flight coalescing."""
+        request_params, cache_key = self._prepare_request(prompt, kwargs)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        async def call():
+            text = await self._agenerate_text(prompt, **request_params)
+            self.response_cache.put(cache_key, text)
+            return text
+        return await self.single_flight.do_async(cache_key, call)
+
+    @abstractmethod
+    def _generate_text(self, prompt: str, **request_params) -> str:
+        """Send a prompt to the provider with the merged request parameters."""
         pass
 
+    async def _agenerate_text(self, prompt: str, **request_params) -> str:
+        """Async send; providers without a native async client use a worker thread."""
+        return await asyncio.to_thread(self._generate_text, prompt, **request_params)
+
     def generate_config(self, requirements: str, device_type: str) -> str:
         """Generate a network configuration."""
         prompt = f"Generate a Cisco {device_type} configuration for the following requirements: {requirements}"
@@ -44,6 +97,8 @@ class LLMProvider(ABC):
         return self.generate_text(prompt)
 
 class OpenAIProvider(LLMProvider):
+    provider_name = "openai"
+
     def __init__(self, api_key: str, model: str = "gpt-4", **kwargs):
         if OpenAI is None:
             raise ImportError("OpenAI library is not installed. Please install it with 'pip install openai'.")
@@ -54,10 +109,7 @@ class OpenAIProvider(LLMProvider):
             key: kwargs.get(key) for key in ["temperature", "max_tokens"] if kwargs.get(key) is not None
         }
 
-    def generate_text(self, prompt: str, **kwargs) -> str:
-        request_params = self.default_params.copy()
-        request_params.update(kwargs)
-
+    def _generate_text(self, prompt: str, **request_params) -> str:
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
@@ -66,6 +118,8 @@ class OpenAIProvider(LLMProvider):
         return response.choices[0].message.content
 
 class GroqProvider(LLMProvider):
+    provider_name = "groq"
+
     def __init__(self, api_key: str, model: str = "llama3-70b-8192", **kwargs):
         if Groq is None:
             raise ImportError("Groq library is not installed. Please install it with 'pip install groq'.")
@@ -77,10 +131,7 @@ class GroqProvider(LLMProvider):
             key: kwargs.get(key) for key in valid_params if kwargs.get(key) is not None
         }
 
-    def generate_text(self, prompt: str, **kwargs) -> str:
-        request_params = self.default_params.copy()
-        request_params.update(kwargs)
-
+    def _generate_text(self, prompt: str, **request_params) -> str:
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
@@ -89,46 +140,60 @@ class GroqProvider(LLMProvider):
         return response.choices[0].message.content
 
 class OpenRouterProvider(LLMProvider):
+    provider_name = "openrouter"
+
     def __init__(self, api_key: str, model: str = "openai/gpt-4", **kwargs):
-        if requests is None:
-            raise ImportError("requests library is not installed. Please install it with 'pip install requests'.")
-        if OpenRouter is None:
-            raise ImportError("OpenRouter library is not installed. Please install it with 'pip install openrouter'.")
+        if httpx is None:
+            raise ImportError("httpx library is not installed. Please install it with 'pip install httpx'.")
         # Use a simple object to hold model information
         self.client = type('obj', (object,), {'model': model})
+        self.model = model
         self.api_key = api_key
+        # Keep-alive pool shared by every OpenRouter provider in the process
+        self.http = get_http_client(config.OPENROUTER_BASE_URL)
         self.default_params = {
             key: kwargs.get(key) for key in ["temperature", "max_tokens"] if kwargs.get(key) is not None
         }
 
-    def generate_text(self, prompt: str, **kwargs) -> str:
-        request_params = self.default_params.copy()
-        request_params.update(kwargs)
-        
-        # Set the API key in headers for each request
-        import requests
-        api = "https://openrouter.ai/api/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        # Prepare messages in the required format
-        messages = [{"role": "user", "content": prompt}]
-        
-        # Prepare the data payload
+    def _request(self, prompt: str, request_params: dict):
+        headers = {"Authorization": f"Bearer {self.api_key}"}
         data = {
-            "model": self.client.model,
-            "messages": messages,
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
             **request_params
         }
-        
-        # Make the request
-        response = requests.post(api, json=data, headers=headers)
-        response.raise_for_status()
-        
-        # Extract and return the generated text
-        return response.json()["choices"][0]["message"]["content"]
+        return data, headers
+
+    def _generate_text(self, prompt: str, **request_params) -> str:
+        data, headers = self._request(prompt, request_params)
+        response = self.http.post_json("/chat/completions", data, headers)
+        return response["choices"][0]["message"]["content"]
+
+    async def _agenerate_text(self, prompt: str, **request_params) -> str:
+        data, headers = self._request(prompt, request_params)
+        response = await self.http.apost_json("/chat/completions", data, headers)
+        return response["choices"][0]["message"]["content"]
+
+class OfflineProvider(LLMProvider):
+    """Deterministic local provider for load tests; needs no API key or network."""
+    provider_name = "offline"
+
+    def __init__(self, api_key: str = None, model: str = OFFLINE_MODEL, latency: float = None,
+                 tokens_per_second: float = None, **kwargs):
+        self.model = model
+        self.client = OfflineLLM(
+            config.LLM_OFFLINE_LATENCY if latency is None else latency,
+            config.LLM_OFFLINE_TOKENS_PER_SECOND if tokens_per_second is None else tokens_per_second
+        )
+        self.default_params = {
+            key: kwargs.get(key) for key in ["temperature", "max_tokens"] if kwargs.get(key) is not None
+        }
+
+    def _generate_text(self, prompt: str, **request_params) -> str:
+        return self.client.complete(None, [{"role": "user", "content": prompt}])
+
+    async def _agenerate_text(self, prompt: str, **request_params) -> str:
+        return await self.client.complete_async(None, [{"role": "user", "content": prompt}])
 
 class LLMFactory:
     @staticmethod
@@ -141,5 +206,7 @@ class LLMFactory:
             return GroqProvider(**filtered_kwargs)
         elif provider == "openrouter":
             return OpenRouterProvider(**filtered_kwargs)
+        elif provider == "offline":
+            return OfflineProvider(**filtered_kwargs)
         else:
             raise ValueError(f"Unsupported provider: {provider}")
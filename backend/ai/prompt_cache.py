@@ -0,0 +1,79 @@
+"""
+Provider Prompt Cache Support
+Marks stable prompt prefixes for provider-side caching and tracks how many
+prompt tokens each provider served from its cache
+"""
+import logging
+import threading
+from typing import Any, Dict, List, Union
+
+logger = logging.getLogger(__name__)
+
+
+def anthropic_system(system: str, enabled: bool = True) -> Union[str, List[Dict[str, Any]]]:
+    """System prompt with an ephemeral cache breakpoint at its end
+
+    Anthropic ignores breakpoints on prefixes shorter than its minimum
+    cacheable length, so marking every request is safe.
+    """
+    if not enabled or not system:
+        return system
+    return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+
+
+def _tokens(usage: Any, name: str) -> int:
+    value = getattr(usage, name, None)
+    return value if isinstance(value, int) else 0
+
+
+class PromptCacheStats:
+    """Thread-safe per-provider prompt and cached-token counters"""
+
+    def __init__(self):
+        self._providers: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, prompt_tokens: int, cached_tokens: int, cache_write_tokens: int = 0):
+        with self._lock:
+            stats = self._providers.setdefault(provider, {
+                'requests': 0, 'prompt_tokens': 0, 'cached_tokens': 0, 'cache_write_tokens': 0
+            })
+            stats['requests'] += 1
+            stats['prompt_tokens'] += prompt_tokens
+            stats['cached_tokens'] += cached_tokens
+            stats['cache_write_tokens'] += cache_write_tokens
+        if cached_tokens:
+            logger.debug(f"{provider} served {cached_tokens}/{prompt_tokens} prompt tokens from cache")
+
+    def record_openai(self, usage: Any, provider: str = 'openai'):
+        """OpenAI caches prompt prefixes automatically and reports the hits in prompt_tokens_details"""
+        if usage is None:
+            return
+        details = getattr(usage, 'prompt_tokens_details', None)
+        self.record(provider, _tokens(usage, 'prompt_tokens'), _tokens(details, 'cached_tokens'))
+
+    def record_anthropic(self, usage: Any, provider: str = 'anthropic'):
+        """Anthropic input_tokens excludes tokens read from or written to the cache"""
+        if usage is None:
+            return
+        cached = _tokens(usage, 'cache_read_input_tokens')
+        written = _tokens(usage, 'cache_creation_input_tokens')
+        self.record(provider, _tokens(usage, 'input_tokens') + cached + written, cached, written)
+
+    def reset(self):
+        with self._lock:
+            self._providers.clear()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                provider: {
+                    **stats,
+                    'cached_ratio': stats['cached_tokens'] / stats['prompt_tokens'] if stats['prompt_tokens'] else 0.0
+                }
+                for provider, stats in self._providers.items()
+            }
+
+
+# Global prompt cache counters
+prompt_cache_stats = PromptCacheStats()
@@ -0,0 +1,267 @@
+"""
+LLM Provider Router
+Orders providers by health, skips providers whose circuit breaker is open
+and, for async calls, optionally hedges a second provider once the primary
+has run past its p95 latency
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from backend.utils.config import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+# Error EWMA above which a provider is tried after healthy ones
+DEGRADED_ERROR_RATE = 0.5
+# Latency samples needed before p95 is trusted for hedging
+MIN_HEDGE_SAMPLES = 20
+
+
+class CircuitOpenError(Exception):
+    """Raised when every candidate provider's circuit breaker is open"""
+
+
+class ProviderHealth:
+    """Latency/error EWMA, recent latencies and circuit state of one provider"""
+
+    def __init__(self, name: str, alpha: float, window: int = 200):
+        self.name = name
+        self.alpha = alpha
+        self.latency_ewma: Optional[float] = None
+        self.error_ewma = 0.0
+        self.latencies = deque(maxlen=window)
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    def record_success(self, latency: Optional[float] = None):
+        self.requests += 1
+        if latency is not None:
+            self.latency_ewma = latency if self.latency_ewma is None else (
+                self.alpha * latency + (1 - self.alpha) * self.latency_ewma
+            )
+            self.latencies.append(latency)
+        self.error_ewma *= 1 - self.alpha
+        self.consecutive_failures = 0
+        self.state = CIRCUIT_CLOSED
+
+    def record_failure(self, failure_threshold: int):
+        self.requests += 1
+        self.failures += 1
+        self.error_ewma = self.alpha + (1 - self.alpha) * self.error_ewma
+        self.consecutive_failures += 1
+        if self.state == CIRCUIT_HALF_OPEN or self.consecutive_failures >= failure_threshold:
+            if self.state != CIRCUIT_OPEN:
+                logger.warning(f"Circuit opened for LLM provider {self.name}")
+            self.state = CIRCUIT_OPEN
+            self.opened_at = time.monotonic()
+
+    def p95_latency(self) -> Optional[float]:
+        if len(self.latencies) < MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'latency_ewma': round(self.latency_ewma, 4) if self.latency_ewma is not None else None,
+            'error_ewma': round(self.error_ewma, 4),
+            'p95_latency': self.p95_latency(),
+            'consecutive_failures': self.consecutive_failures,
+            'requests': self.requests,
+            'failures': self.failures
+        }
+
+
+class ProviderRouter:
+    """Failover, circuit breaking and hedging across LLM providers"""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        alpha: float = 0.2,
+        hedge_enabled: bool = False,
+        hedge_min_delay: float = 2.0
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.alpha = alpha
+        self.hedge_enabled = hedge_enabled
+        self.hedge_min_delay = hedge_min_delay
+        self.hedges = 0
+        self._health: Dict[str, ProviderHealth] = {}
+        self._lock = threading.Lock()
+
+    def health(self, name: str) -> ProviderHealth:
+        with self._lock:
+            health = self._health.get(name)
+            if health is None:
+                health = self._health[name] = ProviderHealth(name, self.alpha)
+            return health
+
+    def record_success(self, name: str, latency: Optional[float] = None):
+        health = self.health(name)
+        with self._lock:
+            health.record_success(latency)
+
+    def record_failure(self, name: str):
+        health = self.health(name)
+        with self._lock:
+            health.record_failure(self.failure_threshold)
+
+    def measured(self, name: str, request: Callable[[], T]) -> Callable[[], T]:
+        """Wrap an upstream request so its latency or failure updates the provider's health"""
+        def call():
+            started = time.monotonic()
+            try:
+                result = request()
+            except Exception:
+                self.record_failure(name)
+                raise
+            self.record_success(name, time.monotonic() - started)
+            return result
+        return call
+
+    def measured_async(self, name: str, request: Callable[[], Awaitable[T]]) -> Callable[[], Awaitable[T]]:
+        async def call():
+            started = time.monotonic()
+            try:
+                result = await request()
+            except Exception:
+                self.record_failure(name)
+                raise
+            self.record_success(name, time.monotonic() - started)
+            return result
+        return call
+
+    def select(self, names: Sequence[str]) -> List[str]:
+        """Providers to try, in order: healthy ones by priority, then degraded and half-open ones
+
+        Open circuits are skipped until reset_timeout has passed, after which
+        the provider is tried again as a half-open probe.
+        """
+        now = time.monotonic()
+        healthy, degraded = [], []
+        with self._lock:
+            for name in names:
+                health = self._health.get(name)
+                if health is None:
+                    healthy.append(name)
+                    continue
+                if health.state == CIRCUIT_OPEN:
+                    if now - health.opened_at < self.reset_timeout:
+                        continue
+                    health.state = CIRCUIT_HALF_OPEN
+                if health.state == CIRCUIT_HALF_OPEN or health.error_ewma >= DEGRADED_ERROR_RATE:
+                    degraded.append(name)
+                else:
+                    healthy.append(name)
+        return healthy + degraded
+
+    def hedge_delay(self, name: str) -> Optional[float]:
+        """How long to wait on a provider before hedging, or None to not hedge"""
+        if not self.hedge_enabled:
+            return None
+        p95 = self.health(name).p95_latency()
+        if p95 is None:
+            return None
+        return max(self.hedge_min_delay, p95)
+
+    def _ordered(self, attempts: Sequence[Tuple[str, T]]) -> List[Tuple[str, T]]:
+        by_name = dict(attempts)
+        order = self.select([name for name, _ in attempts])
+        if not order:
+            raise CircuitOpenError(f"All LLM provider circuits are open: {', '.join(by_name)}")
+        return [(name, by_name[name]) for name in order]
+
+    def call(self, attempts: Sequence[Tuple[str, Callable[[], T]]]) -> T:
+        """Try each provider's request in health order until one succeeds"""
+        last_error = None
+        for name, request in self._ordered(attempts):
+            try:
+                return request()
+            except Exception as e:
+                logger.warning(f"{name} request failed: {str(e) or type(e).__name__}")
+                last_error = e
+        raise last_error
+
+    async def call_async(self, attempts: Sequence[Tuple[str, Callable[[], Awaitable[T]]]]) -> T:
+        """Async call that starts the next provider early when the current one runs past its p95
+
+        The first successful response wins and the other request is cancelled.
+        """
+        queue = self._ordered(attempts)
+        pending: Dict[asyncio.Future, str] = {}
+        last_error = None
+
+        def start_next():
+            name, request = queue.pop(0)
+            pending[asyncio.ensure_future(request())] = name
+
+        start_next()
+        try:
+            while pending:
+                timeout = None
+                if queue and len(pending) == 1:
+                    timeout = self.hedge_delay(next(iter(pending.values())))
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    logger.info(f"Hedging slow {next(iter(pending.values()))} request with {queue[0][0]}")
+                    self.hedges += 1
+                    start_next()
+                    continue
+                for task in done:
+                    name = pending.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+                    logger.warning(f"{name} request failed: {str(last_error) or type(last_error).__name__}")
+                if not pending and queue:
+                    start_next()
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def configure(self, hedge_enabled: Optional[bool] = None, hedge_min_delay: Optional[float] = None):
+        if hedge_enabled is not None:
+            self.hedge_enabled = bool(hedge_enabled)
+        if hedge_min_delay:
+            self.hedge_min_delay = float(hedge_min_delay)
+
+    def reset(self):
+        with self._lock:
+            self._health.clear()
+            self.hedges = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'hedge_enabled': self.hedge_enabled,
+                'hedges': self.hedges,
+                'providers': {name: health.to_dict() for name, health in self._health.items()}
+            }
+
+
+# Global router shared by AIService and LLMManager
+llm_router = ProviderRouter(
+    failure_threshold=config.LLM_CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=config.LLM_CIRCUIT_RESET_TIMEOUT,
+    alpha=config.LLM_HEALTH_EWMA_ALPHA,
+    hedge_enabled=config.LLM_HEDGE_ENABLED,
+    hedge_min_delay=config.LLM_HEDGE_MIN_DELAY
+)
@@ -0,0 +1,94 @@
+"""
+LLM Request Gate
+Bounds how many LLM requests the process has in flight and how long each
+may take, using the concurrent_requests and response_timeout core settings
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+
+from backend.utils.config import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class LLMRequestGate:
+    """Resizable async semaphore plus a per-request timeout"""
+
+    def __init__(self, max_concurrent: int, timeout: float):
+        self.max_concurrent = max(1, max_concurrent)
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            self.active = 0
+            self.waiting = 0
+        return self._condition
+
+    def configure(self, max_concurrent: Optional[int] = None, timeout: Optional[float] = None):
+        """Apply new limits; a larger limit admits waiting requests immediately"""
+        if max_concurrent:
+            self.max_concurrent = max(1, int(max_concurrent))
+        if timeout:
+            self.timeout = float(timeout)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._condition is not None and self._loop is loop:
+            loop.create_task(self._notify())
+
+    def apply_core_settings(self, settings: Dict[str, Any]):
+        """Apply the stored core_settings (CoreSettingsRequest) values"""
+        self.configure(settings.get('concurrent_requests'), settings.get('response_timeout'))
+
+    async def _notify(self):
+        condition = self._get_condition()
+        async with condition:
+            condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one request slot, e.g. for the lifetime of a streamed response"""
+        condition = self._get_condition()
+        async with condition:
+            self.waiting += 1
+            try:
+                await condition.wait_for(lambda: self.active < self.max_concurrent)
+            finally:
+                self.waiting -= 1
+            self.active += 1
+
+        try:
+            yield
+        finally:
+            async with condition:
+                self.active -= 1
+                condition.notify()
+
+    async def run(self, request: Callable[[], Awaitable[T]], timeout: Optional[float] = None) -> T:
+        """Run one request once a slot is free, cancelling it if it exceeds the timeout"""
+        async with self.slot():
+            return await asyncio.wait_for(request(), timeout or self.timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'max_concurrent': self.max_concurrent,
+            'timeout': self.timeout,
+            'active': self.active,
+            'waiting': self.waiting
+        }
+
+
+# Global gate shared by every async LLM call
+llm_request_gate = LLMRequestGate(config.LLM_CONCURRENT_REQUESTS, config.LLM_REQUEST_TIMEOUT)
@@ -0,0 +1,213 @@
+"""
+LLM Response Cache
+Caches completions keyed by provider, model, normalized messages and sampling
+parameters, with LRU eviction, TTL expiry and an optional SQLite file so
+entries survive restarts; sized by the cache_* core settings
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.utils.config import config
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_content(content: str) -> str:
+    # Trailing whitespace never changes a completion; indentation can (configs)
+    return '\n'.join(line.rstrip() for line in content.strip().splitlines())
+
+
+def make_cache_key(
+    provider: str,
+    model: str,
+    system: Optional[str],
+    messages: List[Dict[str, str]],
+    temperature: Optional[float],
+    max_tokens: Optional[int]
+) -> str:
+    """SHA-256 identifying one completion request"""
+    payload = {
+        'provider': provider,
+        'model': model,
+        'system': _normalize_content(system or ''),
+        'messages': [
+            {'role': message['role'].lower(), 'content': _normalize_content(message['content'])}
+            for message in messages
+        ],
+        'temperature': temperature,
+        'max_tokens': max_tokens,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class SQLiteCacheStore:
+    """On-disk copy of cache entries, bounded to the same size as the memory cache"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS llm_response_cache ('
+                'cache_key TEXT PRIMARY KEY, response TEXT NOT NULL, '
+                'expires_at REAL NOT NULL, last_used REAL NOT NULL)'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS ix_llm_response_cache_last_used ON llm_response_cache (last_used)'
+            )
+
+    def get(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response, expires_at FROM llm_response_cache WHERE cache_key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                with self._conn:
+                    self._conn.execute('DELETE FROM llm_response_cache WHERE cache_key = ?', (key,))
+                return None
+            with self._conn:
+                self._conn.execute('UPDATE llm_response_cache SET last_used = ? WHERE cache_key = ?', (now, key))
+            return row[0], row[1]
+
+    def put(self, key: str, response: str, expires_at: float, now: float, max_entries: int):
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO llm_response_cache (cache_key, response, expires_at, last_used) '
+                'VALUES (?, ?, ?, ?)',
+                (key, response, expires_at, now)
+            )
+            self._conn.execute(
+                'DELETE FROM llm_response_cache WHERE expires_at <= ? OR cache_key IN ('
+                'SELECT cache_key FROM llm_response_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+                (now, max_entries)
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM llm_response_cache')
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM llm_response_cache').fetchone()[0]
+
+
+class LLMResponseCache:
+    """Thread-safe LRU of completions with TTL expiry"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 3600,
+        enabled: bool = True,
+        path: Optional[str] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self.store = SQLiteCacheStore(path) if path else None
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, enabled: Optional[bool] = None, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        with self._lock:
+            if enabled is not None:
+                self.enabled = bool(enabled)
+            if ttl:
+                self.ttl = float(ttl)
+            if max_entries:
+                self.max_entries = int(max_entries)
+                self._evict()
+
+    def apply_core_settings(self, settings: Dict[str, Any]):
+        """Apply the stored core_settings cache_enabled / cache_duration / cache_size_limit values"""
+        self.configure(settings.get('cache_enabled'), settings.get('cache_duration'), settings.get('cache_size_limit'))
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._entries[key]
+
+        stored = self.store.get(key, now) if self.store else None
+        with self._lock:
+            if stored is None:
+                self.misses += 1
+                return None
+            self._entries[key] = stored
+            self._evict()
+            self.hits += 1
+            return stored[0]
+
+    def put(self, key: str, response: str):
+        if not self.enabled or not response:
+            return
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._entries[key] = (response, expires_at)
+            self._entries.move_to_end(key)
+            self._evict()
+        if self.store:
+            try:
+                self.store.put(key, response, expires_at, now, self.max_entries)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to persist LLM cache entry: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+        if self.store:
+            self.store.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+        if self.store:
+            stats['persisted_entries'] = self.store.count()
+        return stats
+
+
+# Global LLM response cache
+llm_response_cache = LLMResponseCache(
+    max_entries=config.LLM_CACHE_MAX_ENTRIES,
+    ttl=config.LLM_CACHE_TTL,
+    enabled=config.LLM_CACHE_ENABLED,
+    path=config.LLM_CACHE_PATH or None
+)
@@ -0,0 +1,111 @@
+"""
+LLM Single-Flight
+Coalesces concurrent identical LLM requests so they share one in-flight
+completion; every waiter receives the leader's result or error
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class _Call:
+    """One in-flight blocking call and the threads waiting on it"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Per-key deduplication of in-flight calls for threads and coroutines"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        # (task, waiter count) per (event loop, key)
+        self._tasks: Dict[Tuple[int, str], list] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run fn, or wait for the identical call another thread already started"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: str, request: Callable[[], Awaitable[T]]) -> T:
+        """Await request, or join the identical request already running on this loop
+
+        A cancelled waiter leaves the shared request running for the others;
+        it is only cancelled once every waiter has gone.
+        """
+        flight_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            flight = self._tasks.get(flight_key)
+            if flight is None:
+                task = asyncio.ensure_future(request())
+                flight = self._tasks[flight_key] = [task, 0]
+                task.add_done_callback(lambda _: self._forget(flight_key, task))
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+            flight[1] += 1
+            task = flight[0]
+
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done():
+                with self._lock:
+                    flight[1] -= 1
+                    if flight[1] == 0:
+                        task.cancel()
+            raise
+
+    def _forget(self, flight_key: Tuple[int, str], task: 'asyncio.Future'):
+        with self._lock:
+            flight = self._tasks.get(flight_key)
+            if flight is not None and flight[0] is task:
+                del self._tasks[flight_key]
+        if not task.cancelled():
+            # Mark the error retrieved when every waiter was cancelled
+            task.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'in_flight': len(self._calls) + len(self._tasks),
+                'leaders': self.leaders,
+                'coalesced': self.coalesced
+            }
+
+
+# Global single-flight shared by every LLM call
+llm_single_flight = SingleFlight()
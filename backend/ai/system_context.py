@@ -0,0 +1,248 @@
+"""
+Chat System Context Cache
+Keeps a per-user snapshot of devices and recent operations for chat prompts,
+invalidated when device or operation-log rows are written, and renders it
+in a compact line-per-item form
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, load_only
+
+from backend.database.models import NetworkDevice, OperationLog
+from backend.utils.config import config
+
+logger = logging.getLogger(__name__)
+
+RECENT_OPERATIONS_LIMIT = 5
+
+# Device columns shown in the prompt; updates to other columns keep the snapshot
+RENDERED_DEVICE_COLUMNS = ('name', 'ip_address', 'model', 'status', 'uptime_seconds', 'owner_id')
+
+
+@dataclass
+class SystemContextSnapshot:
+    """Devices and recent operations of one user, with the prompt text rendered once"""
+    devices: List[Dict[str, str]] = field(default_factory=list)
+    recent_operations: List[Dict[str, Optional[str]]] = field(default_factory=list)
+    device_ids: FrozenSet[str] = frozenset()
+    loaded_at: float = 0.0
+    _text: Optional[str] = None
+
+    @property
+    def total_devices(self) -> int:
+        return len(self.devices)
+
+    @property
+    def online_devices(self) -> int:
+        return sum(1 for d in self.devices if d['status'] == 'online')
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = render_system_context(self, config.SYSTEM_CONTEXT_MAX_DEVICES)
+        return self._text
+
+
+def load_system_context(db: Session, user_id: str) -> SystemContextSnapshot:
+    """Query a user's devices and recent operations (two queries, no lazy loads)"""
+    devices = db.query(NetworkDevice).options(
+        load_only(
+            NetworkDevice.name,
+            NetworkDevice.ip_address,
+            NetworkDevice.model,
+            NetworkDevice.status,
+            NetworkDevice.uptime_seconds
+        )
+    ).filter(NetworkDevice.owner_id == user_id).order_by(NetworkDevice.name).all()
+
+    operations = db.query(
+        OperationLog.operation_type,
+        OperationLog.status,
+        OperationLog.error_message,
+        OperationLog.created_at,
+        OperationLog.device_id,
+        NetworkDevice.name.label('device_name')
+    ).outerjoin(
+        NetworkDevice, OperationLog.device_id == NetworkDevice.id
+    ).filter(
+        OperationLog.user_id == user_id
+    ).order_by(
+        OperationLog.created_at.desc()
+    ).limit(RECENT_OPERATIONS_LIMIT).all()
+
+    return SystemContextSnapshot(
+        devices=[
+            {
+                'name': device.name,
+                'ip': device.ip_address,
+                'model': device.model,
+                'status': device.status,
+                'uptime': device.uptime_formatted
+            }
+            for device in devices
+        ],
+        recent_operations=[
+            {
+                'type': op.operation_type,
+                'status': op.status,
+                'device': op.device_name or 'Unknown',
+                'timestamp': op.created_at.isoformat() if op.created_at else None,
+                'error': op.error_message
+            }
+            for op in operations
+        ],
+        device_ids=frozenset(
+            [device.id for device in devices] + [op.device_id for op in operations if op.device_id]
+        ),
+        loaded_at=time.monotonic()
+    )
+
+
+def render_system_context(snapshot: SystemContextSnapshot, max_devices: int = 25) -> str:
+    """Compact prompt form: counts, then one line per device and operation
+
+    Devices that are not online are listed first so they survive the cap.
+    """
+    lines = [f"Devices: {snapshot.total_devices} total, {snapshot.online_devices} online"]
+    devices = sorted(snapshot.devices, key=lambda d: d['status'] == 'online')
+    for device in devices[:max_devices]:
+        lines.append(f"- {device['name']} {device['ip']} {device['model']} {device['status']} up {device['uptime']}")
+    if len(devices) > max_devices:
+        lines.append(f"- ... {len(devices) - max_devices} more devices")
+
+    if snapshot.recent_operations:
+        lines.append("Recent operations:")
+        for op in snapshot.recent_operations:
+            line = f"- {op['timestamp']} {op['type']} on {op['device']}: {op['status']}"
+            if op['error']:
+                line += f" ({op['error']})"
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+class SystemContextCache:
+    """Thread-safe LRU of per-user system context snapshots
+
+    Entries are dropped by the ORM write hooks below; the TTL bounds staleness
+    from writes that bypass them (bulk SQL, other processes).
+
+    Loads run outside the lock, so every invalidation also bumps a generation
+    counter: a per-user one for invalidate_users, and a cache-wide one for
+    invalidate_devices and clear (the devices an in-flight load will show are
+    not known yet). A load is only stored if neither counter moved meanwhile.
+    """
+
+    def __init__(self, ttl: int = 300, max_users: int = 1000):
+        self.ttl = ttl
+        self.max_users = max_users
+        self._entries: "OrderedDict[str, SystemContextSnapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str, loader: Callable[[], SystemContextSnapshot]) -> SystemContextSnapshot:
+        with self._lock:
+            snapshot = self._entries.get(user_id)
+            if snapshot is not None and time.monotonic() - snapshot.loaded_at < self.ttl:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return snapshot
+            self.misses += 1
+            generation = (self._generations.get(user_id, 0), self._epoch)
+
+        snapshot = loader()
+        with self._lock:
+            if generation != (self._generations.get(user_id, 0), self._epoch):
+                # Invalidated while loading: serve it once, but don't cache it
+                return snapshot
+            self._entries[user_id] = snapshot
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+        return snapshot
+
+    def invalidate_users(self, user_ids: Iterable[Optional[str]]):
+        with self._lock:
+            for user_id in user_ids:
+                self._generations[user_id] = self._generations.get(user_id, 0) + 1
+                if self._entries.pop(user_id, None) is not None:
+                    self.invalidations += 1
+
+    def invalidate_devices(self, device_ids: Iterable[str]):
+        """Drop every snapshot that shows one of the devices"""
+        device_ids = set(device_ids)
+        if not device_ids:
+            return
+        with self._lock:
+            self._epoch += 1
+            stale = [user_id for user_id, s in self._entries.items() if s.device_ids & device_ids]
+            for user_id in stale:
+                del self._entries[user_id]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations
+            }
+
+
+# Global system context cache
+system_context_cache = SystemContextCache(
+    ttl=config.SYSTEM_CONTEXT_CACHE_TTL,
+    max_users=config.SYSTEM_CONTEXT_MAX_USERS
+)
+
+_PENDING_KEY = 'system_context_invalidations'
+
+
+def _device_changed(device: NetworkDevice) -> bool:
+    state = inspect(device)
+    return any(state.attrs[column].history.has_changes() for column in RENDERED_DEVICE_COLUMNS)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_invalidations(session: Session, flush_context):
+    """Remember users and devices touched by this flush until the commit"""
+    users, devices = session.info.setdefault(_PENDING_KEY, (set(), set()))
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, NetworkDevice):
+            if obj in session.dirty and not _device_changed(obj):
+                continue
+            # Read loaded state only; deleted rows cannot be refreshed
+            state = inspect(obj)
+            devices.add(state.dict.get('id'))
+            users.add(state.dict.get('owner_id'))
+        elif isinstance(obj, OperationLog):
+            users.add(inspect(obj).dict.get('user_id'))
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_invalidations(session: Session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        users, devices = pending
+        system_context_cache.invalidate_users(users)
+        system_context_cache.invalidate_devices(devices)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_invalidations(session: Session):
+    session.info.pop(_PENDING_KEY, None)
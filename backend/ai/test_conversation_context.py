@@ -0,0 +1,176 @@
+"""
+Simple tests to verify incremental chat context loading and rolling summaries
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.ai.conversation_context import ConversationContextBuilder
+from backend.database.models import AIConversation, Base, ConversationSummary, User
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    user = User(email='chat@example.com', password_hash='x')
+    db.add(user)
+    db.commit()
+    return engine, db, user
+
+
+def add_turns(db, user, count, start=0, words=50):
+    for i in range(start, start + count):
+        db.add(AIConversation(
+            user_id=user.id, session_id='s1',
+            message_role='user' if i % 2 == 0 else 'assistant',
+            message_content=f"turn {i} " + 'word ' * words,
+            created_at=START + timedelta(seconds=i)
+        ))
+    db.commit()
+
+
+@pytest.fixture
+def make_service(make_ai_service):
+    def make(builder):
+        return summarizing_service(make_ai_service(context_builder=builder))
+    return make
+
+
+def summarizing_service(service):
+    service._get_system_context = lambda user_id, db: 'Devices: 0 total, 0 online'
+    service.summaries = []
+
+    def complete(system, messages, max_tokens, temperature):
+        service.summaries.append(messages[0]['content'])
+        return f"summary {len(service.summaries)}"
+    service._complete = complete
+    return service
+
+
+def count_queries(engine):
+    statements = []
+    event.listen(engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_only_new_messages_are_loaded():
+    """Test that a second load reads only messages added since the first"""
+    engine, db, user = make_session()
+    add_turns(db, user, 4)
+    builder = ConversationContextBuilder(token_budget=10000)
+
+    context = builder.load(db, 's1', user.id)
+    assert [t.content.split()[1] for t in context.turns] == ['0', '1', '2', '3']
+
+    add_turns(db, user, 2, start=4)
+    user_id = user.id
+    statements = count_queries(engine)
+    context = builder.load(db, 's1', user_id)
+    assert len(context.turns) == 6
+    assert len(statements) == 1 and 'ai_conversation_summaries' not in statements[0]
+
+
+def test_window_stays_within_budget_and_starts_with_user():
+    """Test that old turns leave the window once it exceeds the token budget"""
+    engine, db, user = make_session()
+    add_turns(db, user, 12)
+    builder = ConversationContextBuilder(token_budget=300)
+
+    context = builder.load(db, 's1', user.id)
+    assert context.tokens <= 300
+    assert context.turns[0].role == 'user'
+    assert context.turns[-1].content.startswith('turn 11')
+    assert len(context.pending) + len(context.turns) == 12
+
+
+def test_evicted_turns_are_summarized_and_persisted(make_service):
+    """Test that evicted turns are folded into a stored summary and not re-sent"""
+    engine, db, user = make_session()
+    add_turns(db, user, 12)
+    service = make_service(ConversationContextBuilder(token_budget=300))
+
+    system, messages = service._build_chat_messages('next question', 's1', user.id, db)
+    assert 'summary 1' in system
+    assert messages[-1] == {'role': 'user', 'content': 'next question'}
+    assert 'turn 0 ' in service.summaries[0]
+
+    stored = db.query(ConversationSummary).one()
+    assert stored.summary == 'summary 1'
+    assert stored.message_count == 12 - (len(messages) - 1)
+
+    # Another turn within the budget does not summarize again
+    service._build_chat_messages('another question', 's1', user.id, db)
+    assert len(service.summaries) == 1
+
+
+def test_summary_survives_restart(make_service):
+    """Test that a fresh builder resumes from the stored summary"""
+    engine, db, user = make_session()
+    add_turns(db, user, 12)
+    service = make_service(ConversationContextBuilder(token_budget=300))
+    _, messages = service._build_chat_messages('q', 's1', user.id, db)
+
+    restarted = make_service(ConversationContextBuilder(token_budget=300))
+    system, resumed = restarted._build_chat_messages('q', 's1', user.id, db)
+    assert 'summary 1' in system
+    assert resumed == messages
+    assert restarted.summaries == []
+
+
+def test_saved_user_message_is_not_duplicated(make_service):
+    """Test that a user message already saved to the session is sent once"""
+    engine, db, user = make_session()
+    add_turns(db, user, 1, words=1)
+    service = make_service(ConversationContextBuilder())
+
+    _, messages = service._build_chat_messages('turn 0 word ', 's1', user.id, db)
+    assert messages == [{'role': 'user', 'content': 'turn 0 word '}]
+
+
+def test_summarizer_failure_falls_back_to_extractive_summary(make_service):
+    """Test that a failed summary call still folds the evicted turns"""
+    engine, db, user = make_session()
+    add_turns(db, user, 12)
+    service = make_service(ConversationContextBuilder(token_budget=300))
+
+    def fail(*args, **kwargs):
+        raise RuntimeError('down')
+    service._complete = fail
+
+    system, _ = service._build_chat_messages('q', 's1', user.id, db)
+    assert 'Summary of earlier conversation' in system
+    assert 'assistant: turn' in db.query(ConversationSummary).one().summary
+    assert db.query(ConversationSummary).count() == 1
+
+
+def test_turns_evicted_during_summary_wait_for_the_next_one(make_service):
+    """Test that turns a concurrent load evicts mid-summary are not folded unseen"""
+    engine, db, user = make_session()
+    add_turns(db, user, 12)
+    builder = ConversationContextBuilder(token_budget=300)
+    service = make_service(builder)
+    user_id = user.id
+    summarize = service._complete
+
+    def complete_with_concurrent_load(*args, **kwargs):
+        # Another request on the session loads new messages and evicts more turns
+        add_turns(db, user, 6, start=12)
+        builder.load(db, 's1', user_id)
+        return summarize(*args, **kwargs)
+    service._complete = complete_with_concurrent_load
+
+    service._build_chat_messages('q', 's1', user_id, db)
+    context = builder.load(db, 's1', user_id)
+    late = [turn.content.split()[1] for turn in context.pending]
+    assert late and all(f'turn {i} ' not in service.summaries[0] for i in late)
+    assert db.query(ConversationSummary).one().message_count == service.summaries[0].count('turn ')
+
+    service._complete = summarize
+    service._build_chat_messages('q', 's1', user_id, db)
+    assert all(f'turn {i} ' in service.summaries[1] for i in late)
+    assert not context.pending
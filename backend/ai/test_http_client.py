@@ -0,0 +1,99 @@
+"""
+Simple tests to verify the pooled LLM HTTP client reuses connections and retries
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from backend.ai.http_client import PooledHTTPClient
+from backend.ai.llm_providers import OpenRouterProvider
+from backend.ai.response_cache import LLMResponseCache
+
+
+def completion(content):
+    return {"choices": [{"message": {"content": content}}]}
+
+
+def scripted(statuses):
+    """Transport answering with the given status codes, then 200"""
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        status = statuses[len(seen) - 1] if len(seen) <= len(statuses) else 200
+        if status == 'drop':
+            raise httpx.ConnectError('connection reset', request=request)
+        headers = {'Retry-After': '0'} if status == 429 else {}
+        return httpx.Response(status, json=completion('ok') if status == 200 else {}, headers=headers)
+    return handler, seen
+
+
+def make_client(handler, max_retries=3):
+    client = PooledHTTPClient('https://llm.test/api', max_retries=max_retries, backoff_base=0.001)
+    client._client = httpx.Client(base_url=client.base_url, transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_retries_429_5xx_and_transport_errors():
+    handler, seen = scripted([429, 'drop', 503])
+    client = make_client(handler)
+
+    assert client.post_json('/chat/completions', {'model': 'm'}) == completion('ok')
+    assert len(seen) == 4
+    assert client.retries == 3
+
+
+def test_gives_up_after_max_retries():
+    handler, seen = scripted([502, 502, 502])
+    client = make_client(handler, max_retries=2)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.post_json('/chat/completions', {})
+    assert len(seen) == 3
+
+
+def test_client_errors_are_not_retried():
+    handler, seen = scripted([401])
+    with pytest.raises(httpx.HTTPStatusError):
+        make_client(handler).post_json('/chat/completions', {})
+    assert len(seen) == 1
+
+
+def test_openrouter_sync_and_async_share_the_pool():
+    """Test that OpenRouter requests go through the pooled client with auth headers"""
+    handler, seen = scripted([])
+    provider = OpenRouterProvider(api_key='sk-or-test', model='openai/gpt-4o', temperature=0.1)
+    provider.response_cache = LLMResponseCache(enabled=False)
+    provider.http = make_client(handler)
+
+    async def run():
+        provider.http._async_clients[asyncio.get_running_loop()] = httpx.AsyncClient(
+            base_url=provider.http.base_url, transport=httpx.MockTransport(handler)
+        )
+        return await provider.agenerate_text('show ip bgp summary')
+
+    assert provider.generate_text('show ip bgp summary') == 'ok'
+    assert asyncio.run(run()) == 'ok'
+    assert [str(r.url) for r in seen] == ['https://llm.test/api/chat/completions'] * 2
+    assert seen[0].headers['Authorization'] == 'Bearer sk-or-test'
+    assert b'"temperature":0.1' in seen[1].content.replace(b' ', b'')
+
+
+def test_async_pool_is_per_loop_and_dropped_with_it():
+    """Test that each event loop gets its own pool and closed loops are pruned"""
+    client = PooledHTTPClient('https://llm.test/api')
+
+    async def pool():
+        return client.async_client, client.async_client
+
+    # Hold the finished loop alive, as pooled connections would
+    old_loop = asyncio.new_event_loop()
+    first, again = old_loop.run_until_complete(pool())
+    old_loop.close()
+    assert first is again
+
+    second, _ = asyncio.run(pool())
+    assert second is not first
+    assert old_loop not in client._async_clients
+    assert not any(loop.is_closed() for loop in client._async_clients)
@@ -0,0 +1,67 @@
+"""
+Simple tests to verify stable prompt prefixes, cache breakpoints and cached-token reporting
+"""
+from types import SimpleNamespace
+
+from backend.ai.ai_service import AUDIT_SYSTEM_PROMPT
+from backend.ai.prompt_cache import PromptCacheStats, anthropic_system
+from backend.operations.cisco_audit_service import AUDIT_INSTRUCTIONS, CiscoAuditService
+
+
+ANTHROPIC_USAGE = SimpleNamespace(input_tokens=20, cache_read_input_tokens=1500, cache_creation_input_tokens=0)
+OPENAI_USAGE = SimpleNamespace(prompt_tokens=2000, prompt_tokens_details=SimpleNamespace(cached_tokens=1024))
+
+
+def test_anthropic_system_prompt_gets_cache_breakpoint(make_ai_service, llm_clients):
+    """Test that the system prompt is sent as a cache-marked block"""
+    anthropic = llm_clients.Anthropic(reply='[]', usage=ANTHROPIC_USAGE)
+    service = make_ai_service(anthropic_client=anthropic)
+
+    service.get_configuration_analysis('Audit R1', AUDIT_INSTRUCTIONS['security'])
+    system = anthropic.requests[0]['system']
+    assert system[0]['cache_control'] == {'type': 'ephemeral'}
+    assert system[0]['text'].startswith(AUDIT_SYSTEM_PROMPT)
+    assert anthropic_system('sys', enabled=False) == 'sys'
+
+    stats = service.prompt_cache_stats.get_stats()['anthropic']
+    assert stats['prompt_tokens'] == 1520
+    assert stats['cached_tokens'] == 1500
+
+
+def test_openai_cached_tokens_are_reported(make_ai_service, llm_clients):
+    """Test that OpenAI automatic prefix cache hits are counted"""
+    service = make_ai_service(openai_client=llm_clients.OpenAI(reply='[]', usage=OPENAI_USAGE))
+    service.validate_configuration('hostname R1')
+
+    stats = service.prompt_cache_stats.get_stats()['openai']
+    assert stats == {
+        'requests': 1, 'prompt_tokens': 2000, 'cached_tokens': 1024,
+        'cache_write_tokens': 0, 'cached_ratio': 0.512
+    }
+
+
+def test_audit_requests_share_a_prefix_across_devices(make_ai_service, llm_clients):
+    """Test that only the user message varies between devices of one audit"""
+    openai = llm_clients.OpenAI(reply='[]', usage=OPENAI_USAGE)
+    service = make_ai_service(openai_client=openai)
+    audit = CiscoAuditService.__new__(CiscoAuditService)
+    audit.ai_service = service
+
+    for name in ('R1', 'R2'):
+        device = SimpleNamespace(name=name, model='ISR4331', ip_address='10.0.0.1')
+        audit._analyze_chunk_with_ai(f'hostname {name}', device, 'compliance')
+
+    first, second = (request['messages'] for request in openai.requests)
+    assert first[0] == second[0]
+    assert first[1] != second[1]
+    assert 'PCI-DSS' in first[0]['content'] and 'PCI-DSS' not in first[1]['content']
+    assert 'hostname R1' in first[1]['content']
+
+
+def test_missing_usage_is_ignored():
+    stats = PromptCacheStats()
+    stats.record_openai(None)
+    stats.record_anthropic(SimpleNamespace(input_tokens=10))
+    assert stats.get_stats() == {'anthropic': {
+        'requests': 1, 'prompt_tokens': 10, 'cached_tokens': 0, 'cache_write_tokens': 0, 'cached_ratio': 0.0
+    }}
@@ -0,0 +1,117 @@
+"""
+Simple tests to verify LLM provider failover, circuit breaking and hedging
+"""
+import asyncio
+import time
+
+import pytest
+
+from backend.ai.llm_manager import LLMManager
+from backend.ai.llm_providers import LLMProvider
+from backend.ai.provider_router import CIRCUIT_OPEN, MIN_HEDGE_SAMPLES, CircuitOpenError, ProviderRouter
+from backend.ai.response_cache import LLMResponseCache
+
+
+def failing():
+    raise RuntimeError('503 from upstream')
+
+
+def test_failover_and_circuit_breaker():
+    """Test that repeated failures open the circuit so the provider is skipped"""
+    router = ProviderRouter(failure_threshold=3, reset_timeout=60)
+    calls = []
+
+    def attempt(name, request):
+        def call():
+            calls.append(name)
+            return request()
+        return (name, router.measured(name, call))
+
+    for _ in range(3):
+        assert router.call([attempt('openai', failing), attempt('anthropic', lambda: 'ok')]) == 'ok'
+    assert router.health('openai').state == CIRCUIT_OPEN
+
+    calls.clear()
+    assert router.call([attempt('openai', failing), attempt('anthropic', lambda: 'ok')]) == 'ok'
+    assert calls == ['anthropic']
+
+    with pytest.raises(CircuitOpenError):
+        router.call([attempt('openai', failing)])
+
+
+def test_half_open_probe_closes_the_circuit():
+    router = ProviderRouter(failure_threshold=1, reset_timeout=0.01)
+    with pytest.raises(RuntimeError):
+        router.call([('openai', router.measured('openai', failing))])
+    assert router.select(['openai']) == []
+
+    time.sleep(0.02)
+    assert router.select(['openai', 'anthropic']) == ['anthropic', 'openai']
+    assert router.call([('openai', router.measured('openai', lambda: 'recovered'))]) == 'recovered'
+    assert router.health('openai').state == 'closed'
+
+
+def test_degraded_provider_is_tried_last():
+    router = ProviderRouter(failure_threshold=10)
+    for _ in range(4):
+        router.record_failure('openai')
+    assert router.select(['openai', 'anthropic']) == ['anthropic', 'openai']
+
+
+def test_hedges_a_slow_primary_after_its_p95():
+    """Test that a primary slower than its p95 is raced against the next provider"""
+    router = ProviderRouter(hedge_enabled=True, hedge_min_delay=0.01)
+    for _ in range(MIN_HEDGE_SAMPLES):
+        router.record_success('openai', 0.01)
+    cancelled = False
+
+    async def slow():
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(1)
+            return 'slow'
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    async def fast():
+        return 'fast'
+
+    result = asyncio.run(router.call_async([('openai', slow), ('anthropic', fast)]))
+    assert result == 'fast'
+    assert cancelled
+    assert router.get_stats()['hedges'] == 1
+
+
+def test_no_hedge_without_latency_history():
+    router = ProviderRouter(hedge_enabled=True, hedge_min_delay=0.01)
+
+    async def primary():
+        await asyncio.sleep(0.03)
+        return 'primary'
+
+    async def secondary():
+        return 'secondary'
+
+    assert asyncio.run(router.call_async([('openai', primary), ('anthropic', secondary)])) == 'primary'
+    assert router.hedges == 0
+
+
+class StaticProvider(LLMProvider):
+    def __init__(self, answer=None):
+        self.answer = answer
+        self.response_cache = LLMResponseCache(enabled=False)
+
+    def _generate_text(self, prompt, **request_params):
+        if self.answer is None:
+            raise RuntimeError('provider down')
+        return self.answer
+
+
+def test_manager_fails_over_from_current_provider():
+    manager = LLMManager(router=ProviderRouter())
+    manager._providers = {'groq': StaticProvider('from groq'), 'openrouter': StaticProvider()}
+    manager.switch_provider('openrouter')
+
+    assert manager.generate_text('show version') == 'from groq'
+    assert manager.router.health('openrouter').failures == 1
@@ -0,0 +1,102 @@
+"""
+Simple tests to verify async LLM requests are bounded, timed out and cancellable
+"""
+import asyncio
+
+import pytest
+
+from backend.ai.request_gate import LLMRequestGate
+
+
+def test_gate_limits_concurrent_requests():
+    """Test that no more than max_concurrent requests run at once"""
+    gate = LLMRequestGate(max_concurrent=2, timeout=5)
+    running, peak = 0, 0
+
+    async def request():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return 'ok'
+
+    async def run():
+        return await asyncio.gather(*(gate.run(request) for _ in range(6)))
+
+    assert asyncio.run(run()) == ['ok'] * 6
+    assert peak == 2
+    assert gate.get_stats()['active'] == 0
+
+
+def test_raising_the_limit_admits_waiting_requests():
+    """Test that a larger concurrent_requests setting applies to queued requests"""
+    gate = LLMRequestGate(max_concurrent=1, timeout=5)
+    release = None
+
+    async def blocked():
+        await release.wait()
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        first = asyncio.create_task(gate.run(blocked))
+        second = asyncio.create_task(gate.run(blocked))
+        await asyncio.sleep(0.01)
+        assert gate.get_stats()['waiting'] == 1
+
+        gate.apply_core_settings({'concurrent_requests': 2, 'response_timeout': 30})
+        await asyncio.sleep(0.01)
+        assert gate.get_stats()['active'] == 2
+
+        release.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(run())
+    assert gate.timeout == 30
+
+
+def test_timeout_cancels_the_request():
+    """Test that a slow request is cancelled and its slot released"""
+    gate = LLMRequestGate(max_concurrent=1, timeout=0.01)
+    cancelled = False
+
+    async def slow():
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await gate.run(slow)
+
+    asyncio.run(run())
+    assert cancelled
+    assert gate.get_stats()['active'] == 0
+
+
+def test_async_completion_falls_back_to_anthropic(make_ai_service, llm_clients):
+    """Test that an OpenAI failure falls back without a blocking client"""
+    anthropic_client = llm_clients.AsyncAnthropic(reply='from anthropic')
+    service = make_ai_service(
+        async_openai_client=llm_clients.AsyncOpenAI(error=RuntimeError('rate limited')),
+        async_anthropic_client=anthropic_client
+    )
+
+    config = asyncio.run(service.generate_configuration_async({'hostname': 'R1'}, 'ios'))
+
+    assert config == 'from anthropic'
+    assert anthropic_client.requests[0]['system']
+
+
+def test_async_validation_without_providers_reports_unavailable(make_ai_service):
+    service = make_ai_service()
+
+    result = asyncio.run(service.validate_configuration_async('hostname R1', 'ios', 'basic'))
+
+    assert result['status'] == 'error'
+    assert result['message'] == 'AI validation service unavailable'
+    assert result['level'] == 'basic'
@@ -0,0 +1,116 @@
+"""
+Simple tests to verify LLM responses are cached, evicted, expired and persisted
+"""
+import asyncio
+import time
+
+from backend.ai.llm_providers import LLMProvider
+from backend.ai.response_cache import LLMResponseCache, make_cache_key
+
+
+def key(content, **overrides):
+    params = dict(provider='openai', model='gpt-4', system='sys', temperature=0.2, max_tokens=100)
+    params.update(overrides)
+    return make_cache_key(
+        params['provider'], params['model'], params['system'],
+        [{'role': 'user', 'content': content}], params['temperature'], params['max_tokens']
+    )
+
+
+def test_key_normalizes_whitespace_but_not_parameters():
+    """Test that trailing whitespace is ignored while model and sampling settings are not"""
+    assert key('show run  \n') == key('show run')
+    assert key('interface Gi0/1\n ip address') != key('interface Gi0/1\nip address')
+    assert key('show run') != key('show run', temperature=0.7)
+    assert key('show run') != key('show run', max_tokens=200)
+    assert key('show run') != key('show run', model='gpt-4o')
+    assert key('show run') != key('show run', provider='anthropic')
+
+
+def test_lru_eviction_and_counters():
+    """Test that the least recently used entry is evicted first"""
+    cache = LLMResponseCache(max_entries=2, ttl=60)
+    cache.put('a', '1')
+    cache.put('b', '2')
+    assert cache.get('a') == '1'
+    cache.put('c', '3')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == '1'
+    assert cache.get('c') == '3'
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['entries']) == (3, 1, 1, 2)
+
+
+def test_entries_expire_after_ttl():
+    cache = LLMResponseCache(max_entries=10, ttl=0.01)
+    cache.put('a', '1')
+    time.sleep(0.02)
+    assert cache.get('a') is None
+
+
+def test_core_settings_disable_and_resize():
+    cache = LLMResponseCache(max_entries=10, ttl=60)
+    for name in 'abc':
+        cache.put(name, name)
+
+    cache.apply_core_settings({'cache_enabled': True, 'cache_duration': 120, 'cache_size_limit': 2})
+    assert cache.get_stats()['entries'] == 2
+    assert cache.ttl == 120
+
+    cache.apply_core_settings({'cache_enabled': False})
+    cache.put('d', 'd')
+    assert cache.get('c') is None
+
+
+def test_sqlite_store_survives_restart(tmp_path):
+    """Test that a new cache over the same file serves earlier responses"""
+    path = str(tmp_path / 'llm_cache.db')
+    first = LLMResponseCache(max_entries=2, ttl=60, path=path)
+    for name in 'abc':
+        first.put(name, name.upper())
+
+    restarted = LLMResponseCache(max_entries=2, ttl=60, path=path)
+    assert restarted.get('c') == 'C'
+    assert restarted.get('a') is None
+    assert restarted.get_stats()['persisted_entries'] == 2
+
+
+def test_ai_service_answers_repeats_from_cache(make_ai_service, llm_clients):
+    """Test that sync and async completions share cached responses keyed by temperature"""
+    service = make_ai_service(
+        openai_client=llm_clients.OpenAI(reply='hostname R1'),
+        async_openai_client=llm_clients.AsyncOpenAI(reply='hostname R1')
+    )
+
+    messages = [{'role': 'user', 'content': 'Generate a config'}]
+    assert service._complete('sys', messages, 100, 0.2) == 'hostname R1'
+    assert asyncio.run(service._complete_async('sys', messages, 100, 0.2)) == 'hostname R1'
+    assert service._complete('sys', messages, 100, 0.5) == 'hostname R1'
+
+    assert service.openai_client.calls == 2
+    assert service.async_openai_client.calls == 0
+    assert service.response_cache.get_stats()['hits'] == 1
+
+
+class CountingProvider(LLMProvider):
+    provider_name = 'counting'
+    model = 'test-model'
+
+    def __init__(self):
+        self.default_params = {'temperature': 0.1}
+        self.response_cache = LLMResponseCache()
+        self.prompts = []
+
+    def _generate_text(self, prompt, **request_params):
+        self.prompts.append((prompt, request_params))
+        return f'answer {len(self.prompts)}'
+
+
+def test_provider_generate_text_is_cached():
+    provider = CountingProvider()
+
+    assert provider.generate_config('two vlans', 'switch') == 'answer 1'
+    assert provider.generate_config('two vlans', 'switch') == 'answer 1'
+    assert provider.generate_text('other', temperature=0.9) == 'answer 2'
+    assert provider.prompts[1][1] == {'temperature': 0.9}
@@ -0,0 +1,53 @@
+"""
+Simple tests to verify chat responses stream token by token
+"""
+import asyncio
+
+import pytest
+
+from backend.ai.ai_service import CHAT_UNAVAILABLE_MESSAGE
+
+
+@pytest.fixture
+def make_service(make_ai_service):
+    def make(openai_client=None, anthropic_client=None):
+        service = make_ai_service(async_openai_client=openai_client, async_anthropic_client=anthropic_client)
+        service._build_chat_messages = lambda *args: ('sys', [{'role': 'user', 'content': args[0]}])
+
+        async def build_chat_messages(*args):
+            return service._build_chat_messages(*args)
+        service._build_chat_messages_async = build_chat_messages
+        return service
+    return make
+
+
+def collect(service, message='why is ospf down?'):
+    async def run():
+        return [delta async for delta in service.stream_response_async(message, 's1', 'u1', None)]
+    return asyncio.run(run())
+
+
+def test_streams_openai_deltas_and_caches_the_reply(make_service, llm_clients):
+    openai_client = llm_clients.AsyncOpenAI(tokens=['Check ', 'the ', 'hello timers'])
+    service = make_service(openai_client)
+
+    assert collect(service) == ['Check ', 'the ', 'hello timers']
+    assert openai_client.streams[0].closed
+    assert service.request_gate.get_stats()['active'] == 0
+
+    # A repeat is served from the cache as one delta
+    assert collect(service) == ['Check the hello timers']
+    assert len(openai_client.streams) == 1
+
+
+def test_falls_back_to_anthropic_before_the_first_token(make_service, llm_clients):
+    service = make_service(
+        llm_clients.AsyncOpenAI(error=RuntimeError('rate limited')),
+        llm_clients.AsyncAnthropic(tokens=['MTU ', 'mismatch'])
+    )
+
+    assert collect(service) == ['MTU ', 'mismatch']
+
+
+def test_unavailable_message_without_providers(make_service):
+    assert collect(make_service()) == [CHAT_UNAVAILABLE_MESSAGE]
@@ -0,0 +1,101 @@
+"""
+Simple tests to verify concurrent identical LLM requests share one call
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.ai.request_gate import LLMRequestGate
+from backend.ai.response_cache import LLMResponseCache
+from backend.ai.single_flight import SingleFlight
+
+
+def test_threads_share_one_call():
+    """Test that blocking callers with the same key run the function once"""
+    flight = SingleFlight()
+    calls = 0
+
+    def slow():
+        nonlocal calls
+        calls += 1
+        time.sleep(0.05)
+        return 'valid'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do('k', slow))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ['valid'] * 8
+    assert calls == 1
+    assert flight.get_stats() == {'in_flight': 0, 'leaders': 1, 'coalesced': 7}
+
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError('rate limited')
+
+    async def run():
+        return await asyncio.gather(*(flight.do_async('k', failing) for _ in range(3)), return_exceptions=True)
+
+    errors = asyncio.run(run())
+    assert [str(e) for e in errors] == ['rate limited'] * 3
+    assert flight.get_stats()['leaders'] == 1
+
+
+def test_cancelled_waiter_leaves_shared_request_running():
+    """Test that the upstream request is only cancelled when its last waiter goes"""
+    flight = SingleFlight()
+    cancelled = False
+
+    async def slow():
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(0.05)
+            return 'done'
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    async def run():
+        first = asyncio.create_task(flight.do_async('k', slow))
+        second = asyncio.create_task(flight.do_async('k', slow))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == 'done'
+        assert not cancelled
+
+        lone = asyncio.create_task(flight.do_async('k', slow))
+        await asyncio.sleep(0.01)
+        lone.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await lone
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert cancelled
+
+
+def test_identical_validations_make_one_upstream_call(make_ai_service, llm_clients):
+    service = make_ai_service(
+        async_anthropic_client=llm_clients.AsyncAnthropic(reply='{"valid": true}', delay=0.02),
+        request_gate=LLMRequestGate(max_concurrent=5, timeout=5),
+        response_cache=LLMResponseCache(enabled=False)
+    )
+
+    async def run():
+        return await asyncio.gather(*(
+            service.validate_configuration_async('hostname R1', 'ios', 'standard') for _ in range(12)
+        ))
+
+    results = asyncio.run(run())
+    assert len(results) == 12
+    assert service.async_anthropic_client.calls == 1
+    assert service.single_flight.get_stats()['coalesced'] == 11
@@ -0,0 +1,146 @@
+"""
+Simple tests to verify the cached chat system context and its invalidation
+"""
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.ai.system_context import (
+    SystemContextCache, SystemContextSnapshot, load_system_context, render_system_context, system_context_cache
+)
+from backend.database.models import Base, NetworkDevice, OperationLog, User
+
+
+def make_session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    user = User(email='ctx@example.com', password_hash='x')
+    db.add(user)
+    db.flush()
+    devices = [
+        NetworkDevice(name=f'R{i}', ip_address=f'10.0.0.{i}', model='ISR4331', status='online', owner_id=user.id)
+        for i in range(3)
+    ]
+    db.add_all(devices)
+    db.flush()
+    db.add(OperationLog(user_id=user.id, device_id=devices[0].id, operation_type='backup', status='success'))
+    db.commit()
+    system_context_cache.clear()
+    return engine, db, user.id, devices
+
+
+def cached(db, user_id):
+    return system_context_cache.get(user_id, lambda: load_system_context(db, user_id))
+
+
+def test_snapshot_is_loaded_once():
+    """Test that repeated lookups reuse the snapshot without queries"""
+    engine, db, user_id, devices = make_session()
+    first = cached(db, user_id)
+
+    statements = []
+    event.listen(engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    assert cached(db, user_id) is first
+    assert statements == []
+    assert first.recent_operations[0]['device'] == 'R0'
+    assert 'Devices: 3 total, 3 online' in first.text
+
+
+def test_status_change_and_new_operation_invalidate():
+    """Test that device status and operation log commits drop the snapshot"""
+    engine, db, user_id, devices = make_session()
+    first = cached(db, user_id)
+
+    devices[1].status = 'offline'
+    db.commit()
+    second = cached(db, user_id)
+    assert second is not first
+    assert second.online_devices == 2
+
+    db.add(OperationLog(user_id=user_id, device_id=devices[2].id, operation_type='deploy', status='failed'))
+    db.commit()
+    assert cached(db, user_id) is not second
+
+
+def test_unrendered_column_and_rollback_keep_snapshot():
+    """Test that writes not shown in the prompt, or rolled back, keep the snapshot"""
+    engine, db, user_id, devices = make_session()
+    first = cached(db, user_id)
+
+    devices[0].last_seen = datetime.now(timezone.utc)
+    db.commit()
+    assert cached(db, user_id) is first
+
+    devices[0].status = 'offline'
+    db.flush()
+    db.rollback()
+    assert cached(db, user_id) is first
+
+
+def test_invalidate_devices_drops_snapshots_showing_them():
+    """Test explicit invalidation used after bulk updates"""
+    engine, db, user_id, devices = make_session()
+    first = cached(db, user_id)
+
+    system_context_cache.invalidate_devices(['unknown'])
+    assert cached(db, user_id) is first
+    system_context_cache.invalidate_devices([devices[2].id])
+    assert cached(db, user_id) is not first
+
+
+def test_render_caps_devices_and_lists_offline_first():
+    """Test that large inventories render compactly with problem devices kept"""
+    engine, db, user_id, devices = make_session()
+    snapshot = load_system_context(db, user_id)
+    snapshot.devices[2]['status'] = 'offline'
+
+    text = render_system_context(snapshot, max_devices=1)
+    assert '- R2 10.0.0.2 ISR4331 offline' in text
+    assert '... 2 more devices' in text
+    assert 'R0 10.0.0.0' not in text
+
+
+def test_ttl_expires_snapshot():
+    """Test that snapshots are reloaded after the TTL"""
+    cache = SystemContextCache(ttl=0)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return SystemContextSnapshot(loaded_at=time.monotonic())
+    cache.get('u1', loader)
+    cache.get('u1', loader)
+    assert len(loads) == 2
+
+
+def test_invalidation_during_load_is_not_lost():
+    """Test that a snapshot invalidated while it loads is not cached"""
+    cache = SystemContextCache()
+    started, release = threading.Event(), threading.Event()
+    loads = []
+
+    def slow_loader():
+        loads.append(1)
+        started.set()
+        release.wait(5)
+        return SystemContextSnapshot(device_ids=frozenset({'d1'}), loaded_at=time.monotonic())
+
+    for invalidate in (lambda: cache.invalidate_users(['u1']),
+                       lambda: cache.invalidate_devices(['d1'])):
+        started.clear()
+        release.clear()
+        worker = threading.Thread(target=cache.get, args=('u1', slow_loader))
+        worker.start()
+        assert started.wait(5)
+        invalidate()
+        release.set()
+        worker.join(5)
+        assert cache.get_stats()['entries'] == 0
+
+    cache.get('u1', lambda: SystemContextSnapshot(loaded_at=time.monotonic()))
+    assert len(loads) == 2
+    assert cache.get_stats()['entries'] == 1
@@ -250,7 +250,7 @@ async def validate_configuration(
     try:
         from backend.ai.ai_service import ai_service
         
-        validation_result = ai_service.validate_configuration(config, device_type)
+        validation_result = await ai_service.validate_configuration_async(config, device_type, "standard")
         
         return {
             "success": True,
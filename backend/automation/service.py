@@ -178,6 +178,8 @@ class AutomationService:
                 return self._execute_config_generation(config, task.user_id)
             elif task.task_type == 'device_monitoring':
                 return self._execute_device_monitoring(config, task.user_id)
+            elif task.task_type == 'drift_detection':
+                return self._execute_drift_detection(config, task.user_id)
             else:
                 return {'success': False, 'error': f'Unknown task type: {task.task_type}'}
         except Exception as e:
@@ -193,8 +195,9 @@ class AutomationService:
             device_ids = config.get('device_ids', [])
             if not device_ids:
                 # Backup all user devices if none specified
-                devices = self.db.query(NetworkDevice).filter(NetworkDevice.owner_id == user_id).all()
-                device_ids = [device.id for device in devices]
+                device_ids = [
+                    row.id for row in self.db.query(NetworkDevice.id).filter(NetworkDevice.owner_id == user_id)
+                ]
             
             results = []
             for device_id in device_ids:
@@ -232,27 +235,23 @@ class AutomationService:
             device_service = DeviceService(self.db)
             
             device_ids = config.get('device_ids', [])
-            if not device_ids:
-                devices = self.db.query(NetworkDevice).filter(NetworkDevice.owner_id == user_id).all()
-                device_ids = [device.id for device in devices]
             
-            results = []
-            for device_id in device_ids:
-                try:
-                    result = device_service.test_connectivity(device_id, save_result=True)
-                    results.append({
-                        'device_id': device_id,
-                        'device_name': result['device_name'],
-                        'status': result['status'],
-                        'response_time': result['response_time_ms'],
-                        'error': result.get('error')
-                    })
-                except Exception as e:
-                    results.append({
-                        'device_id': device_id,
-                        'status': 'error',
-                        'error': str(e)
-                    })
+            # Probe all devices concurrently; without explicit ids sweep the user's devices
+            sweep = device_service.sweep_connectivity(
+                device_ids=device_ids or None,
+                owner_id=None if device_ids else user_id,
+                save_result=True
+            )
+            results = [
+                {
+                    'device_id': r['device_id'],
+                    'device_name': r['device_name'],
+                    'status': r['status'],
+                    'response_time': r['response_time_ms'],
+                    'error': r.get('error')
+                }
+                for r in sweep['results']
+            ]
             
             online_count = sum(1 for r in results if r['status'] == 'online')
             total_count = len(results)
@@ -266,6 +265,25 @@ class AutomationService:
             logger.error(f"Error in health check automation: {e}")
             return {'success': False, 'error': str(e)}
     
+    def _execute_drift_detection(self, config: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+        """Execute baseline drift detection automation"""
+        try:
+            from backend.operations.drift_service import DriftService
+            
+            baseline_id = config.get('baseline_id')
+            if not baseline_id:
+                return {'success': False, 'error': 'baseline_id is required'}
+            
+            result = DriftService(self.db).detect_baseline_drift(baseline_id, config.get('device_ids') or None)
+            return {
+                'success': True,
+                'message': f"Drift detection completed: {result['devices_drifted']}/{result['devices_checked']} devices drifted",
+                'results': result['results']
+            }
+        except Exception as e:
+            logger.error(f"Error in drift detection automation: {e}")
+            return {'success': False, 'error': str(e)}
+    
     def _execute_config_generation(self, config: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         """Execute configuration generation automation"""
         try:
@@ -304,8 +322,9 @@ class AutomationService:
             # Get devices to monitor
             device_ids = config.get('device_ids', [])
             if not device_ids:
-                devices = self.db.query(NetworkDevice).filter(NetworkDevice.owner_id == user_id).all()
-                device_ids = [device.id for device in devices]
+                device_ids = [
+                    row.id for row in self.db.query(NetworkDevice.id).filter(NetworkDevice.owner_id == user_id)
+                ]
             
             # Collect monitoring data
             monitoring_data = []
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
 from sqlalchemy.orm import Session
-from backend.database.database import get_db
-from backend.ai.ai_service import ai_service
-from backend.database.models import AIConversation, User
+from backend.database.database import get_db, SessionLocal
+from backend.ai.ai_service import ai_service, CHAT_UNAVAILABLE_MESSAGE
+from backend.database.models import AIConversation, ConversationSummary, User
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 import uuid
@@ -46,7 +46,7 @@ async def send_message(
         )
         
         # Get AI response
-        ai_response = ai_service.get_response(
+        ai_response = await ai_service.get_response_async(
             user_message=chat_message.message,
             session_id=session_id,
             user_id=user_id,
@@ -160,8 +160,13 @@ async def delete_chat_session(
             AIConversation.session_id == session_id,
             AIConversation.user_id == user_id
         ).delete()
+        db.query(ConversationSummary).filter(
+            ConversationSummary.session_id == session_id,
+            ConversationSummary.user_id == user_id
+        ).delete()
         
         db.commit()
+        ai_service.context_builder.invalidate(session_id, user_id)
         
         return {
             'message': f'Deleted {deleted_count} messages from session {session_id}',
@@ -182,7 +187,7 @@ async def generate_configuration(
 ):
     """Generate network configuration using AI"""
     try:
-        config = ai_service.generate_configuration(config_type, parameters)
+        config = await ai_service.generate_configuration_async(parameters, "ios", config_type=config_type)
         
         # Log the generation as a conversation
         session_id = str(uuid.uuid4())
@@ -223,7 +228,7 @@ async def validate_configuration(
 ):
     """Validate network configuration using AI"""
     try:
-        validation_result = ai_service.validate_configuration(config_content, device_type)
+        validation_result = await ai_service.validate_configuration_async(config_content, device_type, "standard")
         
         # Log the validation as a conversation
         session_id = str(uuid.uuid4())
@@ -272,11 +277,14 @@ async def websocket_endpoint(websocket: WebSocket):
                     'timestamp': datetime.now().isoformat()
                 }
                 await chat_manager.send_personal_message(user_message, session_id)
+                if user_message['content']:
+                    await stream_chat_reply(session_id, user_message['content'])
                 
             elif message_data.get('type') == 'join_session':
                 # Handle user joining a specific chat session
                 requested_session_id = message_data.get('session_id')
                 if requested_session_id:
+                    chat_manager.move_session(session_id, requested_session_id)
                     session_id = requested_session_id
                     
                 join_message = {
@@ -306,6 +314,55 @@ async def websocket_endpoint(websocket: WebSocket):
         logger.error(f"WebSocket error: {e}")
         chat_manager.disconnect(session_id)
 
+async def stream_chat_reply(session_id: str, content: str, user_id: str = "default_user"):
+    """Stream the AI reply to a websocket chat message as message_delta frames
+    
+    Both messages are persisted once the stream ends; a reply cut short by a
+    disconnect or provider error is not saved.
+    """
+    db = SessionLocal()
+    try:
+        message_id = str(uuid.uuid4())
+        deltas = ai_service.stream_response_async(content, session_id, user_id, db)
+        try:
+            reply = await chat_manager.stream_message(session_id, message_id, deltas)
+        except Exception as e:
+            logger.error(f"Error streaming chat response: {e}")
+            reply = None
+            await chat_manager.send_personal_message({
+                'type': 'error',
+                'session_id': session_id,
+                'message_id': message_id,
+                'role': 'system',
+                'content': CHAT_UNAVAILABLE_MESSAGE,
+                'timestamp': datetime.now().isoformat()
+            }, session_id)
+        
+        ai_service.save_conversation(user_id=user_id, session_id=session_id, role="user", content=content, db=db)
+        if reply is None:
+            return
+        
+        ai_conversation = ai_service.save_conversation(
+            user_id=user_id,
+            session_id=session_id,
+            role="assistant",
+            content=reply,
+            db=db,
+            message_id=message_id
+        )
+        await chat_manager.send_personal_message({
+            'type': 'chat_response',
+            'session_id': session_id,
+            'message_id': message_id,
+            'role': 'assistant',
+            'content': reply,
+            'timestamp': ai_conversation.created_at.isoformat()
+        }, session_id)
+    except Exception as e:
+        logger.error(f"Error saving streamed chat messages: {e}")
+    finally:
+        db.close()
+
 async def broadcast_message(message: dict):
     """Broadcast message to all active WebSocket connections using unified schema"""
     await chat_manager.broadcast(message)
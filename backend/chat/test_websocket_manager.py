@@ -82,6 +82,47 @@ def test_active_sessions():
     assert 'session2' in active_sessions
 
 
+@pytest.mark.asyncio
+async def test_stream_message_sends_deltas():
+    """Test that streamed tokens are forwarded as message_delta frames"""
+    import json
+    manager = ChatWebSocketManager()
+    mock_websocket = AsyncMock()
+    await manager.connect(mock_websocket, "stream-session")
+
+    async def deltas():
+        for token in ["show ", "ip ", "route"]:
+            yield token
+
+    reply = await manager.stream_message("stream-session", "msg-1", deltas())
+
+    frames = [json.loads(call[0][0]) for call in mock_websocket.send_text.call_args_list[1:]]
+    assert reply == "show ip route"
+    assert [f['content'] for f in frames] == ["show ", "ip ", "route"]
+    assert all(f['type'] == 'message_delta' and f['message_id'] == 'msg-1' for f in frames)
+
+
+@pytest.mark.asyncio
+async def test_stream_message_stops_after_disconnect():
+    """Test that a disconnected client stops the stream and closes it"""
+    manager = ChatWebSocketManager()
+    await manager.connect(AsyncMock(), "gone-session")
+    closed = False
+
+    async def deltas():
+        nonlocal closed
+        try:
+            yield "first"
+            manager.disconnect("gone-session")
+            yield "second"
+            yield "third"
+        finally:
+            closed = True
+
+    assert await manager.stream_message("gone-session", "msg-2", deltas()) is None
+    assert closed
+
+
 if __name__ == "__main__":
     print("Running basic tests for ChatWebSocketManager...")
     
@@ -4,7 +4,7 @@ Handles WebSocket connections, message broadcasting, and chat message history
 """
 import json
 import asyncio
-from typing import Dict, List, Set
+from typing import AsyncIterator, Dict, List, Optional, Set
 from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime
 import logging
@@ -59,6 +59,44 @@ class ChatWebSocketManager:
                 logger.error(f"Error sending message to {session_id}: {e}")
                 self.disconnect(session_id)
         
+    def is_connected(self, session_id: str) -> bool:
+        return session_id in self.active_connections
+    
+    def move_session(self, old_session_id: str, new_session_id: str):
+        """Re-key a connection when its client joins an existing chat session"""
+        if old_session_id == new_session_id or old_session_id not in self.active_connections:
+            return
+        self.active_connections[new_session_id] = self.active_connections.pop(old_session_id)
+        self.connection_metadata[new_session_id] = self.connection_metadata.pop(old_session_id, {})
+        
+    async def send_delta(self, session_id: str, message_id: str, content: str):
+        """Send one increment of a streamed assistant message"""
+        await self.send_personal_message({
+            'type': 'message_delta',
+            'session_id': session_id,
+            'message_id': message_id,
+            'role': 'assistant',
+            'content': content,
+            'timestamp': datetime.now().isoformat()
+        }, session_id)
+        
+    async def stream_message(self, session_id: str, message_id: str, deltas: AsyncIterator[str]) -> Optional[str]:
+        """Forward deltas as message_delta frames and return the full text
+        
+        Returns None if the client disconnected mid-stream; the upstream
+        stream is closed either way.
+        """
+        parts = []
+        try:
+            async for delta in deltas:
+                if not self.is_connected(session_id):
+                    return None
+                parts.append(delta)
+                await self.send_delta(session_id, message_id, delta)
+        finally:
+            await deltas.aclose()
+        return ''.join(parts)
+        
     async def broadcast(self, message: dict):
         """Broadcast message to all connections"""
         disconnected_sessions = []
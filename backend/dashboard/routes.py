@@ -107,7 +107,7 @@ async def execute_quick_action(action: str, db: Session = Depends(get_db)):
         if action == "backup-all":
             # Trigger backup for all devices
             device_service = DeviceService(db)
-            devices = device_service.get_all_devices()
+            devices = device_service.get_device_summaries()
             results = []
             
             for device in devices:
@@ -133,29 +133,20 @@ async def execute_quick_action(action: str, db: Session = Depends(get_db)):
             }
             
         elif action == "health-check":
-            # Run health check on all devices
+            # Run health check on all devices concurrently
             device_service = DeviceService(db)
-            devices = device_service.get_all_devices()
-            results = []
-            
-            for device in devices:
-                try:
-                    result = device_service.test_connectivity(device.id, save_result=True)
-                    results.append({
-                        'device_id': device.id,
-                        'device_name': device.name,
-                        'status': result['status'],
-                        'response_time': result.get('response_time_ms')
-                    })
-                except Exception as e:
-                    results.append({
-                        'device_id': device.id,
-                        'device_name': device.name,
-                        'status': 'error',
-                        'error': str(e)
-                    })
+            sweep = await device_service.sweep_connectivity_async(save_result=True)
+            results = [
+                {
+                    'device_id': r['device_id'],
+                    'device_name': r['device_name'],
+                    'status': r['status'],
+                    'response_time': r.get('response_time_ms')
+                }
+                for r in sweep['results']
+            ]
             
-            online_count = sum(1 for r in results if r['status'] == 'online')
+            online_count = sweep['online']
             return {
                 'message': f'Health check completed: {online_count}/{len(results)} devices online',
                 'results': results
@@ -11,8 +11,15 @@ load_dotenv()
 # Use DB_URL for SQLite or DATABASE_URL for PostgreSQL
 DATABASE_URL = os.getenv("DATABASE_URL") or os.getenv("DB_URL", "sqlite:///data/app.db")
 
+# Connection pool sized for parallel workers (audits, bulk operations) that each hold a session
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+
 # Create engine
-engine = create_engine(DATABASE_URL, echo=True)
+if DATABASE_URL.startswith("sqlite"):
+    engine = create_engine(DATABASE_URL, echo=True, connect_args={"check_same_thread": False})
+else:
+    engine = create_engine(DATABASE_URL, echo=True, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_pre_ping=True)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
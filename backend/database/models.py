@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, JSON, BigInteger
-from sqlalchemy.orm import relationship, DeclarativeBase, Mapped, mapped_column
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, JSON, BigInteger, LargeBinary, UniqueConstraint
+from sqlalchemy.orm import relationship, DeclarativeBase, Mapped, mapped_column, deferred, column_property
 from sqlalchemy.dialects.postgresql import UUID, INET
 from datetime import datetime, timezone
 from typing import List, Optional
@@ -63,12 +63,16 @@ class NetworkDevice(Base):
     status = Column(String(20), default='unknown')  # online, offline, warning, unknown
     uptime_seconds = Column(BigInteger, default=0)
     last_seen = Column(DateTime)
-    config_backup = Column(Text)
-    device_metadata = Column(JSON)
+    # Large columns are only loaded when accessed (or undeferred by the query)
+    config_backup = deferred(Column(Text), group='config')
+    device_metadata = deferred(Column(JSON), group='metadata')
     owner_id = Column(String(36), ForeignKey("users.id"))
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     
+    # Computed in SQL so listings never pull the backup text
+    has_config_backup = column_property(config_backup.expression.isnot(None))
+    
     # Relationships
     owner = relationship("User", back_populates="devices")
     operations = relationship("OperationLog", back_populates="device")
@@ -119,7 +123,7 @@ class NetworkDevice(Base):
             'uptime': self.uptime_formatted,
             'uptime_seconds': self.uptime_seconds,
             'last_seen': self.last_seen.isoformat() if self.last_seen else None,
-            'has_config_backup': bool(self.config_backup),
+            'has_config_backup': bool(self.has_config_backup),
             'metadata': self.device_metadata or {},
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
@@ -128,6 +132,55 @@ class NetworkDevice(Base):
     def __repr__(self):
         return f'<NetworkDevice {self.name} ({self.ip_address})>'
 
+class ConfigBlob(Base):
+    __tablename__ = 'config_blobs'
+    
+    content_hash = Column(String(64), primary_key=True)  # SHA-256 of the uncompressed config
+    compression = Column(String(10), nullable=False)  # zstd, gzip
+    size_bytes = Column(Integer, nullable=False)
+    compressed_size_bytes = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+class ConfigVersion(Base):
+    __tablename__ = 'config_versions'
+    __table_args__ = (UniqueConstraint('device_id', 'version', name='uq_config_versions_device_version'),)
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
+    device_id = Column(String(36), ForeignKey("network_devices.id"), nullable=False, index=True)
+    version = Column(Integer, nullable=False)
+    content_hash = Column(String(64), ForeignKey("config_blobs.content_hash"), nullable=False, index=True)
+    source = Column(String(50), default='backup')  # backup, deployment, manual
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    last_seen_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))  # Last backup with identical content
+    
+    # Relationships
+    device = relationship("NetworkDevice", backref="config_versions")
+    blob = relationship("ConfigBlob")
+    
+    def to_dict(self):
+        """Convert config version to dictionary"""
+        return {
+            'id': self.id,
+            'device_id': self.device_id,
+            'version': self.version,
+            'content_hash': self.content_hash,
+            'source': self.source,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'last_seen_at': self.last_seen_at.isoformat() if self.last_seen_at else None
+        }
+
+class ConfigDiff(Base):
+    __tablename__ = 'config_diffs'
+    
+    old_hash = Column(String(64), primary_key=True)
+    new_hash = Column(String(64), primary_key=True)
+    changes = Column(JSON, nullable=False)  # [[change_type, section, added_lines, removed_lines], ...]
+    sections_changed = Column(Integer, default=0)
+    lines_added = Column(Integer, default=0)
+    lines_removed = Column(Integer, default=0)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
 class OperationLog(Base):
     __tablename__ = 'operations_log'
     
@@ -160,6 +213,20 @@ class AIConversation(Base):
     # Relationships
     user = relationship("User", back_populates="conversations")
 
+class ConversationSummary(Base):
+    __tablename__ = 'ai_conversation_summaries'
+    __table_args__ = (UniqueConstraint('session_id', 'user_id', name='uq_conversation_summary_session'),)
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
+    session_id = Column(String(100), nullable=False)
+    user_id = Column(String(36), ForeignKey("users.id"))
+    summary = Column(Text, nullable=False)
+    # Last message folded into the summary, by (created_at, id) order
+    summarized_through = Column(DateTime, nullable=False)
+    last_message_id = Column(String(36), nullable=False)
+    message_count = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
 class AutomationTask(Base):
     __tablename__ = 'automation_tasks'
     
@@ -219,6 +286,19 @@ class AuditResult(Base):
     device = relationship("NetworkDevice", backref="audit_results")
     user = relationship("User", backref="audit_results")
 
+class AuditCacheEntry(Base):
+    __tablename__ = 'audit_cache'
+    
+    cache_key = Column(String(64), primary_key=True)  # SHA-256 of the fields below
+    config_hash = Column(String(64), nullable=False, index=True)
+    audit_type = Column(String(50), nullable=False)
+    ruleset_version = Column(String(64), nullable=False)
+    model = Column(String(100), nullable=False)
+    findings = Column(JSON, nullable=False)
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    last_hit_at = Column(DateTime)
+
 class BaselineConfig(Base):
     __tablename__ = 'baseline_configs'
     
@@ -0,0 +1,213 @@
+"""
+Bulk Device Operation Jobs
+Fans device operations out to a worker pool, tracks results per job and
+streams them to clients as each device finishes
+"""
+import asyncio
+import json
+import uuid
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from backend.database.connection import SessionLocal
+from backend.devices.service import DeviceService
+from backend.websocket_manager import connection_manager
+from backend.utils.config import config
+
+logger = logging.getLogger(__name__)
+
+BULK_OPERATIONS = ('test-connectivity', 'backup-config')
+
+
+class BulkJob:
+    """State of one bulk operation across many devices"""
+
+    def __init__(self, operation: str, device_ids: List[str], parallelism: int):
+        self.id = str(uuid.uuid4())
+        self.operation = operation
+        self.device_ids = list(device_ids)
+        self.parallelism = parallelism
+        self.status = 'pending'
+        self.results: List[Dict[str, Any]] = []
+        self.error: Optional[str] = None
+        self.created_at = datetime.now(timezone.utc)
+        self.finished_at: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Condition()
+        self._done = asyncio.Event()
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ('completed', 'failed')
+
+    @property
+    def successful(self) -> int:
+        return sum(1 for r in self.results if r['success'])
+
+    async def add_result(self, result: Dict[str, Any]):
+        async with self._changed:
+            self.results.append(result)
+            self._changed.notify_all()
+
+    async def finish(self, status: str, error: Optional[str] = None):
+        async with self._changed:
+            self.status = status
+            self.error = error
+            self.finished_at = datetime.now(timezone.utc)
+            self._changed.notify_all()
+        self._done.set()
+
+    async def wait(self):
+        """Wait until every device has finished"""
+        await self._done.wait()
+
+    async def iter_results(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield results already collected, then new ones as they arrive"""
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.results) > index or self.is_finished)
+                batch = self.results[index:]
+                finished = self.is_finished
+            for result in batch:
+                yield result
+            index += len(batch)
+            if finished and index >= len(self.results):
+                return
+
+    async def iter_ndjson(self) -> AsyncIterator[str]:
+        """Stream results as newline-delimited JSON, ending with a summary line"""
+        async for result in self.iter_results():
+            yield json.dumps({'event': 'result', 'job_id': self.id, **result}) + '\n'
+        yield json.dumps({'event': self.status, **self.to_dict()}) + '\n'
+
+    def to_dict(self, include_results: bool = False) -> Dict[str, Any]:
+        data = {
+            'job_id': self.id,
+            'operation': self.operation,
+            'status': self.status,
+            'total_devices': len(self.device_ids),
+            'completed': len(self.results),
+            'successful': self.successful,
+            'failed': len(self.results) - self.successful,
+            'parallelism': self.parallelism,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+        if include_results:
+            data['results'] = list(self.results)
+        return data
+
+
+class BulkJobManager:
+    """Runs bulk jobs on a shared thread pool with per-worker DB sessions"""
+
+    def __init__(
+        self,
+        max_workers: int = 64,
+        default_parallelism: int = 32,
+        max_finished_jobs: int = 100,
+        session_factory: Callable = SessionLocal
+    ):
+        self.max_workers = max_workers
+        self.default_parallelism = default_parallelism
+        self.max_finished_jobs = max_finished_jobs
+        self.session_factory = session_factory
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bulk-op')
+        self._jobs: "OrderedDict[str, BulkJob]" = OrderedDict()
+
+    def submit(self, operation: str, device_ids: List[str], parallelism: Optional[int] = None) -> BulkJob:
+        """Create a job and start it on the running event loop"""
+        if operation not in BULK_OPERATIONS:
+            raise ValueError(f"Unknown operation: {operation}")
+
+        parallelism = max(1, min(parallelism or self.default_parallelism, self.max_workers))
+        job = BulkJob(operation, device_ids, parallelism)
+        self._jobs[job.id] = job
+        self._prune()
+
+        job.task = asyncio.create_task(self._run(job))
+        logger.info(f"Started bulk job {job.id}: {operation} on {len(device_ids)} devices (parallelism {parallelism})")
+        return job
+
+    def get_job(self, job_id: str) -> Optional[BulkJob]:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[BulkJob]:
+        return list(self._jobs.values())
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+    async def _run(self, job: BulkJob):
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(job.parallelism)
+        job.status = 'running'
+
+        async def run_one(device_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await loop.run_in_executor(self._executor, self._execute, job.operation, device_id)
+
+        try:
+            total = len(job.device_ids)
+            for next_result in asyncio.as_completed([run_one(d) for d in job.device_ids]):
+                result = await next_result
+                await job.add_result(result)
+                await connection_manager.send_operation_update(
+                    operation_id=job.id,
+                    operation_type='bulk_operation',
+                    status='running',
+                    progress=int(len(job.results) / total * 100),
+                    message=f"{job.operation} finished on {len(job.results)}/{total} devices",
+                    data=result
+                )
+
+            await job.finish('completed')
+        except Exception as e:
+            logger.error(f"Bulk job {job.id} failed: {e}")
+            await job.finish('failed', str(e))
+
+        await connection_manager.send_operation_update(
+            operation_id=job.id,
+            operation_type='bulk_operation',
+            status=job.status,
+            progress=100,
+            message=f"{job.operation} completed: {job.successful}/{len(job.device_ids)} devices successful",
+            data=job.to_dict()
+        )
+
+    def _execute(self, operation: str, device_id: str) -> Dict[str, Any]:
+        """Run one device operation in a worker thread with its own session"""
+        db = self.session_factory()
+        try:
+            device_service = DeviceService(db)
+            if operation == 'test-connectivity':
+                result = device_service.test_connectivity(device_id, save_result=True)
+            else:
+                result = device_service.backup_configuration(device_id)
+            return {
+                'device_id': device_id,
+                'success': True,
+                'result': result
+            }
+        except Exception as e:
+            return {
+                'device_id': device_id,
+                'success': False,
+                'error': str(e)
+            }
+        finally:
+            db.close()
+
+
+# Global bulk job manager
+bulk_job_manager = BulkJobManager(
+    max_workers=config.BULK_OPERATION_MAX_WORKERS,
+    default_parallelism=config.BULK_OPERATION_PARALLELISM
+)
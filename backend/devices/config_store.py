@@ -0,0 +1,237 @@
+"""
+Content-Addressed Configuration Store
+Keeps every unique device configuration once, compressed and keyed by its
+SHA-256 hash, with per-device version pointers
+"""
+import gzip
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import desc
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.database.models import ConfigBlob, ConfigDiff, ConfigVersion
+from backend.network.config_diff import ConfigChangeSet, SectionChange, change_set_cache, diff_configs
+from backend.network.config_parser import compute_config_hash
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Retries when concurrent backups of one device race for the next version number
+VERSION_INSERT_ATTEMPTS = 5
+
+
+def compress_config(config_text: str) -> Tuple[str, bytes]:
+    """Compress a configuration, preferring zstd when available"""
+    raw = config_text.encode('utf-8')
+    if zstandard is not None:
+        return 'zstd', zstandard.ZstdCompressor(level=10).compress(raw)
+    return 'gzip', gzip.compress(raw, compresslevel=6)
+
+
+def decompress_config(compression: str, data: bytes) -> str:
+    """Restore configuration text from a stored blob"""
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("zstandard library is not installed. Please install it with 'pip install zstandard'.")
+        return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+    if compression == 'gzip':
+        return gzip.decompress(data).decode('utf-8')
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+class ConfigStore:
+    """Versioned, deduplicated storage of device configurations
+
+    Writes are flushed but not committed so they share the caller's transaction.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def save_config(self, device_id: str, config_text: str, source: str = 'backup') -> Dict[str, Any]:
+        """Record a configuration for a device, creating a version only if it changed"""
+        content_hash = compute_config_hash(config_text)
+        now = datetime.now(timezone.utc)
+
+        for attempt in range(VERSION_INSERT_ATTEMPTS):
+            latest = self.get_latest_version(device_id)
+            if latest and latest.content_hash == content_hash:
+                latest.last_seen_at = now
+                self.db.flush()
+                return {
+                    'version': latest.version,
+                    'content_hash': content_hash,
+                    'changed': False,
+                    'previous_hash': content_hash
+                }
+
+            self._store_blob(content_hash, config_text, now)
+
+            version = ConfigVersion(
+                device_id=device_id,
+                version=(latest.version + 1) if latest else 1,
+                content_hash=content_hash,
+                source=source,
+                created_at=now,
+                last_seen_at=now
+            )
+            try:
+                with self.db.begin_nested():
+                    self.db.add(version)
+            except IntegrityError:
+                # A concurrent backup of this device took the version number; re-read and retry
+                logger.debug(f"Config version {version.version} of device {device_id} already taken (attempt {attempt + 1})")
+                continue
+            break
+        else:
+            raise RuntimeError(f"Could not allocate a config version for device {device_id}")
+
+        logger.info(f"Stored config version {version.version} for device {device_id} ({content_hash[:12]})")
+        result = {
+            'version': version.version,
+            'content_hash': content_hash,
+            'changed': True,
+            'previous_hash': latest.content_hash if latest else None
+        }
+        if latest:
+            # Diff against the previous version now so later lookups hit the cache
+            change_set = self.get_change_set(latest.content_hash, content_hash, new_text=config_text)
+            result['change_summary'] = change_set.summary() if change_set else None
+        return result
+
+    def _store_blob(self, content_hash: str, config_text: str, now: datetime):
+        if self.db.get(ConfigBlob, content_hash) is not None:
+            return
+        compression, data = compress_config(config_text)
+        try:
+            with self.db.begin_nested():
+                self.db.add(ConfigBlob(
+                    content_hash=content_hash,
+                    compression=compression,
+                    size_bytes=len(config_text.encode('utf-8')),
+                    compressed_size_bytes=len(data),
+                    data=data,
+                    created_at=now
+                ))
+        except IntegrityError:
+            # Another worker stored identical content first
+            logger.debug(f"Config blob {content_hash[:12]} already stored")
+
+    def get_latest_version(self, device_id: str) -> Optional[ConfigVersion]:
+        """Get the newest version pointer for a device"""
+        return self.db.query(ConfigVersion).filter(
+            ConfigVersion.device_id == device_id
+        ).order_by(desc(ConfigVersion.version)).first()
+
+    def get_version(self, device_id: str, version: int) -> Optional[ConfigVersion]:
+        """Get a specific version pointer for a device"""
+        return self.db.query(ConfigVersion).filter(
+            ConfigVersion.device_id == device_id,
+            ConfigVersion.version == version
+        ).first()
+
+    def list_versions(self, device_id: str, limit: int = 50) -> List[ConfigVersion]:
+        """List version pointers for a device, newest first"""
+        return self.db.query(ConfigVersion).filter(
+            ConfigVersion.device_id == device_id
+        ).order_by(desc(ConfigVersion.version)).limit(limit).all()
+
+    def get_config_text(self, content_hash: str) -> Optional[str]:
+        """Load and decompress a configuration by its hash"""
+        blob = self.db.get(ConfigBlob, content_hash)
+        if blob is None:
+            return None
+        return decompress_config(blob.compression, blob.data)
+
+    def get_latest_config(self, device_id: str) -> Optional[str]:
+        """Load the newest stored configuration text for a device"""
+        latest = self.get_latest_version(device_id)
+        return self.get_config_text(latest.content_hash) if latest else None
+
+    def has_changed(self, device_id: str, config_text: str) -> bool:
+        """Compare a configuration with the latest stored one by hash only"""
+        latest = self.get_latest_version(device_id)
+        return latest is None or latest.content_hash != compute_config_hash(config_text)
+
+    def get_change_set(
+        self,
+        old_hash: str,
+        new_hash: str,
+        old_text: Optional[str] = None,
+        new_text: Optional[str] = None
+    ) -> Optional[ConfigChangeSet]:
+        """Get the diff between two stored configurations
+
+        Checked in the in-process cache, then the config_diffs table, and only
+        computed (and stored) when neither has it.
+        """
+        change_set = change_set_cache.get(old_hash, new_hash)
+        if change_set is not None:
+            return change_set
+
+        stored = self.db.get(ConfigDiff, (old_hash, new_hash))
+        if stored is not None:
+            change_set = ConfigChangeSet(
+                old_hash, new_hash, [SectionChange.from_compact(c) for c in stored.changes]
+            )
+            change_set_cache.put(change_set)
+            return change_set
+
+        old_text = old_text if old_text is not None else self.get_config_text(old_hash)
+        new_text = new_text if new_text is not None else self.get_config_text(new_hash)
+        if old_text is None or new_text is None:
+            return None
+
+        change_set = diff_configs(old_text, new_text)
+        summary = change_set.summary()
+        try:
+            with self.db.begin_nested():
+                self.db.add(ConfigDiff(
+                    old_hash=old_hash,
+                    new_hash=new_hash,
+                    changes=[c.to_compact() for c in change_set.changes],
+                    sections_changed=len(change_set.changes),
+                    lines_added=summary['lines_added'],
+                    lines_removed=summary['lines_removed']
+                ))
+        except IntegrityError:
+            logger.debug(f"Config diff {old_hash[:12]}..{new_hash[:12]} already stored")
+
+        change_set_cache.put(change_set)
+        return change_set
+
+    def diff_versions(
+        self,
+        device_id: str,
+        from_version: Optional[int] = None,
+        to_version: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Diff two versions of a device config, defaulting to previous vs latest"""
+        if to_version is None:
+            target = self.get_latest_version(device_id)
+        else:
+            target = self.get_version(device_id, to_version)
+        if target is None:
+            return None
+
+        source = self.get_version(device_id, from_version if from_version is not None else target.version - 1)
+        if source is None:
+            return None
+
+        change_set = self.get_change_set(source.content_hash, target.content_hash)
+        if change_set is None:
+            return None
+
+        return {
+            'device_id': device_id,
+            'from_version': source.version,
+            'to_version': target.version,
+            **change_set.to_dict()
+        }
@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from backend.database.database import get_db
 from backend.devices.service import DeviceService
+from backend.devices.ssh_pool import ssh_pool
+from backend.devices.bulk_jobs import bulk_job_manager, BULK_OPERATIONS
+from backend.devices.config_store import ConfigStore
 from backend.operations.service import OperationService
 from backend.database.models import NetworkDevice
 from pydantic import BaseModel
@@ -24,6 +28,12 @@ class DeviceUpdate(BaseModel):
     model: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
 
+class SweepRequest(BaseModel):
+    device_ids: Optional[List[str]] = None
+    save_result: bool = True
+    max_concurrency: Optional[int] = None
+    timeout: Optional[float] = None
+
 class DeviceResponse(BaseModel):
     id: str
     name: str
@@ -159,13 +169,19 @@ async def get_device_config(device_id: str, db: Session = Depends(get_db)):
         if not device:
             raise HTTPException(status_code=404, detail="Device not found")
         
-        if not device.config_backup:
+        config_store = ConfigStore(db)
+        latest = config_store.get_latest_version(device_id)
+        config_text = config_store.get_config_text(latest.content_hash) if latest else device.config_backup
+        
+        if not config_text:
             raise HTTPException(status_code=404, detail="No configuration backup found")
         
         return {
             "device_id": device_id,
             "device_name": device.name,
-            "config": device.config_backup,
+            "config": config_text,
+            "version": latest.version if latest else None,
+            "content_hash": latest.content_hash if latest else None,
             "backup_time": device.updated_at.isoformat() if device.updated_at else None
         }
     except HTTPException:
@@ -174,6 +190,62 @@ async def get_device_config(device_id: str, db: Session = Depends(get_db)):
         logger.error(f"Error getting config for device {device_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/{device_id}/config/versions")
+async def get_device_config_versions(
+    device_id: str,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """List stored configuration versions for a device"""
+    try:
+        versions = ConfigStore(db).list_versions(device_id, limit)
+        return [version.to_dict() for version in versions]
+    except Exception as e:
+        logger.error(f"Error listing config versions for device {device_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{device_id}/config/versions/{version}")
+async def get_device_config_version(device_id: str, version: int, db: Session = Depends(get_db)):
+    """Get the configuration text of a stored version"""
+    try:
+        config_store = ConfigStore(db)
+        config_version = config_store.get_version(device_id, version)
+        
+        if not config_version:
+            raise HTTPException(status_code=404, detail="Configuration version not found")
+        
+        return {
+            **config_version.to_dict(),
+            "config": config_store.get_config_text(config_version.content_hash)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting config version {version} for device {device_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{device_id}/config/diff")
+async def get_device_config_diff(
+    device_id: str,
+    from_version: Optional[int] = None,
+    to_version: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Get section-level changes between two configuration versions"""
+    try:
+        diff = ConfigStore(db).diff_versions(device_id, from_version, to_version)
+        if diff is None:
+            raise HTTPException(status_code=404, detail="Configuration versions not found")
+        
+        # Persist a newly computed diff
+        db.commit()
+        return diff
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error diffing config for device {device_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/{device_id}/operations")
 async def get_device_operations(
     device_id: str,
@@ -230,50 +302,81 @@ async def get_device_statistics(db: Session = Depends(get_db)):
         logger.error(f"Error getting device statistics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/sweep")
+async def sweep_devices(sweep_request: SweepRequest, db: Session = Depends(get_db)):
+    """Test connectivity of many devices concurrently"""
+    try:
+        device_service = DeviceService(db)
+        return await device_service.sweep_connectivity_async(
+            device_ids=sweep_request.device_ids,
+            save_result=sweep_request.save_result,
+            max_concurrency=sweep_request.max_concurrency,
+            timeout=sweep_request.timeout
+        )
+    except Exception as e:
+        logger.error(f"Error running connectivity sweep: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/ssh-pool/stats")
+async def get_ssh_pool_stats():
+    """Get SSH session pool usage statistics"""
+    return ssh_pool.get_stats()
+
 @router.post("/bulk-operations/{operation}")
 async def execute_bulk_operation(
     operation: str,
     device_ids: List[str],
-    db: Session = Depends(get_db)
+    mode: str = Query("sync", regex="^(sync|job|stream)$"),
+    parallelism: Optional[int] = Query(None, ge=1)
 ):
-    """Execute bulk operations on multiple devices"""
+    """Execute bulk operations on multiple devices in parallel
+    
+    mode=sync waits for all devices, mode=job returns a job id immediately and
+    mode=stream returns per-device results as NDJSON as they finish.
+    """
+    if operation not in BULK_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"Unknown operation: {operation}")
+    
     try:
-        device_service = DeviceService(db)
-        results = []
+        job = bulk_job_manager.submit(operation, device_ids, parallelism)
+        
+        if mode == "job":
+            return {
+                **job.to_dict(),
+                'status_url': f"/api/v1/devices/bulk-jobs/{job.id}",
+                'stream_url': f"/api/v1/devices/bulk-jobs/{job.id}/stream"
+            }
         
-        for device_id in device_ids:
-            try:
-                if operation == "test-connectivity":
-                    result = device_service.test_connectivity(device_id, save_result=True)
-                elif operation == "backup-config":
-                    result = device_service.backup_configuration(device_id)
-                else:
-                    raise HTTPException(status_code=400, detail=f"Unknown operation: {operation}")
-                
-                results.append({
-                    'device_id': device_id,
-                    'success': True,
-                    'result': result
-                })
-            except Exception as e:
-                results.append({
-                    'device_id': device_id,
-                    'success': False,
-                    'error': str(e)
-                })
+        if mode == "stream":
+            return StreamingResponse(job.iter_ndjson(), media_type="application/x-ndjson")
         
-        successful = sum(1 for r in results if r['success'])
+        await job.wait()
         return {
             'operation': operation,
+            'job_id': job.id,
             'total_devices': len(device_ids),
-            'successful': successful,
-            'failed': len(device_ids) - successful,
-            'results': results
+            'successful': job.successful,
+            'failed': len(device_ids) - job.successful,
+            'results': job.results
         }
-    except HTTPException:
-        raise
     except Exception as e:
         logger.error(f"Error executing bulk operation {operation}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/bulk-jobs/{job_id}")
+async def get_bulk_job(job_id: str, include_results: bool = True):
+    """Get bulk job progress and the results collected so far"""
+    job = bulk_job_manager.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Bulk job not found")
+    return job.to_dict(include_results=include_results)
+
+@router.get("/bulk-jobs/{job_id}/stream")
+async def stream_bulk_job(job_id: str):
+    """Stream bulk job results as NDJSON, replaying results already finished"""
+    job = bulk_job_manager.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Bulk job not found")
+    return StreamingResponse(job.iter_ndjson(), media_type="application/x-ndjson")
+
 # All device routes are complete above
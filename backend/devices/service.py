@@ -1,7 +1,12 @@
 from backend.database.models import NetworkDevice, OperationLog
 from backend.ai.ai_service import ai_service
-from sqlalchemy.orm import Session
-import paramiko
+from backend.ai.system_context import system_context_cache
+from backend.devices.ssh_pool import ssh_pool
+from backend.devices.sweep import connectivity_sweeper, SweepTarget
+from backend.devices.config_store import ConfigStore
+from backend.utils.config import config
+from sqlalchemy.orm import Session, load_only, undefer
+from typing import Any, Dict, List, Optional
 import socket
 import json
 from datetime import datetime, timezone
@@ -15,8 +20,27 @@ class DeviceService:
         self.db = db
 
     def get_all_devices(self):
-        """Get all devices"""
-        return self.db.query(NetworkDevice).order_by(NetworkDevice.name).all()
+        """Get all devices without their configuration backups"""
+        # Metadata is part of the device listing, so load it in the same query
+        return self.db.query(NetworkDevice).options(
+            undefer(NetworkDevice.device_metadata)
+        ).order_by(NetworkDevice.name).all()
+
+    def get_device_summaries(self, owner_id: Optional[str] = None):
+        """Get lightweight device rows for status listings"""
+        query = self.db.query(NetworkDevice).options(
+            load_only(
+                NetworkDevice.name,
+                NetworkDevice.ip_address,
+                NetworkDevice.model,
+                NetworkDevice.status,
+                NetworkDevice.uptime_seconds,
+                NetworkDevice.last_seen
+            )
+        )
+        if owner_id:
+            query = query.filter(NetworkDevice.owner_id == owner_id)
+        return query.order_by(NetworkDevice.name).all()
 
     def get_device_by_id(self, device_id: str):
         """Get device by ID"""
@@ -53,6 +77,10 @@ class DeviceService:
             if not device:
                 raise ValueError("Device not found")
             
+            if device_data.get('ip_address', device.ip_address) != device.ip_address:
+                # Pooled sessions point at the old address
+                ssh_pool.close_device(device_id)
+            
             device.name = device_data.get('name', device.name)
             device.ip_address = device_data.get('ip_address', device.ip_address)
             device.model = device_data.get('model', device.model)
@@ -76,6 +104,7 @@ class DeviceService:
             
             self.db.delete(device)
             self.db.commit()
+            ssh_pool.close_device(device_id)
         except Exception as e:
             logger.error(f"Error deleting device: {e}")
             self.db.rollback()
@@ -150,6 +179,113 @@ class DeviceService:
         logger.info(f"Connectivity test result for {device_id}: {result['status']}")
         return result
 
+    def sweep_connectivity(
+        self,
+        device_ids: Optional[List[str]] = None,
+        owner_id: Optional[str] = None,
+        save_result: bool = False,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Test connectivity of many devices concurrently (blocking)"""
+        start_time = datetime.now(timezone.utc)
+        targets = self._get_sweep_targets(device_ids, owner_id)
+        results = connectivity_sweeper.run(targets, max_concurrency, timeout)
+        return self._record_sweep_results(device_ids, results, save_result, start_time)
+
+    async def sweep_connectivity_async(
+        self,
+        device_ids: Optional[List[str]] = None,
+        owner_id: Optional[str] = None,
+        save_result: bool = False,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Test connectivity of many devices concurrently without blocking the event loop"""
+        start_time = datetime.now(timezone.utc)
+        targets = self._get_sweep_targets(device_ids, owner_id)
+        results = await connectivity_sweeper.sweep(targets, max_concurrency, timeout)
+        return self._record_sweep_results(device_ids, results, save_result, start_time)
+
+    def _get_sweep_targets(self, device_ids: Optional[List[str]], owner_id: Optional[str]) -> List[SweepTarget]:
+        """Load only the columns needed to probe devices"""
+        query = self.db.query(NetworkDevice.id, NetworkDevice.name, NetworkDevice.ip_address)
+        if device_ids:
+            query = query.filter(NetworkDevice.id.in_(device_ids))
+        if owner_id:
+            query = query.filter(NetworkDevice.owner_id == owner_id)
+        
+        return [
+            SweepTarget(
+                device_id=row.id,
+                device_name=row.name,
+                ip_address=row.ip_address,
+                port=config.DEFAULT_SSH_PORT
+            )
+            for row in query.order_by(NetworkDevice.name).all()
+        ]
+
+    def _record_sweep_results(
+        self,
+        device_ids: Optional[List[str]],
+        results: List[Dict[str, Any]],
+        save_result: bool,
+        start_time: datetime
+    ) -> Dict[str, Any]:
+        """Write all sweep statuses back in one bulk update and summarize"""
+        now = datetime.now(timezone.utc)
+        
+        try:
+            self.db.bulk_update_mappings(NetworkDevice, [
+                {'id': r['device_id'], 'status': r['status'], 'last_seen': now}
+                for r in results
+            ])
+            
+            if save_result:
+                self.db.bulk_insert_mappings(OperationLog, [
+                    {
+                        'device_id': r['device_id'],
+                        'operation_type': 'connectivity_test',
+                        'status': 'success' if r['status'] == 'online' else 'failed',
+                        'result': json.dumps(r),
+                        'execution_time_ms': int(r['response_time_ms']),
+                        'created_at': now
+                    }
+                    for r in results
+                ])
+            
+            self.db.commit()
+            # Bulk mappings skip the ORM flush hooks that keep chat context fresh
+            system_context_cache.invalidate_devices(r['device_id'] for r in results)
+        except Exception as e:
+            logger.error(f"Error saving sweep results: {e}")
+            self.db.rollback()
+            raise
+        
+        # Report requested devices that do not exist
+        found = {r['device_id'] for r in results}
+        for device_id in device_ids or []:
+            if device_id not in found:
+                results.append({
+                    'device_id': device_id,
+                    'device_name': None,
+                    'ip_address': None,
+                    'status': 'error',
+                    'response_time_ms': 0,
+                    'error': 'Device not found'
+                })
+        
+        online = sum(1 for r in results if r['status'] == 'online')
+        duration_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+        logger.info(f"Connectivity sweep: {online}/{len(results)} devices online")
+        return {
+            'total_devices': len(results),
+            'online': online,
+            'offline': sum(1 for r in results if r['status'] == 'offline'),
+            'duration_ms': round(duration_ms, 2),
+            'results': results
+        }
+
     def backup_configuration(self, device_id: str):
         """Backup device configuration via SSH"""
         device = self.get_device_by_id(device_id)
@@ -166,34 +302,20 @@ class DeviceService:
         }
         
         try:
-            # SSH connection to device
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            # Note: In production, use proper credential management
-            ssh.connect(
-                device.ip_address,
-                username='admin',  # Configure properly
-                password='admin',  # Use secure credential storage
-                timeout=30
-            )
-            
-            # Execute show running-config command
-            stdin, stdout, stderr = ssh.exec_command('show running-config')
-            config_output = stdout.read().decode('utf-8')
-            error_output = stderr.read().decode('utf-8')
+            # Reuse a pooled SSH session to the device
+            config_output = self._run_commands(device, ['show running-config'])[0]
             
-            if error_output:
-                raise Exception(f"Command error: {error_output}")
-            
-            # Save configuration backup
+            # Save configuration backup; the store only adds a version when content changed
+            stored = ConfigStore(self.db).save_config(device.id, config_output)
             device.config_backup = config_output
             device.updated_at = datetime.now(timezone.utc)
             
             result['status'] = 'success'
             result['config_size'] = len(config_output)
-            
-            ssh.close()
+            result['config_version'] = stored['version']
+            result['content_hash'] = stored['content_hash']
+            result['config_changed'] = stored['changed']
+            result['change_summary'] = stored.get('change_summary')
             
         except Exception as e:
             result['error'] = str(e)
@@ -222,4 +344,77 @@ class DeviceService:
         self.db.commit()
         return result
 
+    def get_device_config(self, device_id: str) -> Optional[str]:
+        """Get the latest stored configuration, falling back to the legacy backup column"""
+        config_text = ConfigStore(self.db).get_latest_config(device_id)
+        if config_text is not None:
+            return config_text
+        
+        device = self.get_device_by_id(device_id)
+        return device.config_backup if device else None
+
+    def execute_commands(self, device_id: str, commands: List[str]):
+        """Run several commands over one pooled SSH session"""
+        device = self.get_device_by_id(device_id)
+        if not device:
+            raise ValueError("Device not found")
+        
+        start_time = datetime.now(timezone.utc)
+        result = {
+            'device_id': device_id,
+            'device_name': device.name,
+            'status': 'failed',
+            'outputs': {},
+            'error': None
+        }
+        
+        try:
+            outputs = self._run_commands(device, commands)
+            result['outputs'] = dict(zip(commands, outputs))
+            result['status'] = 'success'
+        except Exception as e:
+            result['error'] = str(e)
+            logger.error(f"Command execution error on {device.name}: {e}")
+        
+        try:
+            execution_time = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+            operation = OperationLog(
+                device_id=device_id,
+                operation_type='command_execution',
+                status=result['status'],
+                command='\n'.join(commands),
+                result=json.dumps(result),
+                error_message=result.get('error'),
+                execution_time_ms=int(execution_time)
+            )
+            self.db.add(operation)
+            self.db.commit()
+        except Exception as e:
+            logger.error(f"Error saving operation log: {e}")
+            self.db.rollback()
+            raise
+        
+        return result
+
+    def _run_commands(self, device: NetworkDevice, commands: List[str]) -> List[str]:
+        """Execute commands on a device through the shared SSH session pool"""
+        # Note: In production, use proper credential management
+        with ssh_pool.session(
+            device.id,
+            device.ip_address,
+            username=config.DEVICE_USERNAME,
+            password=config.DEVICE_PASSWORD,
+            port=config.DEFAULT_SSH_PORT
+        ) as ssh:
+            outputs = []
+            for command in commands:
+                stdin, stdout, stderr = ssh.exec_command(command)
+                output = stdout.read().decode('utf-8')
+                error_output = stderr.read().decode('utf-8')
+                
+                if error_output:
+                    raise Exception(f"Command error: {error_output}")
+                outputs.append(output)
+            return outputs
+
 # Legacy functions removed to prevent conflicts with main DeviceService class
@@ -0,0 +1,263 @@
+"""
+SSH Session Pool for Network Devices
+Keeps authenticated SSH sessions open per device so that backups and
+multi-command jobs reuse one channel instead of paying a handshake per call
+"""
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+try:
+    import paramiko
+except ImportError:
+    paramiko = None
+
+from backend.utils.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class SSHPoolExhausted(Exception):
+    """Raised when no session could be checked out before the wait timeout"""
+    pass
+
+
+class PooledSession:
+    """An SSH client tracked by the pool"""
+
+    def __init__(self, key: str, client):
+        self.key = key
+        self.client = client
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.in_use = False
+
+    def is_healthy(self) -> bool:
+        """Check the underlying transport is still usable"""
+        try:
+            transport = self.client.get_transport()
+            if transport is None or not transport.is_active():
+                return False
+            # Cheap round trip that fails fast on half-open connections
+            transport.send_ignore()
+            return True
+        except Exception:
+            return False
+
+    def close(self):
+        try:
+            self.client.close()
+        except Exception as e:
+            logger.debug(f"Error closing SSH session for {self.key}: {e}")
+
+
+def _paramiko_connect(host: str, username: str, password: str, port: int = 22, timeout: int = 30):
+    """Open an authenticated paramiko client"""
+    if paramiko is None:
+        raise ImportError("paramiko library is not installed. Please install it with 'pip install paramiko'.")
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.connect(host, port=port, username=username, password=password, timeout=timeout)
+    return client
+
+
+class SSHSessionPool:
+    """Thread-safe pool of SSH sessions keyed by device"""
+
+    def __init__(
+        self,
+        max_per_device: int = 2,
+        max_total: int = 100,
+        idle_timeout: float = 300,
+        checkout_timeout: float = 60,
+        connect_factory: Optional[Callable] = None
+    ):
+        self.max_per_device = max_per_device
+        self.max_total = max_total
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self._connect = connect_factory or _paramiko_connect
+        self._sessions: Dict[str, List[PooledSession]] = {}
+        self._total = 0
+        self._pending: Dict[str, int] = {}
+        self._cond = threading.Condition()
+        self.stats = {'created': 0, 'reused': 0, 'discarded': 0, 'evicted': 0}
+
+    def _device_count(self, key: str) -> int:
+        return len(self._sessions.get(key, [])) + self._pending.get(key, 0)
+
+    def _remove(self, session: PooledSession):
+        sessions = self._sessions.get(session.key, [])
+        if session in sessions:
+            sessions.remove(session)
+            self._total -= 1
+            if not sessions:
+                self._sessions.pop(session.key, None)
+
+    def _collect_idle(self, now: float) -> List[PooledSession]:
+        """Detach idle sessions past their timeout; caller closes them outside the lock"""
+        expired = []
+        for sessions in list(self._sessions.values()):
+            for session in list(sessions):
+                if not session.in_use and now - session.last_used > self.idle_timeout:
+                    expired.append(session)
+        for session in expired:
+            self._remove(session)
+        self.stats['evicted'] += len(expired)
+        return expired
+
+    def _evict_one_idle(self) -> Optional[PooledSession]:
+        """Detach the least recently used idle session from any device"""
+        idle = [s for sessions in self._sessions.values() for s in sessions if not s.in_use]
+        if not idle:
+            return None
+        victim = min(idle, key=lambda s: s.last_used)
+        self._remove(victim)
+        self.stats['evicted'] += 1
+        return victim
+
+    def checkout(self, key: str, host: str, username: str, password: str, port: int = 22) -> PooledSession:
+        """Borrow a healthy session for a device, connecting if needed"""
+        deadline = time.monotonic() + self.checkout_timeout
+        connect_new = False
+        while not connect_new:
+            to_close = []
+            candidate = None
+            with self._cond:
+                to_close.extend(self._collect_idle(time.monotonic()))
+                for session in self._sessions.get(key, []):
+                    if not session.in_use:
+                        session.in_use = True
+                        candidate = session
+                        break
+
+                if candidate is None:
+                    if self._device_count(key) < self.max_per_device:
+                        if self._total + sum(self._pending.values()) >= self.max_total:
+                            victim = self._evict_one_idle()
+                            if victim is not None:
+                                to_close.append(victim)
+                        if self._total + sum(self._pending.values()) < self.max_total:
+                            self._pending[key] = self._pending.get(key, 0) + 1
+                            connect_new = True
+
+                if candidate is None and not connect_new:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        for session in to_close:
+                            session.close()
+                        raise SSHPoolExhausted(f"Timed out waiting for an SSH session to {host}")
+                    self._cond.wait(timeout=remaining)
+
+            for session in to_close:
+                session.close()
+
+            if candidate is not None:
+                # Health check outside the lock since it touches the network
+                if candidate.is_healthy():
+                    with self._cond:
+                        candidate.last_used = time.monotonic()
+                        self.stats['reused'] += 1
+                    return candidate
+                logger.info(f"Discarding stale SSH session for {key}")
+                self._discard(candidate)
+
+        try:
+            client = self._connect(host, username, password, port=port, timeout=config.CONNECTION_TIMEOUT)
+        except Exception:
+            with self._cond:
+                self._release_pending(key)
+                self._cond.notify_all()
+            raise
+
+        session = PooledSession(key, client)
+        session.in_use = True
+        with self._cond:
+            self._release_pending(key)
+            self._sessions.setdefault(key, []).append(session)
+            self._total += 1
+            self.stats['created'] += 1
+        return session
+
+    def _release_pending(self, key: str):
+        self._pending[key] -= 1
+        if not self._pending[key]:
+            del self._pending[key]
+
+    def checkin(self, session: PooledSession, healthy: bool = True):
+        """Return a session to the pool, dropping it if it is no longer usable"""
+        if not healthy:
+            self._discard(session)
+            return
+        with self._cond:
+            session.in_use = False
+            session.last_used = time.monotonic()
+            self._cond.notify_all()
+
+    def _discard(self, session: PooledSession):
+        with self._cond:
+            self._remove(session)
+            self.stats['discarded'] += 1
+            self._cond.notify_all()
+        session.close()
+
+    @contextmanager
+    def session(self, key: str, host: str, username: str, password: str, port: int = 22):
+        """Context manager yielding a connected SSH client for a device"""
+        pooled = self.checkout(key, host, username, password, port=port)
+        healthy = True
+        try:
+            yield pooled.client
+        except Exception:
+            # The channel state is unknown after a failure, don't hand it out again
+            healthy = False
+            raise
+        finally:
+            self.checkin(pooled, healthy=healthy)
+
+    def close_device(self, key: str):
+        """Close all idle sessions for a device, e.g. after credentials change"""
+        with self._cond:
+            idle = [s for s in self._sessions.get(key, []) if not s.in_use]
+            for session in idle:
+                self._remove(session)
+        for session in idle:
+            session.close()
+
+    def close_idle(self):
+        """Close sessions that have been idle longer than the idle timeout"""
+        with self._cond:
+            expired = self._collect_idle(time.monotonic())
+        for session in expired:
+            session.close()
+        return len(expired)
+
+    def close_all(self):
+        """Close every pooled session"""
+        with self._cond:
+            sessions = [s for group in self._sessions.values() for s in group]
+            self._sessions.clear()
+            self._total = 0
+            self._cond.notify_all()
+        for session in sessions:
+            session.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get pool usage counters"""
+        with self._cond:
+            return {
+                **self.stats,
+                'open_sessions': self._total,
+                'in_use': sum(1 for group in self._sessions.values() for s in group if s.in_use),
+                'devices': len(self._sessions)
+            }
+
+
+# Global SSH session pool shared by all DeviceService instances
+ssh_pool = SSHSessionPool(
+    max_per_device=config.SSH_POOL_MAX_PER_DEVICE,
+    max_total=config.SSH_POOL_MAX_TOTAL,
+    idle_timeout=config.SSH_POOL_IDLE_TIMEOUT
+)
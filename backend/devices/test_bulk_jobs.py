@@ -0,0 +1,165 @@
+"""
+Simple tests to verify bulk device jobs, their parallelism cap and result streaming
+"""
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from backend.devices import bulk_jobs, routes
+from backend.devices.bulk_jobs import BulkJobManager
+
+
+class FakeSession:
+    def close(self):
+        pass
+
+
+class FakeDeviceService:
+    """Records how many devices run at once and fails devices named 'bad-*'"""
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, db):
+        self.db = db
+
+    def _run(self, device_id):
+        with FakeDeviceService.lock:
+            FakeDeviceService.active += 1
+            FakeDeviceService.peak = max(FakeDeviceService.peak, FakeDeviceService.active)
+        time.sleep(0.02)
+        with FakeDeviceService.lock:
+            FakeDeviceService.active -= 1
+        if device_id.startswith('bad-'):
+            raise ConnectionError(f'{device_id} unreachable')
+        return {'device_id': device_id, 'status': 'online'}
+
+    def test_connectivity(self, device_id, save_result=True):
+        return self._run(device_id)
+
+    def backup_configuration(self, device_id):
+        return self._run(device_id)
+
+
+class RecordingConnectionManager:
+    def __init__(self):
+        self.updates = []
+
+    async def send_operation_update(self, **update):
+        self.updates.append(update)
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    FakeDeviceService.active = FakeDeviceService.peak = 0
+    websocket = RecordingConnectionManager()
+    manager = BulkJobManager(max_workers=8, default_parallelism=4, session_factory=FakeSession)
+    monkeypatch.setattr(bulk_jobs, 'DeviceService', FakeDeviceService)
+    monkeypatch.setattr(bulk_jobs, 'connection_manager', websocket)
+    monkeypatch.setattr(routes, 'bulk_job_manager', manager)
+    manager.websocket = websocket
+    return manager
+
+
+def run_bulk(operation, device_ids, **params):
+    return asyncio.run(routes.execute_bulk_operation(operation, device_ids, **params))
+
+
+def test_sync_mode_waits_for_every_device(manager):
+    """Test that sync mode returns all results once every device has finished"""
+    result = run_bulk('test-connectivity', ['r1', 'r2', 'r3'], mode='sync', parallelism=None)
+
+    assert result['total_devices'] == 3
+    assert result['successful'] == 3 and result['failed'] == 0
+    assert sorted(r['device_id'] for r in result['results']) == ['r1', 'r2', 'r3']
+
+
+def test_failed_device_does_not_stop_the_job(manager):
+    """Test that a device error is recorded without affecting other devices"""
+    result = run_bulk('backup-config', ['r1', 'bad-r2', 'r3'], mode='sync', parallelism=None)
+
+    by_id = {r['device_id']: r for r in result['results']}
+    assert result['successful'] == 2 and result['failed'] == 1
+    assert by_id['bad-r2'] == {'device_id': 'bad-r2', 'success': False, 'error': 'bad-r2 unreachable'}
+    assert by_id['r3']['success'] is True
+
+
+def test_parallelism_caps_concurrent_devices(manager):
+    """Test that no more than the requested number of devices run at once"""
+    run_bulk('test-connectivity', [f'r{i}' for i in range(12)], mode='sync', parallelism=3)
+    assert FakeDeviceService.peak == 3
+
+    # Requests above the pool size are clamped to it
+    async def submit():
+        job = manager.submit('test-connectivity', ['r1'], 50)
+        await job.wait()
+        return job.parallelism
+    assert asyncio.run(submit()) == manager.max_workers
+
+
+def test_job_mode_returns_immediately_and_reports_progress(manager):
+    """Test that job mode returns a job id whose status can be polled"""
+    async def run():
+        response = await routes.execute_bulk_operation('test-connectivity', ['r1', 'r2'], mode='job', parallelism=None)
+        assert response['status'] in ('pending', 'running')
+        assert response['stream_url'] == f"/api/v1/devices/bulk-jobs/{response['job_id']}/stream"
+
+        await manager.get_job(response['job_id']).wait()
+        return await routes.get_bulk_job(response['job_id'])
+
+    status = asyncio.run(run())
+    assert status['status'] == 'completed'
+    assert status['completed'] == 2 and len(status['results']) == 2
+
+
+def test_stream_mode_yields_ndjson_results_then_summary(manager):
+    """Test that stream mode emits one JSON line per device and a final summary"""
+    async def run():
+        response = await routes.execute_bulk_operation('test-connectivity', ['r1', 'bad-r2'], mode='stream', parallelism=None)
+        assert response.media_type == 'application/x-ndjson'
+        return [chunk async for chunk in response.body_iterator]
+
+    chunks = asyncio.run(run())
+    assert all(chunk.endswith('\n') for chunk in chunks)
+    lines = [json.loads(chunk) for chunk in chunks]
+    assert [line['event'] for line in lines] == ['result', 'result', 'completed']
+    assert {line['device_id'] for line in lines[:2]} == {'r1', 'bad-r2'}
+    assert lines[2]['successful'] == 1 and lines[2]['failed'] == 1
+
+
+def test_job_stream_replays_finished_results(manager):
+    """Test that streaming a finished job replays every result"""
+    async def run():
+        job = manager.submit('test-connectivity', ['r1', 'r2'])
+        await job.wait()
+        response = await routes.stream_bulk_job(job.id)
+        return [json.loads(chunk) async for chunk in response.body_iterator]
+
+    lines = asyncio.run(run())
+    assert [line['event'] for line in lines] == ['result', 'result', 'completed']
+
+
+def test_websocket_receives_progress_and_final_update(manager):
+    """Test that each finished device and the job end are pushed as bulk_operation updates"""
+    run_bulk('test-connectivity', ['r1', 'r2'], mode='sync', parallelism=None)
+
+    updates = manager.websocket.updates
+    assert all(update['operation_type'] == 'bulk_operation' for update in updates)
+    assert [update['status'] for update in updates] == ['running', 'running', 'completed']
+    assert [update['progress'] for update in updates] == [50, 100, 100]
+    assert updates[-1]['data']['successful'] == 2
+
+
+def test_unknown_operation_is_rejected(manager):
+    """Test that an unsupported operation returns 400 without starting a job"""
+    with pytest.raises(HTTPException) as error:
+        run_bulk('reboot', ['r1'], mode='sync', parallelism=None)
+
+    assert error.value.status_code == 400
+    assert manager.list_jobs() == []
+    with pytest.raises(ValueError):
+        manager.submit('reboot', ['r1'])
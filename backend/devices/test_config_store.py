@@ -0,0 +1,144 @@
+"""
+Simple tests to verify ConfigStore deduplication and version diffs
+"""
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.database.models import Base, ConfigBlob, ConfigVersion, NetworkDevice
+from backend.devices.config_store import ConfigStore, compute_config_hash
+from backend.network.config_diff import change_set_cache
+
+
+def make_store():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    devices = [
+        NetworkDevice(name='R15', ip_address='10.0.0.15', model='ISR4331'),
+        NetworkDevice(name='R16', ip_address='10.0.0.16', model='ISR4331'),
+    ]
+    db.add_all(devices)
+    db.commit()
+    return db, ConfigStore(db), devices
+
+
+def test_unchanged_config_does_not_create_version():
+    """Test that identical backups share one blob and one version"""
+    db, store, (r15, r16) = make_store()
+
+    first = store.save_config(r15.id, 'hostname lab\n')
+    second = store.save_config(r15.id, 'hostname lab\n')
+    store.save_config(r16.id, 'hostname lab\n')
+
+    assert first['changed'] and not second['changed']
+    assert db.query(ConfigBlob).count() == 1
+    assert db.query(ConfigVersion).count() == 2
+    assert store.get_latest_config(r15.id) == 'hostname lab\n'
+
+
+def test_diff_versions_defaults_to_previous_and_latest():
+    """Test that a new version is diffed against the one before it"""
+    db, store, (r15, _) = make_store()
+
+    store.save_config(r15.id, 'interface Gi0/0\n shutdown\n')
+    saved = store.save_config(r15.id, 'interface Gi0/0\n no shutdown\n')
+    diff = store.diff_versions(r15.id)
+
+    assert saved['change_summary']['modified'] == 1
+    assert (diff['from_version'], diff['to_version']) == (1, 2)
+    assert diff['changes'][0]['added_lines'] == ['no shutdown']
+    assert diff['changes'][0]['removed_lines'] == ['shutdown']
+
+
+def test_versions_bump_only_on_content_change():
+    """Test that changed content bumps the version and returning to old content reuses its blob"""
+    db, store, (r15, _) = make_store()
+
+    versions = [store.save_config(r15.id, text)['version'] for text in ('hostname a\n', 'hostname b\n', 'hostname a\n')]
+    unchanged = store.save_config(r15.id, 'hostname a\n')
+
+    assert versions == [1, 2, 3]
+    assert unchanged['version'] == 3 and not unchanged['changed']
+    assert db.query(ConfigBlob).count() == 2
+    assert [v.version for v in store.list_versions(r15.id)] == [3, 2, 1]
+
+
+def test_unchanged_config_refreshes_last_seen():
+    """Test that an identical backup only moves last_seen_at"""
+    db, store, (r15, _) = make_store()
+
+    store.save_config(r15.id, 'hostname lab\n')
+    first_seen = store.get_latest_version(r15.id).last_seen_at
+    store.save_config(r15.id, 'hostname lab\n')
+    latest = store.get_latest_version(r15.id)
+
+    assert latest.version == 1
+    assert latest.last_seen_at >= first_seen
+    assert latest.created_at == first_seen
+
+
+def test_empty_stored_diff_is_reused(monkeypatch):
+    """Test that a volatile-only change is stored as an empty diff and read back without rediffing"""
+    db, store, (r15, _) = make_store()
+    old_hash = store.save_config(r15.id, 'hostname lab\nntp clock-period 1\n')['content_hash']
+    new_hash = store.save_config(r15.id, 'hostname lab\nntp clock-period 2\n')['content_hash']
+    assert store.get_change_set(old_hash, new_hash).changes == []
+
+    change_set_cache.clear()
+    monkeypatch.setattr(store, 'get_config_text', lambda config_hash: None)
+    change_set = store.get_change_set(old_hash, new_hash)
+    assert change_set is not None and change_set.changes == []
+
+
+def make_shared_stores(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'store.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    device = NetworkDevice(name='R15', ip_address='10.0.0.15', model='ISR4331')
+    db.add(device)
+    db.commit()
+    return session_factory, device.id
+
+
+def stale_latest(store, version):
+    """Make the store's first latest-version read return a version another worker has since superseded"""
+    reads = [version]
+    current = store.get_latest_version
+    store.get_latest_version = lambda device_id: reads.pop() if reads else current(device_id)
+
+
+def test_concurrent_backup_retries_next_version(tmp_path):
+    """Test that losing the race for a version number re-reads and takes the next one"""
+    session_factory, device_id = make_shared_stores(tmp_path)
+    db_a, db_b = session_factory(), session_factory()
+    store_a, store_b = ConfigStore(db_a), ConfigStore(db_b)
+    store_a.save_config(device_id, 'hostname v1\n')
+    db_a.commit()
+
+    stale_latest(store_a, store_a.get_latest_version(device_id))
+    store_b.save_config(device_id, 'hostname v2\n')
+    db_b.commit()
+
+    result = store_a.save_config(device_id, 'hostname v3\n')
+    db_a.commit()
+
+    assert result['version'] == 3
+    assert result['previous_hash'] == compute_config_hash('hostname v2\n')
+    assert [v.version for v in ConfigStore(session_factory()).list_versions(device_id)] == [3, 2, 1]
+
+
+def test_concurrent_identical_backup_is_unchanged(tmp_path):
+    """Test that a racing backup of the same content reports no change instead of failing"""
+    session_factory, device_id = make_shared_stores(tmp_path)
+    db_a, db_b = session_factory(), session_factory()
+    store_a, store_b = ConfigStore(db_a), ConfigStore(db_b)
+
+    stale_latest(store_a, None)
+    store_b.save_config(device_id, 'hostname v1\n')
+    db_b.commit()
+
+    result = store_a.save_config(device_id, 'hostname v1\n')
+    db_a.commit()
+
+    assert result['changed'] is False and result['version'] == 1
+    assert db_a.query(ConfigVersion).count() == 1
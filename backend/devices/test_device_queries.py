@@ -0,0 +1,47 @@
+"""
+Simple tests to verify device listings do not load configuration backups
+"""
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from backend.database.models import Base, NetworkDevice
+from backend.devices.service import DeviceService
+
+
+def make_session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add(NetworkDevice(
+        name='R15', ip_address='10.0.0.15', model='ISR4331',
+        config_backup='hostname R15\n' * 1000, device_metadata={'site': 'lab'}
+    ))
+    db.add(NetworkDevice(name='R16', ip_address='10.0.0.16', model='ISR4331'))
+    db.commit()
+    db.expunge_all()
+
+    statements = []
+    event.listen(engine, 'before_cursor_execute', lambda conn, cursor, statement, *args: statements.append(statement))
+    return db, statements
+
+
+def test_device_list_skips_config_backup():
+    """Test that listing devices selects neither the backup text nor extra queries"""
+    db, statements = make_session()
+
+    devices = [d.to_dict() for d in DeviceService(db).get_all_devices()]
+
+    assert len(statements) == 1
+    assert 'network_devices.config_backup AS' not in statements[0]
+    assert [d['has_config_backup'] for d in devices] == [True, False]
+    assert devices[0]['metadata'] == {'site': 'lab'}
+
+
+def test_device_summaries_load_only_status_columns():
+    """Test that summaries skip metadata and still allow lazy access to the backup"""
+    db, statements = make_session()
+
+    devices = DeviceService(db).get_device_summaries()
+
+    assert 'device_metadata' not in statements[0]
+    assert devices[0].config_backup.startswith('hostname R15')
+    assert len(statements) == 2
@@ -0,0 +1,141 @@
+"""
+Simple tests to verify SSHSessionPool reuse and limits
+"""
+import threading
+import pytest
+from backend.devices.ssh_pool import SSHSessionPool, SSHPoolExhausted
+
+
+class FakeTransport:
+    def __init__(self):
+        self.active = True
+
+    def is_active(self):
+        return self.active
+
+    def send_ignore(self):
+        if not self.active:
+            raise EOFError()
+
+
+class FakeClient:
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.closed = False
+
+    def get_transport(self):
+        return self.transport
+
+    def close(self):
+        self.closed = True
+        self.transport.active = False
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def connect(host, username, password, port=22, timeout=30):
+        client = FakeClient()
+        created.append(client)
+        return client
+
+    pool = SSHSessionPool(connect_factory=connect, **kwargs)
+    return pool, created
+
+
+def test_session_is_reused_for_same_device():
+    """Test that a checked-in session is handed out again"""
+    pool, created = make_pool()
+
+    with pool.session('dev-1', '10.0.0.1', 'admin', 'admin') as first:
+        pass
+    with pool.session('dev-1', '10.0.0.1', 'admin', 'admin') as second:
+        pass
+
+    assert first is second
+    assert len(created) == 1
+    assert pool.get_stats()['reused'] == 1
+
+
+def test_stale_session_is_replaced_on_checkout():
+    """Test that a dead transport fails the health check and is reconnected"""
+    pool, created = make_pool()
+
+    with pool.session('dev-1', '10.0.0.1', 'admin', 'admin') as client:
+        pass
+    client.transport.active = False
+
+    with pool.session('dev-1', '10.0.0.1', 'admin', 'admin') as replacement:
+        pass
+
+    assert replacement is not client
+    assert client.closed
+    assert len(created) == 2
+
+
+def test_failed_command_discards_session():
+    """Test that a session is not reused after an error inside the block"""
+    pool, created = make_pool()
+
+    with pytest.raises(RuntimeError):
+        with pool.session('dev-1', '10.0.0.1', 'admin', 'admin'):
+            raise RuntimeError("command failed")
+
+    assert created[0].closed
+    assert pool.get_stats()['open_sessions'] == 0
+
+
+def test_per_device_limit_blocks_until_timeout():
+    """Test that checkout waits when the device already has max sessions"""
+    pool, _ = make_pool(max_per_device=1, checkout_timeout=0.05)
+
+    held = pool.checkout('dev-1', '10.0.0.1', 'admin', 'admin')
+    with pytest.raises(SSHPoolExhausted):
+        pool.checkout('dev-1', '10.0.0.1', 'admin', 'admin')
+
+    pool.checkin(held)
+    assert pool.checkout('dev-1', '10.0.0.1', 'admin', 'admin') is held
+
+
+def test_global_limit_evicts_idle_session_of_other_device():
+    """Test that the global cap is enforced by evicting idle sessions"""
+    pool, created = make_pool(max_total=1)
+
+    with pool.session('dev-1', '10.0.0.1', 'admin', 'admin'):
+        pass
+    with pool.session('dev-2', '10.0.0.2', 'admin', 'admin'):
+        pass
+
+    assert created[0].closed
+    assert pool.get_stats()['open_sessions'] == 1
+
+
+def test_concurrent_checkouts_respect_per_device_limit():
+    """Test that parallel workers never exceed the per-device session cap"""
+    pool, created = make_pool(max_per_device=2)
+    barrier = threading.Barrier(4)
+
+    def worker():
+        barrier.wait()
+        for _ in range(5):
+            with pool.session('dev-1', '10.0.0.1', 'admin', 'admin'):
+                pass
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) <= 2
+
+
+def test_idle_sessions_are_closed():
+    """Test that close_idle drops sessions past the idle timeout"""
+    pool, created = make_pool(idle_timeout=0)
+
+    with pool.session('dev-1', '10.0.0.1', 'admin', 'admin'):
+        pass
+
+    assert pool.close_idle() == 1
+    assert created[0].closed
@@ -0,0 +1,72 @@
+"""
+Simple tests to verify ConnectivitySweeper probing and concurrency bounds
+"""
+import asyncio
+import socket
+from backend.devices.sweep import ConnectivitySweeper, SweepTarget
+
+
+def _listening_socket():
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('127.0.0.1', 0))
+    server.listen(16)
+    return server
+
+
+def _closed_port():
+    probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    return port
+
+
+def test_sweep_reports_online_and_offline_devices():
+    """Test that open ports are online and refused ports are offline"""
+    server = _listening_socket()
+    try:
+        targets = [
+            SweepTarget('dev-up', 'R15', '127.0.0.1', server.getsockname()[1]),
+            SweepTarget('dev-down', 'R16', '127.0.0.1', _closed_port()),
+        ]
+        results = ConnectivitySweeper(probe_timeout=1).run(targets)
+    finally:
+        server.close()
+
+    by_id = {r['device_id']: r for r in results}
+    assert by_id['dev-up']['status'] == 'online'
+    assert by_id['dev-up']['error'] is None
+    assert by_id['dev-down']['status'] == 'offline'
+    assert by_id['dev-down']['error']
+
+
+def test_sweep_respects_concurrency_limit():
+    """Test that no more than max_concurrency probes run at once"""
+    sweeper = ConnectivitySweeper(max_concurrency=3)
+    in_flight = 0
+    peak = 0
+
+    async def fake_probe(target, timeout=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {'device_id': target.device_id, 'status': 'online'}
+
+    sweeper.probe = fake_probe
+    targets = [SweepTarget(f'dev-{i}', f'R{i}', '127.0.0.1') for i in range(20)]
+    results = sweeper.run(targets)
+
+    assert len(results) == 20
+    assert peak == 3
+
+
+def test_run_works_inside_running_event_loop():
+    """Test that the blocking wrapper can be used from sync code called by a coroutine"""
+    sweeper = ConnectivitySweeper()
+
+    async def caller():
+        return sweeper.run([])
+
+    assert asyncio.run(caller()) == []
@@ -9,6 +9,12 @@ import logging
 from ..database.database import get_db
 from ..database.models import SystemConfig, User
 from ..utils.logger import log_api_request
+from ..ai.request_gate import llm_request_gate
+from ..ai.response_cache import llm_response_cache
+from ..ai.single_flight import llm_single_flight
+from ..ai.system_context import system_context_cache
+from ..ai.prompt_cache import prompt_cache_stats
+from ..ai.provider_router import llm_router
 
 logger = logging.getLogger(__name__)
 
@@ -482,12 +488,36 @@ async def update_core_settings(
             config.config_value = settings.dict()
         
         db.commit()
+        llm_request_gate.apply_core_settings(settings.dict())
+        llm_response_cache.apply_core_settings(settings.dict())
         return {"message": "Core settings updated successfully", "settings": settings.dict()}
     except Exception as e:
         logger.error(f"Error updating Core settings: {e}")
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+# LLM response cache endpoints
+@router.get("/genai/cache")
+async def get_response_cache_stats():
+    """Get LLM response cache hit/miss, request coalescing, chat context and provider prompt cache counters"""
+    return {
+        **llm_response_cache.get_stats(),
+        "single_flight": llm_single_flight.get_stats(),
+        "system_context": system_context_cache.get_stats(),
+        "prompt_cache": prompt_cache_stats.get_stats()
+    }
+
+@router.delete("/genai/cache")
+async def clear_response_cache():
+    """Drop every cached LLM response"""
+    llm_response_cache.clear()
+    return {"message": "LLM response cache cleared"}
+
+@router.get("/genai/providers/health")
+async def get_provider_health():
+    """Get per-provider latency/error EWMA and circuit breaker state"""
+    return llm_router.get_stats()
+
 # Test API connection endpoint
 @router.post("/genai/test-connection")
 async def test_api_connection(
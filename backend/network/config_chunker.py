@@ -0,0 +1,77 @@
+"""
+Configuration Chunker
+Splits a parsed configuration along section boundaries into chunks that fit
+an LLM token budget, so large configs are analyzed in full rather than truncated
+"""
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+from backend.network.config_parser import ParsedConfig
+
+# Rough characters-per-token ratio for IOS configuration text
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+@dataclass
+class ConfigChunk:
+    """Whole sections (or slices of one oversized section) sent in a single prompt"""
+    index: int
+    text: str
+    sections: List[str] = field(default_factory=list)
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+def _section_blocks(parsed: ParsedConfig, max_tokens: int) -> List[Tuple[str, str]]:
+    """(header, text) blocks, splitting sections over budget between child blocks"""
+    blocks = []
+    for root in parsed.roots:
+        text = root.to_text()
+        if estimate_tokens(text) <= max_tokens or not root.children:
+            blocks.append((root.text, text))
+            continue
+
+        # Repeat the header on every slice so each keeps its context
+        current = [root.text]
+        size = estimate_tokens(root.text)
+        for child in root.children:
+            child_text = child.to_text()
+            child_size = estimate_tokens(child_text)
+            if len(current) > 1 and size + child_size > max_tokens:
+                blocks.append((root.text, '\n'.join(current)))
+                current, size = [root.text], estimate_tokens(root.text)
+            current.append(child_text)
+            size += child_size
+        blocks.append((root.text, '\n'.join(current)))
+    return blocks
+
+
+def chunk_config(parsed: ParsedConfig, max_tokens: int) -> List[ConfigChunk]:
+    """Pack section blocks in config order into chunks of at most max_tokens
+
+    A single child block larger than the budget is kept whole in its own chunk.
+    """
+    chunks: List[ConfigChunk] = []
+    texts: List[str] = []
+    sections: List[str] = []
+    size = 0
+
+    for header, text in _section_blocks(parsed, max_tokens):
+        block_size = estimate_tokens(text)
+        if texts and size + block_size > max_tokens:
+            chunks.append(ConfigChunk(len(chunks), '\n'.join(texts), sections))
+            texts, sections, size = [], [], 0
+        texts.append(text)
+        if not sections or sections[-1] != header:
+            sections.append(header)
+        size += block_size
+
+    if texts:
+        chunks.append(ConfigChunk(len(chunks), '\n'.join(texts), sections))
+    return chunks
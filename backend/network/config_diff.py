@@ -0,0 +1,166 @@
+"""
+Cisco IOS Configuration Diff Engine
+Compares two running-configs section by section (interface, router, line
+blocks) and produces structured add/remove/modify change sets
+"""
+import difflib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.network.config_parser import compute_config_hash, parse_config
+
+CHANGE_ADDED = 'added'
+CHANGE_REMOVED = 'removed'
+CHANGE_MODIFIED = 'modified'
+
+
+@dataclass
+class SectionChange:
+    """Change to one top-level section (or standalone top-level line)"""
+    change_type: str
+    section: str
+    added_lines: List[str] = field(default_factory=list)
+    removed_lines: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'change_type': self.change_type,
+            'section': self.section,
+            'added_lines': self.added_lines,
+            'removed_lines': self.removed_lines
+        }
+
+    def to_compact(self) -> List[Any]:
+        """Positional form used for storage"""
+        return [self.change_type, self.section, self.added_lines, self.removed_lines]
+
+    @classmethod
+    def from_compact(cls, data: List[Any]) -> 'SectionChange':
+        return cls(data[0], data[1], list(data[2]), list(data[3]))
+
+
+@dataclass
+class ConfigChangeSet:
+    """All section changes between two configurations"""
+    old_hash: str
+    new_hash: str
+    changes: List[SectionChange] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.changes
+
+    def summary(self) -> Dict[str, int]:
+        counts = {CHANGE_ADDED: 0, CHANGE_REMOVED: 0, CHANGE_MODIFIED: 0}
+        for change in self.changes:
+            counts[change.change_type] += 1
+        counts['lines_added'] = sum(len(c.added_lines) for c in self.changes)
+        counts['lines_removed'] = sum(len(c.removed_lines) for c in self.changes)
+        return counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'old_hash': self.old_hash,
+            'new_hash': self.new_hash,
+            'summary': self.summary(),
+            'changes': [change.to_dict() for change in self.changes]
+        }
+
+
+def split_sections(config_text: str) -> "OrderedDict[str, List[str]]":
+    """Group a running-config into top-level sections
+
+    Child lines are keyed by their path below the section header, so nested
+    blocks such as BGP address families keep identical lines apart.
+    """
+    return parse_config(config_text).section_map()
+
+
+def diff_lines(old_lines: List[str], new_lines: List[str]) -> Tuple[List[str], List[str]]:
+    """Order-aware (added, removed) lines between two section bodies
+
+    Order and repeat counts matter in IOS (ACL entries are evaluated top
+    down), so a moved line is reported as removed from its old position
+    and added at its new one.
+    """
+    added: List[str] = []
+    removed: List[str] = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ('replace', 'delete'):
+            removed.extend(old_lines[i1:i2])
+        if tag in ('replace', 'insert'):
+            added.extend(new_lines[j1:j2])
+    return added, removed
+
+
+def diff_sections(
+    old_sections: "OrderedDict[str, List[str]]",
+    new_sections: "OrderedDict[str, List[str]]"
+) -> List[SectionChange]:
+    """Diff two sectioned configs, preserving the order sections appear in"""
+    changes: List[SectionChange] = []
+
+    for header, old_children in old_sections.items():
+        new_children = new_sections.get(header)
+        if new_children is None:
+            changes.append(SectionChange(CHANGE_REMOVED, header, [], list(old_children)))
+        elif old_children != new_children:
+            added, removed = diff_lines(old_children, new_children)
+            changes.append(SectionChange(CHANGE_MODIFIED, header, added, removed))
+
+    for header, new_children in new_sections.items():
+        if header not in old_sections:
+            changes.append(SectionChange(CHANGE_ADDED, header, list(new_children), []))
+
+    return changes
+
+
+def diff_configs(old_config: str, new_config: str) -> ConfigChangeSet:
+    """Compute the section-level change set between two configurations"""
+    old_hash = compute_config_hash(old_config)
+    new_hash = compute_config_hash(new_config)
+    if old_hash == new_hash:
+        return ConfigChangeSet(old_hash, new_hash)
+    return ConfigChangeSet(
+        old_hash=old_hash,
+        new_hash=new_hash,
+        changes=diff_sections(
+            parse_config(old_config, old_hash).section_map(),
+            parse_config(new_config, new_hash).section_map()
+        )
+    )
+
+
+class ChangeSetCache:
+    """Thread-safe LRU of change sets keyed by (old_hash, new_hash)"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, ConfigChangeSet]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, old_hash: str, new_hash: str) -> Optional[ConfigChangeSet]:
+        with self._lock:
+            change_set = self._entries.get((old_hash, new_hash))
+            if change_set is not None:
+                self._entries.move_to_end((old_hash, new_hash))
+            return change_set
+
+    def put(self, change_set: ConfigChangeSet):
+        key = (change_set.old_hash, change_set.new_hash)
+        with self._lock:
+            self._entries[key] = change_set
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Global in-process change set cache
+change_set_cache = ChangeSetCache()
@@ -0,0 +1,243 @@
+"""
+Cisco IOS Configuration Parser
+Turns a running-config into an indexed section tree and caches the parsed
+form by content hash so audit, drift and preview code can share it
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional
+
+# Lines that change on every backup without being real configuration changes
+VOLATILE_PREFIXES = (
+    'Building configuration',
+    'Current configuration',
+    'ntp clock-period',
+)
+
+
+def compute_config_hash(config_text: str) -> str:
+    """SHA-256 hex digest identifying a configuration's content"""
+    return hashlib.sha256(config_text.encode('utf-8')).hexdigest()
+
+
+class ConfigLine:
+    """One configuration line and its nested children"""
+
+    __slots__ = ('text', 'indent', 'line_number', 'parent', 'children', 'path')
+
+    def __init__(self, text: str, indent: int, line_number: int, parent: Optional['ConfigLine'] = None):
+        self.text = text
+        self.indent = indent
+        self.line_number = line_number
+        self.parent = parent
+        self.children: List['ConfigLine'] = []
+        # Position below the top-level section, e.g. "address-family ipv4 > neighbor x activate"
+        if parent is None or parent.parent is None:
+            self.path = text
+        else:
+            self.path = f"{parent.path} > {text}"
+
+    @property
+    def section(self) -> 'ConfigLine':
+        """The top-level line this line belongs to"""
+        line = self
+        while line.parent is not None:
+            line = line.parent
+        return line
+
+    def iter_descendants(self) -> Iterator['ConfigLine']:
+        for child in self.children:
+            yield child
+            yield from child.iter_descendants()
+
+    def find_children(self, prefix: str) -> List['ConfigLine']:
+        """Direct children whose text starts with prefix"""
+        return [child for child in self.children if child.text.startswith(prefix)]
+
+    def has_child(self, prefix: str) -> bool:
+        return any(child.text.startswith(prefix) for child in self.children)
+
+    def to_text(self) -> str:
+        """Render the line and its children with their original indentation"""
+        rendered = [' ' * self.indent + self.text]
+        rendered.extend(' ' * d.indent + d.text for d in self.iter_descendants())
+        return '\n'.join(rendered)
+
+    def __repr__(self):
+        return f'<ConfigLine {self.line_number}: {self.text}>'
+
+
+class ParsedConfig:
+    """Section tree of a configuration with lookups by common block type"""
+
+    def __init__(self, config_text: str, content_hash: Optional[str] = None):
+        self.text = config_text
+        self.content_hash = content_hash or compute_config_hash(config_text)
+        self.roots: List[ConfigLine] = []
+        self.lines: List[ConfigLine] = []
+        self.sections: "OrderedDict[str, List[ConfigLine]]" = OrderedDict()
+        self.hostname: Optional[str] = None
+        self.interfaces: Dict[str, ConfigLine] = {}
+        self.acls: Dict[str, List[ConfigLine]] = {}
+        self.routers: Dict[str, ConfigLine] = {}
+        self.line_blocks: Dict[str, ConfigLine] = {}
+        self._section_map: Optional["OrderedDict[str, List[str]]"] = None
+        self._parse()
+
+    def _parse(self):
+        stack: List[ConfigLine] = []  # open parents, outermost first
+        banner: Optional[ConfigLine] = None
+        banner_end: Optional[str] = None
+
+        for line_number, raw_line in enumerate(self.text.splitlines(), 1):
+            if banner_end is not None:
+                # Banner bodies are unindented free text up to the delimiter
+                body = ConfigLine(raw_line.rstrip(), 0, line_number, banner)
+                banner.children.append(body)
+                self.lines.append(body)
+                if banner_end in raw_line:
+                    banner_end = None
+                continue
+
+            stripped = raw_line.strip()
+            if not stripped or stripped[0] == '!' or stripped == 'end' or stripped.startswith(VOLATILE_PREFIXES):
+                continue
+
+            if raw_line[0] != ' ':
+                line = ConfigLine(stripped, 0, line_number)
+                self.roots.append(line)
+                self.lines.append(line)
+                self._index(line)
+                stack = [line]
+                if stripped.startswith('banner '):
+                    banner, banner_end = line, self._banner_delimiter(stripped)
+                continue
+
+            indent = len(raw_line) - len(raw_line.lstrip())
+            while stack and stack[-1].indent >= indent:
+                stack.pop()
+            line = ConfigLine(stripped, indent, line_number, stack[-1] if stack else None)
+            if line.parent is None:
+                # Indented text before any section header
+                self.roots.append(line)
+                self._index(line)
+            else:
+                line.parent.children.append(line)
+            self.lines.append(line)
+            stack.append(line)
+
+    @staticmethod
+    def _banner_delimiter(header: str) -> Optional[str]:
+        parts = header.split(None, 2)
+        if len(parts) < 3 or not parts[2]:
+            return None
+        delimiter = parts[2][:2] if parts[2].startswith('^') else parts[2][0]
+        if delimiter in parts[2][len(delimiter):]:
+            return None  # Single-line banner
+        return delimiter
+
+    def _index(self, line: ConfigLine):
+        text = line.text
+        self.sections.setdefault(text, []).append(line)
+        if text.startswith('hostname '):
+            self.hostname = text.split(None, 1)[1]
+        elif text.startswith('interface '):
+            self.interfaces[text.split(None, 1)[1]] = line
+        elif text.startswith('ip access-list '):
+            parts = text.split()
+            if len(parts) >= 4:
+                self.acls.setdefault(parts[3], []).append(line)
+        elif text.startswith('access-list '):
+            parts = text.split()
+            if len(parts) >= 2:
+                self.acls.setdefault(parts[1], []).append(line)
+        elif text.startswith('router '):
+            self.routers[text.split(None, 1)[1]] = line
+        elif text.startswith('line '):
+            self.line_blocks[text.split(None, 1)[1]] = line
+
+    def get_section(self, header: str) -> Optional[ConfigLine]:
+        matches = self.sections.get(header)
+        return matches[0] if matches else None
+
+    def get_interface(self, name: str) -> Optional[ConfigLine]:
+        return self.interfaces.get(name)
+
+    def get_acl(self, name: str) -> List[ConfigLine]:
+        """Named ACL block or the top-level lines of a numbered ACL"""
+        return self.acls.get(str(name), [])
+
+    def get_router(self, protocol: str, process_id: Optional[str] = None) -> Optional[ConfigLine]:
+        if process_id is not None:
+            return self.routers.get(f"{protocol} {process_id}")
+        for key, line in self.routers.items():
+            if key.split()[0] == protocol:
+                return line
+        return None
+
+    def find_sections(self, prefix: str) -> List[ConfigLine]:
+        """Top-level lines whose text starts with prefix"""
+        return [line for line in self.roots if line.text.startswith(prefix)]
+
+    def section_map(self) -> "OrderedDict[str, List[str]]":
+        """Top-level header -> child paths, merged across repeated headers"""
+        if self._section_map is None:
+            sections: "OrderedDict[str, List[str]]" = OrderedDict()
+            for root in self.roots:
+                sections.setdefault(root.text, [])
+            for line in self.lines:
+                if line.parent is not None:
+                    sections[line.section.text].append(line.path)
+            self._section_map = sections
+        return self._section_map
+
+
+class ParsedConfigCache:
+    """Thread-safe LRU of parsed configurations keyed by content hash"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ParsedConfig]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, config_text: str, content_hash: Optional[str] = None) -> ParsedConfig:
+        """Return the parsed form of a configuration, parsing it at most once"""
+        content_hash = content_hash or compute_config_hash(config_text)
+        with self._lock:
+            parsed = self._entries.get(content_hash)
+            if parsed is not None:
+                self._entries.move_to_end(content_hash)
+                self.hits += 1
+                return parsed
+            self.misses += 1
+
+        # Parse outside the lock; a concurrent duplicate parse is harmless
+        parsed = ParsedConfig(config_text, content_hash)
+        with self._lock:
+            self._entries[content_hash] = parsed
+            self._entries.move_to_end(content_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return parsed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+# Global parsed config cache
+parsed_config_cache = ParsedConfigCache()
+
+
+def parse_config(config_text: str, content_hash: Optional[str] = None) -> ParsedConfig:
+    """Parse a configuration through the shared cache"""
+    return parsed_config_cache.get(config_text, content_hash)
@@ -0,0 +1,58 @@
+"""
+Simple tests to verify configs are chunked along section boundaries
+"""
+from backend.network.config_chunker import chunk_config, estimate_tokens
+from backend.network.config_parser import ParsedConfig
+
+
+def make_config(interfaces=200):
+    lines = ['hostname CORE1', 'service password-encryption']
+    for i in range(interfaces):
+        lines.extend([
+            f'interface GigabitEthernet0/{i}',
+            f' description Uplink {i}',
+            f' ip address 10.{i // 250}.{i % 250}.1 255.255.255.0',
+            ' no shutdown',
+        ])
+    lines.append('router bgp 65000')
+    for i in range(100):
+        lines.extend([f' neighbor 192.0.2.{i} remote-as 65001', f' neighbor 192.0.2.{i} password secret'])
+    return '\n'.join(lines)
+
+
+def test_small_config_is_one_chunk():
+    """Test that a config under budget is sent whole"""
+    parsed = ParsedConfig(make_config(interfaces=2))
+
+    chunks = chunk_config(parsed, 4000)
+
+    assert len(chunks) == 1
+    assert chunks[0].sections[0] == 'hostname CORE1'
+
+
+def test_every_line_lands_in_exactly_one_chunk_within_budget():
+    """Test that chunking covers the whole config without splitting sections"""
+    parsed = ParsedConfig(make_config())
+
+    chunks = chunk_config(parsed, 500)
+
+    assert len(chunks) > 1
+    assert all(chunk.tokens <= 500 + 10 for chunk in chunks)
+    chunk_lines = [line.strip() for chunk in chunks for line in chunk.text.splitlines()]
+    header_repeats = chunk_lines.count('router bgp 65000') - 1
+    assert len(chunk_lines) - header_repeats == len(parsed.lines)
+    for chunk in chunks:
+        lines = chunk.text.splitlines()
+        assert not lines[0].startswith(' ')
+
+
+def test_oversized_section_is_split_with_its_header():
+    """Test that a section bigger than the budget repeats its header in each slice"""
+    parsed = ParsedConfig(make_config(interfaces=0))
+    bgp_tokens = estimate_tokens(parsed.get_router('bgp').to_text())
+
+    chunks = chunk_config(parsed, bgp_tokens // 3)
+
+    bgp_chunks = [chunk for chunk in chunks if 'router bgp 65000' in chunk.sections]
+    assert len(bgp_chunks) >= 3
+    assert all('router bgp 65000' in chunk.text.splitlines() for chunk in bgp_chunks)
@@ -0,0 +1,156 @@
+"""
+Simple tests to verify the Cisco IOS config diff engine
+"""
+import time
+from backend.network.config_diff import ChangeSetCache, diff_configs, split_sections
+
+OLD_CONFIG = """Building configuration...
+
+Current configuration : 1234 bytes
+!
+hostname R15
+!
+interface GigabitEthernet0/0
+ description Uplink
+ ip address 10.0.0.1 255.255.255.0
+!
+interface GigabitEthernet0/1
+ shutdown
+!
+router bgp 65000
+ address-family ipv4
+  neighbor 10.0.0.2 activate
+ exit-address-family
+ address-family ipv6
+ exit-address-family
+!
+banner motd ^C
+Authorized access only
+^C
+!
+end
+"""
+
+NEW_CONFIG = """Building configuration...
+
+Current configuration : 1301 bytes
+!
+hostname R15
+!
+interface GigabitEthernet0/0
+ description Core uplink
+ ip address 10.0.0.1 255.255.255.0
+!
+router bgp 65000
+ address-family ipv4
+  neighbor 10.0.0.2 activate
+ exit-address-family
+ address-family ipv6
+  neighbor 2001:db8::2 activate
+ exit-address-family
+!
+banner motd ^C
+Authorized access only
+^C
+!
+ip ssh version 2
+end
+"""
+
+
+def test_sections_keep_nested_paths():
+    """Test that nested children are keyed under their parent block"""
+    sections = split_sections(OLD_CONFIG)
+
+    assert 'Current configuration : 1234 bytes' not in sections
+    assert sections['router bgp 65000'] == [
+        'address-family ipv4',
+        'address-family ipv4 > neighbor 10.0.0.2 activate',
+        'exit-address-family',
+        'address-family ipv6',
+        'exit-address-family',
+    ]
+    assert sections['banner motd ^C'] == ['Authorized access only', '^C']
+
+
+def test_diff_reports_added_removed_and_modified_sections():
+    """Test that changes are grouped per section"""
+    change_set = diff_configs(OLD_CONFIG, NEW_CONFIG)
+    changes = {c.section: c for c in change_set.changes}
+
+    assert set(changes) == {
+        'interface GigabitEthernet0/0', 'interface GigabitEthernet0/1', 'router bgp 65000', 'ip ssh version 2'
+    }
+    assert changes['interface GigabitEthernet0/0'].change_type == 'modified'
+    assert changes['interface GigabitEthernet0/0'].added_lines == ['description Core uplink']
+    assert changes['interface GigabitEthernet0/0'].removed_lines == ['description Uplink']
+    assert changes['interface GigabitEthernet0/1'].change_type == 'removed'
+    assert changes['router bgp 65000'].added_lines == ['address-family ipv6 > neighbor 2001:db8::2 activate']
+    assert changes['ip ssh version 2'].change_type == 'added'
+    assert change_set.summary()['modified'] == 2
+
+
+def test_identical_configs_have_no_changes():
+    """Test that volatile header lines do not count as changes"""
+    assert diff_configs(OLD_CONFIG, OLD_CONFIG.replace('1234 bytes', '999 bytes')).is_empty
+
+
+def test_reordered_acl_entries_are_a_change():
+    """Test that swapping ACL entries is reported, since IOS evaluates them in order"""
+    old_config = """ip access-list extended EDGE-IN
+ permit tcp any host 10.0.0.5 eq 443
+ deny ip any any log
+"""
+    new_config = """ip access-list extended EDGE-IN
+ deny ip any any log
+ permit tcp any host 10.0.0.5 eq 443
+"""
+    change_set = diff_configs(old_config, new_config)
+
+    assert len(change_set.changes) == 1
+    change = change_set.changes[0]
+    assert change.change_type == 'modified'
+    assert change.section == 'ip access-list extended EDGE-IN'
+    assert change.added_lines == change.removed_lines
+    assert len(change.added_lines) == 1
+
+
+def test_duplicate_line_count_changes_are_reported():
+    """Test that adding or removing a repeat of an existing line is a change"""
+    old_config = "interface Vlan10\n ip helper-address 10.0.0.9\n"
+    new_config = "interface Vlan10\n ip helper-address 10.0.0.9\n ip helper-address 10.0.0.9\n"
+
+    added = diff_configs(old_config, new_config).changes
+    assert [(c.change_type, c.added_lines, c.removed_lines) for c in added] == [
+        ('modified', ['ip helper-address 10.0.0.9'], [])
+    ]
+    removed = diff_configs(new_config, old_config).changes
+    assert removed[0].removed_lines == ['ip helper-address 10.0.0.9']
+
+
+def test_large_config_diff_is_fast():
+    """Test diff speed on a 5,000 line configuration"""
+    blocks = [f"interface GigabitEthernet1/0/{i}\n description port {i}\n switchport access vlan 10\n!" for i in range(1250)]
+    old_config = '\n'.join(blocks)
+    new_config = old_config.replace('description port 42\n', 'description server 42\n')
+
+    diff_configs(old_config, new_config)
+    start = time.perf_counter()
+    change_set = diff_configs(old_config, new_config)
+    elapsed = time.perf_counter() - start
+
+    assert len(change_set.changes) == 1
+    assert elapsed < 0.05
+
+
+def test_change_set_cache_evicts_oldest():
+    """Test that the change set cache is bounded"""
+    cache = ChangeSetCache(max_entries=1)
+    first = diff_configs('hostname A', 'hostname B')
+    second = diff_configs('hostname B', 'hostname C')
+
+    cache.put(first)
+    cache.put(second)
+
+    assert cache.get(first.old_hash, first.new_hash) is None
+    assert cache.get(second.old_hash, second.new_hash) is second
@@ -0,0 +1,65 @@
+"""
+Simple tests to verify the Cisco IOS config parser and its cache
+"""
+from backend.network.config_parser import ParsedConfigCache, ParsedConfig
+
+CONFIG = """!
+hostname R15
+!
+interface GigabitEthernet0/0
+ description Uplink
+ ip address 10.0.0.1 255.255.255.0
+ ip access-group MGMT in
+!
+ip access-list extended MGMT
+ permit tcp 10.0.0.0 0.0.0.255 any eq 22
+ deny ip any any log
+!
+access-list 10 permit 10.0.0.0 0.0.0.255
+access-list 10 deny any
+!
+router ospf 1
+ network 10.0.0.0 0.0.0.255 area 0
+!
+line vty 0 4
+ transport input ssh
+!
+end
+"""
+
+
+def test_sections_are_indexed_by_type():
+    """Test lookups of interfaces, ACLs, routers and line blocks"""
+    parsed = ParsedConfig(CONFIG)
+
+    assert parsed.hostname == 'R15'
+    interface = parsed.get_interface('GigabitEthernet0/0')
+    assert interface.has_child('ip access-group MGMT')
+    assert [c.text for c in parsed.get_acl('MGMT')[0].children][1] == 'deny ip any any log'
+    assert len(parsed.get_acl(10)) == 2
+    assert parsed.get_router('ospf').children[0].text.startswith('network 10.0.0.0')
+    assert parsed.line_blocks['vty 0 4'].find_children('transport')[0].text == 'transport input ssh'
+
+
+def test_children_know_their_section_and_line_number():
+    """Test parent links and source line numbers"""
+    parsed = ParsedConfig(CONFIG)
+    deny = next(line for line in parsed.lines if line.text == 'deny ip any any log')
+
+    assert deny.section.text == 'ip access-list extended MGMT'
+    assert deny.line_number == 11
+    assert deny.parent.to_text().startswith('ip access-list extended MGMT\n permit tcp')
+
+
+def test_cache_parses_each_config_once():
+    """Test that identical content is served from the cache"""
+    cache = ParsedConfigCache(max_entries=2)
+
+    first = cache.get(CONFIG)
+    second = cache.get(CONFIG)
+    cache.get('hostname A')
+    cache.get('hostname B')
+
+    assert first is second
+    assert cache.get_stats() == {'entries': 2, 'hits': 1, 'misses': 3}
+    assert cache.get(CONFIG) is not first
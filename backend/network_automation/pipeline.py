@@ -16,6 +16,8 @@ import json
 
 from backend.ai.ai_service import ai_service
 from backend.devices.service import DeviceService
+from backend.network.config_parser import parse_config
+from backend.operations.drift_service import assess_risk
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
@@ -396,11 +398,32 @@ class NetworkAutomationPipeline:
     async def _preview_config_changes(self, config: str, device) -> Dict[str, Any]:
         """Preview what changes the configuration would make"""
         try:
-            # This would analyze the configuration and predict changes
-            # For now, return a basic preview
+            candidate = parse_config(config)
+            running_config = self.device_service.get_device_config(device.id)
+            if not running_config:
+                return {
+                    "estimated_changes": f"{len(candidate.roots)} sections (no running config to compare)",
+                    "impact_level": "unknown",
+                    "requires_reboot": False
+                }
+            
+            running = parse_config(running_config)
+            new_sections = []
+            modified_sections = []
+            for section in candidate.roots:
+                existing = running.get_section(section.text)
+                if existing is None:
+                    new_sections.append(section.text)
+                elif {d.path for d in section.iter_descendants()} - {d.path for d in existing.iter_descendants()}:
+                    modified_sections.append(section.text)
+            
+            touched = new_sections + modified_sections
+            risks = {assess_risk(section) for section in touched}
             return {
-                "estimated_changes": "Configuration analysis completed",
-                "impact_level": "medium",
+                "estimated_changes": f"{len(new_sections)} new and {len(modified_sections)} modified sections",
+                "new_sections": new_sections,
+                "modified_sections": modified_sections,
+                "impact_level": "high" if "high" in risks else "medium" if "medium" in risks else "low",
                 "requires_reboot": False
             }
         except Exception as e:
@@ -0,0 +1,89 @@
+"""
+Audit Result Cache
+Stores the findings of a device audit keyed by config hash, audit type,
+rule-set version and model so unchanged devices are not re-analyzed
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.database.models import AuditCacheEntry, ComplianceRule
+
+logger = logging.getLogger(__name__)
+
+
+def compute_ruleset_version(
+    patterns: Dict[str, List[str]],
+    rules: List[ComplianceRule],
+    logic_version: int
+) -> str:
+    """Fingerprint everything besides the config that shapes audit findings"""
+    fingerprint = {
+        'logic_version': logic_version,
+        'patterns': patterns,
+        'rules': sorted(
+            (rule.id, rule.updated_at.isoformat() if rule.updated_at else None)
+            for rule in rules
+        )
+    }
+    return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def make_cache_key(config_hash: str, audit_type: str, ruleset_version: str, model: str) -> str:
+    return hashlib.sha256('|'.join((config_hash, audit_type, ruleset_version, model)).encode('utf-8')).hexdigest()
+
+
+class AuditCache:
+    """Database-backed cache of per-device audit findings"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached findings and record the hit"""
+        entry = self.db.get(AuditCacheEntry, cache_key)
+        if entry is None:
+            return None
+
+        entry.hit_count = (entry.hit_count or 0) + 1
+        entry.last_hit_at = datetime.now(timezone.utc)
+        return entry.findings
+
+    def put(
+        self,
+        cache_key: str,
+        config_hash: str,
+        audit_type: str,
+        ruleset_version: str,
+        model: str,
+        findings: List[Dict[str, Any]]
+    ):
+        """Store findings for a key; flushed with the caller's transaction"""
+        try:
+            with self.db.begin_nested():
+                self.db.add(AuditCacheEntry(
+                    cache_key=cache_key,
+                    config_hash=config_hash,
+                    audit_type=audit_type,
+                    ruleset_version=ruleset_version,
+                    model=model,
+                    findings=findings,
+                    hit_count=0
+                ))
+        except IntegrityError:
+            # Another worker cached the same audit first
+            logger.debug(f"Audit cache entry {cache_key[:12]} already stored")
+
+    def invalidate(self, config_hash: Optional[str] = None) -> int:
+        """Drop cached audits, for one config or all of them"""
+        query = self.db.query(AuditCacheEntry)
+        if config_hash:
+            query = query.filter(AuditCacheEntry.config_hash == config_hash)
+        deleted = query.delete(synchronize_session=False)
+        self.db.commit()
+        return deleted
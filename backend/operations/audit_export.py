@@ -0,0 +1,168 @@
+"""
+Audit Result Export
+Streams the findings of an audit session as JSON, CSV, NDJSON or Parquet,
+reading them in batches through a server-side cursor so exports of any size
+never have to fit in memory
+"""
+import csv
+import io
+import json
+import logging
+import tempfile
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.database.connection import SessionLocal
+from backend.database.models import AuditResult, NetworkDevice
+from backend.utils.config import config
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    'json': 'application/json',
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+# Column name and source expression of every exported field
+EXPORT_COLUMNS = [
+    ('id', AuditResult.id),
+    ('device_id', AuditResult.device_id),
+    ('device_name', NetworkDevice.name),
+    ('device_ip', NetworkDevice.ip_address),
+    ('audit_type', AuditResult.audit_type),
+    ('severity', AuditResult.severity),
+    ('finding_type', AuditResult.finding_type),
+    ('title', AuditResult.finding_title),
+    ('description', AuditResult.finding_description),
+    ('affected_section', AuditResult.affected_config_section),
+    ('current_config', AuditResult.current_config),
+    ('recommended_config', AuditResult.recommended_config),
+    ('remediation_steps', AuditResult.remediation_steps),
+    ('risk_score', AuditResult.risk_score),
+    ('compliance_framework', AuditResult.compliance_framework),
+    ('status', AuditResult.status),
+    ('created_at', AuditResult.created_at),
+]
+COLUMN_NAMES = [name for name, _ in EXPORT_COLUMNS]
+
+# Streamed responses are sent in chunks of about this many bytes
+CHUNK_SIZE = 64 * 1024
+
+
+def export_filename(audit_session_id: str, export_format: str) -> str:
+    return f'audit_results_{audit_session_id}.{export_format}'
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class AuditExporter:
+    """Writes audit findings incrementally in the requested format"""
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal, batch_size: Optional[int] = None):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or config.AUDIT_EXPORT_BATCH_SIZE
+
+    @staticmethod
+    def check_format(export_format: str):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        if export_format == 'parquet' and pq is None:
+            raise ValueError("Parquet export requires pyarrow to be installed")
+
+    def iter_batches(self, audit_session_id: str) -> Iterator[List[Dict[str, Any]]]:
+        """Findings of a session as lists of row dicts, read through a server-side cursor"""
+        db = self.session_factory()
+        try:
+            result = db.execute(
+                db.query(*(column.label(name) for name, column in EXPORT_COLUMNS))
+                .select_from(AuditResult)
+                .outerjoin(NetworkDevice, NetworkDevice.id == AuditResult.device_id)
+                .filter(AuditResult.audit_session_id == audit_session_id)
+                .order_by(AuditResult.device_id, AuditResult.id)
+                .statement
+                .execution_options(yield_per=self.batch_size)
+            )
+            for partition in result.mappings().partitions():
+                yield [dict(row) for row in partition]
+        finally:
+            db.close()
+
+    def stream(self, audit_session_id: str, export_format: str) -> Iterator[bytes]:
+        """Encoded export content, produced batch by batch"""
+        self.check_format(export_format)
+        writers = {
+            'json': self._iter_json,
+            'csv': self._iter_csv,
+            'ndjson': self._iter_ndjson,
+            'parquet': self._iter_parquet,
+        }
+        return writers[export_format](audit_session_id)
+
+    def _iter_json(self, audit_session_id: str) -> Iterator[bytes]:
+        yield f'{{"audit_session_id": {json.dumps(audit_session_id)}, "findings": ['.encode('utf-8')
+        first = True
+        for batch in self.iter_batches(audit_session_id):
+            chunk = ', '.join(json.dumps(row, default=_serialize) for row in batch)
+            if chunk:
+                yield (chunk if first else ', ' + chunk).encode('utf-8')
+                first = False
+        yield b']}'
+
+    def _iter_ndjson(self, audit_session_id: str) -> Iterator[bytes]:
+        for batch in self.iter_batches(audit_session_id):
+            yield ''.join(json.dumps(row, default=_serialize) + '\n' for row in batch).encode('utf-8')
+
+    def _iter_csv(self, audit_session_id: str) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(COLUMN_NAMES)
+        for batch in self.iter_batches(audit_session_id):
+            for row in batch:
+                writer.writerow([
+                    json.dumps(row[name]) if name == 'remediation_steps' and row[name] is not None else _serialize(row[name])
+                    for name in COLUMN_NAMES
+                ])
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+
+    def _iter_parquet(self, audit_session_id: str) -> Iterator[bytes]:
+        # Parquet footers are written last, so the file is spooled and then streamed
+        schema = pa.schema([
+            (name, pa.float64() if name == 'risk_score' else pa.string())
+            for name in COLUMN_NAMES
+        ])
+        with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+            with pq.ParquetWriter(spool, schema) as writer:
+                for batch in self.iter_batches(audit_session_id):
+                    columns = {name: [] for name in COLUMN_NAMES}
+                    for row in batch:
+                        for name in COLUMN_NAMES:
+                            value = row[name]
+                            if name == 'remediation_steps' and value is not None:
+                                value = json.dumps(value)
+                            columns[name].append(_serialize(value))
+                    writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            spool.seek(0)
+            while True:
+                chunk = spool.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
@@ -0,0 +1,196 @@
+"""
+Background Audit Jobs
+Runs configuration audits off the request path, records per-device progress
+by audit session and pushes progress events to websocket subscribers
+"""
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.database.connection import SessionLocal
+from backend.operations.cisco_audit_service import CiscoAuditService
+from backend.websocket_manager import connection_manager
+from backend.utils.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class AuditJob:
+    """Progress of one audit session across its devices"""
+
+    def __init__(
+        self,
+        audit_session_id: str,
+        device_ids: List[str],
+        audit_type: str,
+        user_id: str,
+        audit_options: Dict[str, Any]
+    ):
+        self.audit_session_id = audit_session_id
+        self.device_ids = list(device_ids)
+        self.audit_type = audit_type
+        self.user_id = user_id
+        self.audit_options = audit_options
+        self.status = 'queued'
+        self.devices: Dict[str, Dict[str, Any]] = {
+            device_id: {'status': 'pending'} for device_id in device_ids
+        }
+        self.completed = 0
+        self.findings_count = 0
+        self.current_device: Optional[str] = None
+        self.operation_id: Optional[str] = None
+        self.summary: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+        self._done = asyncio.Event()
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ('completed', 'failed')
+
+    @property
+    def progress(self) -> int:
+        if self.status == 'completed' or not self.device_ids:
+            return 100
+        return int(self.completed / len(self.device_ids) * 100)
+
+    def record_device(self, result: Dict[str, Any]):
+        self.devices[result['device_id']] = {
+            key: value for key, value in result.items() if key != 'device_id'
+        }
+        self.completed += 1
+        self.findings_count += result.get('findings_count', 0)
+        self.current_device = result.get('device_name', result['device_id'])
+
+    def finish(self, status: str, error: Optional[str] = None):
+        self.status = status
+        self.error = error
+        self.finished_at = datetime.now(timezone.utc)
+        self._done.set()
+
+    async def wait(self):
+        """Wait until every device has been audited"""
+        await self._done.wait()
+
+    def to_dict(self, include_devices: bool = False) -> Dict[str, Any]:
+        data = {
+            'audit_session_id': self.audit_session_id,
+            'operation_id': self.operation_id,
+            'audit_type': self.audit_type,
+            'status': self.status,
+            'progress_percentage': self.progress,
+            'total_devices': len(self.device_ids),
+            'devices_completed': self.completed,
+            'devices_failed': sum(1 for d in self.devices.values() if d['status'] == 'failed'),
+            'findings_count': self.findings_count,
+            'current_device': self.current_device,
+            'summary': self.summary,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+        if include_devices:
+            data['devices'] = dict(self.devices)
+        return data
+
+
+class AuditJobManager:
+    """Runs audit jobs as event loop tasks, a bounded number at a time"""
+
+    def __init__(
+        self,
+        max_concurrent_jobs: int = 4,
+        max_finished_jobs: int = 100,
+        session_factory: Callable = SessionLocal
+    ):
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.max_finished_jobs = max_finished_jobs
+        self.session_factory = session_factory
+        self._slots = asyncio.Semaphore(max_concurrent_jobs)
+        self._jobs: "OrderedDict[str, AuditJob]" = OrderedDict()
+
+    def submit(
+        self,
+        audit_session_id: str,
+        device_ids: List[str],
+        audit_type: str,
+        user_id: str,
+        audit_options: Optional[Dict[str, Any]] = None
+    ) -> AuditJob:
+        """Create a job and start it on the running event loop"""
+        job = AuditJob(audit_session_id, device_ids, audit_type, user_id, audit_options or {})
+        self._jobs[audit_session_id] = job
+        self._prune()
+
+        job.task = asyncio.create_task(self._run(job))
+        logger.info(f"Queued {audit_type} audit {audit_session_id} of {len(device_ids)} devices")
+        return job
+
+    def get_job(self, audit_session_id: str) -> Optional[AuditJob]:
+        return self._jobs.get(audit_session_id)
+
+    def list_jobs(self) -> List[AuditJob]:
+        return list(self._jobs.values())
+
+    def _prune(self):
+        finished = [session_id for session_id, job in self._jobs.items() if job.is_finished]
+        for session_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[session_id]
+
+    async def _send_update(self, job: AuditJob, message: str, data: Optional[Dict[str, Any]] = None):
+        await connection_manager.send_operation_update(
+            operation_id=job.audit_session_id,
+            operation_type='audit',
+            status=job.status,
+            progress=job.progress,
+            message=message,
+            data=data or job.to_dict()
+        )
+
+    async def _run(self, job: AuditJob):
+        async with self._slots:
+            job.status = 'running'
+            job.started_at = datetime.now(timezone.utc)
+            await self._send_update(job, f"Auditing {len(job.device_ids)} devices")
+
+            async def on_device(result: Dict[str, Any]):
+                job.record_device(result)
+                await self._send_update(
+                    job,
+                    f"Audited {job.completed}/{len(job.device_ids)} devices",
+                    {**result, 'findings_count_total': job.findings_count}
+                )
+
+            db = self.session_factory()
+            try:
+                audit_service = CiscoAuditService(db, session_factory=self.session_factory)
+                job.summary = await audit_service.start_comprehensive_audit(
+                    device_ids=job.device_ids,
+                    audit_type=job.audit_type,
+                    user_id=job.user_id,
+                    audit_options=job.audit_options,
+                    audit_session_id=job.audit_session_id,
+                    progress_callback=on_device
+                )
+                job.operation_id = job.summary['operation_id']
+                job.finish('completed')
+            except Exception as e:
+                logger.error(f"Audit job {job.audit_session_id} failed: {e}")
+                job.finish('failed', str(e))
+            finally:
+                db.close()
+
+            await self._send_update(
+                job,
+                f"Audit {job.status}: {job.findings_count} findings on {job.completed} devices"
+            )
+
+
+# Global audit job manager
+audit_job_manager = AuditJobManager(max_concurrent_jobs=config.AUDIT_MAX_CONCURRENT_JOBS)
@@ -0,0 +1,170 @@
+"""
+Audit Pattern Matcher
+Evaluates every audit pattern in a single pass over a parsed configuration,
+using a combined literal prefilter so only candidate lines reach the
+per-pattern confirmation regexes
+"""
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from backend.network.config_parser import ParsedConfig
+
+_QUANTIFIERS = '?*{'
+_RUN_BREAKERS = '.^$|+'
+
+
+@dataclass
+class PatternMatch:
+    """A pattern hit on one configuration line"""
+    line_number: int
+    text: str
+    matched: str
+    section: Optional[str]
+
+
+@dataclass
+class CompiledPattern:
+    category: str
+    pattern: str
+    regex: 're.Pattern'
+    literal: str  # Lowercase substring every match must contain ('' if none)
+
+
+@dataclass
+class MatchReport:
+    """Matches of one scan, keyed by (category, pattern)"""
+    matches: Dict[Tuple[str, str], List[PatternMatch]] = field(default_factory=dict)
+
+    def get(self, category: str, pattern: str) -> List[PatternMatch]:
+        return self.matches.get((category, pattern), [])
+
+    def found(self, category: str) -> Dict[str, List[PatternMatch]]:
+        """Patterns of a category that matched at least once"""
+        return {p: hits for (c, p), hits in self.matches.items() if c == category and hits}
+
+    def missing(self, category: str, patterns: List[str]) -> List[str]:
+        """Patterns of a category that matched nowhere"""
+        return [p for p in patterns if not self.matches.get((category, p))]
+
+
+def required_literal(pattern: str) -> str:
+    """Longest literal substring that any match of the pattern must contain
+
+    Conservative: groups, classes and optional characters end a literal run,
+    and patterns with top-level alternation have no required literal.
+    """
+    runs: List[str] = []
+    current: List[str] = []
+    depth = 0
+    i = 0
+
+    def end_run():
+        if current:
+            runs.append(''.join(current))
+            current.clear()
+
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\':
+            escaped = pattern[i + 1:i + 2]
+            if depth == 0 and escaped and not escaped.isalnum():
+                current.append(escaped)
+            else:
+                end_run()
+            i += 2
+            continue
+        if ch == '[':
+            end_run()
+            i += 1
+            if pattern[i:i + 1] == ']':
+                i += 1
+            while i < len(pattern) and pattern[i] != ']':
+                i += 2 if pattern[i] == '\\' else 1
+            i += 1
+            continue
+        if ch == '(':
+            end_run()
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif depth == 0:
+            if ch == '|':
+                return ''
+            if ch in _QUANTIFIERS:
+                if current:
+                    current.pop()
+                end_run()
+                if ch == '{':
+                    i = pattern.find('}', i)
+                    if i == -1:
+                        break
+            elif ch in _RUN_BREAKERS:
+                end_run()
+            else:
+                current.append(ch)
+        i += 1
+
+    end_run()
+    return max(runs, key=len).lower() if runs else ''
+
+
+class PatternMatcher:
+    """Compiled set of categorized patterns evaluated in one pass"""
+
+    def __init__(self, patterns: Dict[str, List[str]], flags: int = re.IGNORECASE):
+        self.patterns = {category: list(items) for category, items in patterns.items()}
+        self.compiled = [
+            CompiledPattern(category, pattern, re.compile(pattern, flags), required_literal(pattern))
+            for category, items in patterns.items()
+            for pattern in items
+        ]
+        self._by_literal: Dict[str, List[CompiledPattern]] = {}
+        self._unanchored: List[CompiledPattern] = []
+        for compiled in self.compiled:
+            if compiled.literal:
+                self._by_literal.setdefault(compiled.literal, []).append(compiled)
+            else:
+                self._unanchored.append(compiled)
+
+        literals = sorted(self._by_literal, key=len, reverse=True)
+        self._prefilter = re.compile('|'.join(re.escape(l) for l in literals)) if literals else None
+
+    def scan(self, parsed: ParsedConfig) -> MatchReport:
+        """Match every pattern against every line, visiting each line once"""
+        report = MatchReport({(c.category, c.pattern): [] for c in self.compiled})
+        prefilter = self._prefilter.search if self._prefilter else None
+
+        for line in parsed.lines:
+            text = line.text
+            candidates = self._unanchored
+            if prefilter is not None:
+                lowered = text.lower()
+                if prefilter(lowered):
+                    candidates = candidates + [
+                        compiled
+                        for literal, group in self._by_literal.items() if literal in lowered
+                        for compiled in group
+                    ]
+            for compiled in candidates:
+                hit = compiled.regex.search(text)
+                if hit:
+                    report.matches[(compiled.category, compiled.pattern)].append(PatternMatch(
+                        line_number=line.line_number,
+                        text=text,
+                        matched=hit.group(0),
+                        section=line.section.text if line.parent is not None else None
+                    ))
+
+        return report
+
+
+@lru_cache(maxsize=32)
+def _compile_cached(frozen: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> PatternMatcher:
+    return PatternMatcher({category: list(patterns) for category, patterns in frozen})
+
+
+def get_pattern_matcher(patterns: Dict[str, List[str]]) -> PatternMatcher:
+    """Compiled matcher for a pattern set, shared by every caller with the same patterns"""
+    return _compile_cached(tuple((category, tuple(items)) for category, items in patterns.items()))
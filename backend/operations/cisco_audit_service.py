@@ -3,29 +3,130 @@ Cisco Configuration Audit Service
 Provides AI-powered auditing capabilities for Cisco network devices
 """
 
+import base64
 import json
-import re
 import uuid
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Tuple
 import logging
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
+from sqlalchemy import and_, case, func, or_
 from sqlalchemy.orm import Session
 from backend.database.models import (
     NetworkDevice, AuditResult, ComplianceRule, OperationLog, User
 )
-from backend.ai.ai_service import AIService
+from backend.ai.ai_service import AIService, LLMUnavailableError
+from backend.database.connection import SessionLocal
+from backend.utils.config import config
 from backend.devices.service import DeviceService
+from backend.network.config_chunker import chunk_config
+from backend.network.config_parser import ParsedConfig, compute_config_hash, parse_config
+from backend.operations.audit_matcher import get_pattern_matcher
+from backend.operations.compliance_engine import ComplianceEngine
+from backend.operations.audit_cache import AuditCache, compute_ruleset_version, make_cache_key
+from backend.operations.audit_export import EXPORT_FORMATS, AuditExporter, export_filename
 
 logger = logging.getLogger(__name__)
 
+# Bump when prompts or finding parsing change so cached audits are not replayed
+AUDIT_LOGIC_VERSION = 2
+
+# Static audit instructions, sent as the system prompt so every device and chunk
+# of an audit type shares one provider-cacheable prefix
+AUDIT_INSTRUCTIONS = {
+    'comprehensive': """Analyze each Cisco configuration you are given for a comprehensive audit.
+
+Please analyze for:
+1. Security vulnerabilities and misconfigurations
+2. Performance optimization opportunities
+3. Best practice violations
+4. Compliance issues (PCI-DSS, SOX, NIST)
+5. Configuration drift from industry standards
+6. Potential reliability issues
+
+For each finding, provide:
+- Severity level (critical, high, medium, low, info)
+- Finding type and title
+- Detailed description
+- Current problematic configuration
+- Recommended configuration fix
+- Step-by-step remediation
+- Risk score (0-10)
+- Compliance framework if applicable
+
+Format the response as JSON with an array of findings.""",
+    'security': """Perform a security audit on each Cisco configuration you are given.
+
+Focus on identifying:
+1. Weak or default passwords
+2. Unencrypted protocols
+3. Missing access controls
+4. Insecure service configurations
+5. Authentication vulnerabilities
+6. Authorization bypass risks
+7. Logging and monitoring gaps
+
+Provide detailed security findings with remediation steps.
+Format as JSON array of security findings.""",
+    'compliance': """Perform a compliance audit on each Cisco configuration you are given.
+
+Check against PCI-DSS, SOX, NIST and CIS benchmark requirements for:
+1. Access control and authentication (AAA, local users, privilege levels)
+2. Encryption of management traffic and stored passwords
+3. Logging, time synchronization and audit trails
+4. Network segmentation and ACLs
+5. Session timeouts and login protection
+
+For each violation include the compliance framework and requirement.
+Format as JSON array of compliance findings.""",
+    'performance': """Perform a performance audit on each Cisco configuration you are given.
+
+Focus on identifying:
+1. Interface speed, duplex and MTU mismatches
+2. QoS policy gaps
+3. Routing protocol timers and summarization
+4. Spanning tree and redundancy settings
+5. CPU or memory intensive features (debugs, excessive logging)
+
+Provide detailed performance findings with remediation steps.
+Format as JSON array of performance findings.""",
+}
+
+# Shared by every audit so concurrent LLM calls stay bounded across devices
+_llm_executor = ThreadPoolExecutor(max_workers=config.AUDIT_AI_MAX_CONCURRENCY, thread_name_prefix='audit-llm')
+
+# Result ordering: most severe first
+SEVERITY_ORDER = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3, 'info': 4}
+
+
+def encode_results_cursor(severity_rank: int, risk_score: float, finding_id: str) -> str:
+    """Opaque keyset cursor for the finding after which the next page starts"""
+    payload = json.dumps([severity_rank, risk_score, finding_id])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_results_cursor(cursor: str) -> Tuple[int, float, str]:
+    try:
+        severity_rank, risk_score, finding_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return int(severity_rank), float(risk_score), str(finding_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid results cursor")
+
 class CiscoAuditService:
     """Enhanced Cisco configuration audit service with AI analysis"""
     
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_workers: Optional[int] = None
+    ):
         self.db = db
+        self.session_factory = session_factory
+        self.max_workers = max_workers or config.AUDIT_MAX_WORKERS
+        self.batch_size = config.AUDIT_INSERT_BATCH_SIZE
         self.ai_service = AIService()
         self.device_service = DeviceService(db)
         
@@ -52,55 +153,85 @@ class CiscoAuditService:
                 r'login block-for',  # Login blocking
             ]
         }
+        self.pattern_matcher = get_pattern_matcher(self.cisco_patterns)
+        self.compliance_engine = ComplianceEngine(db)
+        self.compliance_rules: List[ComplianceRule] = []
+        self.ruleset_version = compute_ruleset_version(self.cisco_patterns, [], AUDIT_LOGIC_VERSION)
     
     async def start_comprehensive_audit(
         self, 
         device_ids: List[str], 
         audit_type: str, 
         user_id: str,
-        audit_options: Optional[Dict[str, Any]] = None
+        audit_options: Optional[Dict[str, Any]] = None,
+        audit_session_id: Optional[str] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
     ) -> Dict[str, Any]:
-        """Start a comprehensive audit of selected devices"""
+        """Start a comprehensive audit of selected devices
+
+        progress_callback is awaited with each device result as it finishes.
+        """
         
-        audit_session_id = str(uuid.uuid4())
+        audit_session_id = audit_session_id or str(uuid.uuid4())
         audit_options = audit_options or {}
+        started_at = datetime.now(timezone.utc)
         
-        # Create operation log
+        # Create operation log; keyed by the session id so status survives the in-memory job
         operation = OperationLog(
+            id=audit_session_id,
             user_id=user_id,
             operation_type=f'audit_{audit_type}',
             status='running',
             command=f'Audit {len(device_ids)} devices',
-            created_at=datetime.now(timezone.utc)
+            created_at=started_at
         )
         self.db.add(operation)
         self.db.commit()
         
         try:
-            # Process devices in parallel for better performance
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                futures = []
-                for device_id in device_ids:
-                    future = executor.submit(
-                        self._audit_single_device,
+            # Load stored compliance rules once; detached so per-device commits don't expire them
+            if audit_type in ('compliance', 'comprehensive'):
+                self.compliance_rules = self.compliance_engine.get_rules(audit_options.get('framework'))
+                for rule in self.compliance_rules:
+                    self.db.expunge(rule)
+            self.ruleset_version = compute_ruleset_version(
+                self.cisco_patterns, self.compliance_rules, AUDIT_LOGIC_VERSION
+            )
+            
+            # Each worker audits with its own session; findings come back here and are bulk inserted
+            loop = asyncio.get_running_loop()
+            workers = max(1, min(self.max_workers, len(device_ids)))
+            results = []
+            pending_rows: List[Dict[str, Any]] = []
+            
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='audit') as executor:
+                futures = [
+                    loop.run_in_executor(
+                        executor, self._audit_single_device,
                         device_id, audit_session_id, audit_type, user_id, audit_options
                     )
-                    futures.append(future)
+                    for device_id in device_ids
+                ]
                 
-                # Wait for all audits to complete
-                results = []
-                for future in futures:
-                    try:
-                        result = future.result(timeout=300)  # 5 minute timeout per device
-                        results.append(result)
-                    except Exception as e:
-                        logger.error(f"Device audit failed: {e}")
-                        results.append({'error': str(e)})
+                for next_result in asyncio.as_completed(futures):
+                    result = await next_result
+                    findings = result.pop('findings', [])
+                    results.append(result)
+                    pending_rows.extend(self._finding_rows(
+                        findings, result['device_id'], audit_session_id, audit_type, user_id
+                    ))
+                    if len(pending_rows) >= self.batch_size:
+                        self._save_findings(pending_rows)
+                        pending_rows = []
+                    if progress_callback:
+                        await progress_callback(result)
+            
+            self._save_findings(pending_rows)
             
             # Update operation status
             operation.status = 'success'
             operation.result = f'Audited {len(results)} devices successfully'
-            operation.execution_time_ms = int((datetime.now(timezone.utc) - operation.created_at).total_seconds() * 1000)
+            operation.execution_time_ms = int((datetime.now(timezone.utc) - started_at).total_seconds() * 1000)
             self.db.commit()
             
             # Generate audit summary
@@ -110,6 +241,8 @@ class CiscoAuditService:
                 'audit_session_id': audit_session_id,
                 'operation_id': operation.id,
                 'devices_audited': len(results),
+                'cached_devices': sum(1 for r in results if r.get('from_cache')),
+                'failed_devices': sum(1 for r in results if r['status'] == 'failed'),
                 'total_findings': summary['total_findings'],
                 'critical_findings': summary['critical_findings'],
                 'estimated_completion_time': 'Completed',
@@ -131,73 +264,127 @@ class CiscoAuditService:
         user_id: str,
         audit_options: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Audit a single device configuration"""
+        """Audit a single device configuration in a worker thread with its own session
+
+        Findings are returned rather than saved so the caller can insert them in batches.
+        """
         
+        db = self.session_factory()
         try:
             # Get device information
-            device = self.db.query(NetworkDevice).filter(NetworkDevice.id == device_id).first()
+            device = db.query(NetworkDevice).filter(NetworkDevice.id == device_id).first()
             if not device:
                 raise Exception(f"Device not found: {device_id}")
             
             # Get current configuration
-            config = self._get_device_configuration(device)
-            if not config:
+            config_text = self._get_device_configuration(device, DeviceService(db))
+            if not config_text:
                 raise Exception(f"Could not retrieve configuration for device: {device.name}")
             
-            # Perform AI-powered analysis
-            ai_analysis = self._analyze_configuration_with_ai(config, device, audit_type)
-            
-            # Perform pattern-based analysis
-            pattern_findings = self._analyze_configuration_patterns(config, device)
-            
-            # Combine findings
-            all_findings = self._combine_findings(ai_analysis, pattern_findings)
-            
-            # Save findings to database
-            for finding in all_findings:
-                audit_result = AuditResult(
-                    audit_session_id=audit_session_id,
-                    device_id=device_id,
-                    user_id=user_id,
-                    audit_type=audit_type,
-                    severity=finding['severity'],
-                    finding_type=finding['type'],
-                    finding_title=finding['title'],
-                    finding_description=finding['description'],
-                    affected_config_section=finding.get('section', 'unknown'),
-                    current_config=finding.get('current_config', ''),
-                    recommended_config=finding.get('recommended_config', ''),
-                    remediation_steps=finding.get('remediation_steps', []),
-                    risk_score=finding.get('risk_score', 0.0),
-                    compliance_framework=finding.get('compliance_framework', ''),
-                    ai_analysis=finding.get('ai_analysis', {}),
-                    created_at=datetime.now(timezone.utc)
-                )
-                self.db.add(audit_result)
+            # Reuse findings from an earlier audit of identical content
+            audit_cache = AuditCache(db)
+            config_hash = compute_config_hash(config_text)
+            model = self.ai_service.active_model
+            cache_key = make_cache_key(config_hash, audit_type, self.ruleset_version, model)
+            use_cache = audit_options.get('use_cache', True)
+            all_findings = audit_cache.get(cache_key) if use_cache else None
+            from_cache = all_findings is not None
+            
+            if not from_cache:
+                parsed = parse_config(config_text, config_hash)
+                
+                # Perform AI-powered analysis
+                ai_analysis, ai_complete = self._analyze_configuration_with_ai(parsed, device, audit_type)
+                
+                # Perform pattern-based analysis on the shared parsed form
+                pattern_findings = self._analyze_configuration_patterns(parsed, device, audit_type)
+                
+                # Evaluate compiled compliance rules
+                if self.compliance_rules:
+                    rule_results = self.compliance_engine.evaluate(parsed, self.compliance_rules)
+                    pattern_findings.extend(self.compliance_engine.rule_findings(rule_results, self.compliance_rules))
+                
+                # Combine findings
+                all_findings = self._combine_findings(ai_analysis, pattern_findings)
+                
+                # Failed AI calls are retried next time rather than cached
+                if ai_complete:
+                    audit_cache.put(cache_key, config_hash, audit_type, self.ruleset_version, model, all_findings)
             
-            self.db.commit()
+            db.commit()
             
             return {
                 'device_id': device_id,
                 'device_name': device.name,
                 'findings_count': len(all_findings),
-                'status': 'completed'
+                'from_cache': from_cache,
+                'status': 'completed',
+                'findings': all_findings
             }
             
         except Exception as e:
             logger.error(f"Single device audit failed for {device_id}: {e}")
+            db.rollback()
             return {
                 'device_id': device_id,
                 'error': str(e),
                 'status': 'failed'
             }
+        finally:
+            db.close()
     
-    def _get_device_configuration(self, device: NetworkDevice) -> Optional[str]:
+    def _finding_rows(
+        self,
+        findings: List[Dict[str, Any]],
+        device_id: str,
+        audit_session_id: str,
+        audit_type: str,
+        user_id: str
+    ) -> List[Dict[str, Any]]:
+        """Convert findings into AuditResult insert mappings"""
+        created_at = datetime.now(timezone.utc)
+        return [
+            {
+                'id': str(uuid.uuid4()),
+                'audit_session_id': audit_session_id,
+                'device_id': device_id,
+                'user_id': user_id,
+                'audit_type': audit_type,
+                'severity': finding['severity'],
+                'finding_type': finding['type'],
+                'finding_title': finding['title'],
+                'finding_description': finding['description'],
+                'affected_config_section': finding.get('section', 'unknown'),
+                'current_config': finding.get('current_config', ''),
+                'recommended_config': finding.get('recommended_config', ''),
+                'remediation_steps': finding.get('remediation_steps', []),
+                'risk_score': finding.get('risk_score', 0.0),
+                'compliance_framework': finding.get('compliance_framework', ''),
+                'ai_analysis': finding.get('ai_analysis', {}),
+                'status': 'open',
+                'created_at': created_at
+            }
+            for finding in findings
+        ]
+    
+    def _save_findings(self, rows: List[Dict[str, Any]]):
+        """Insert a batch of findings in one statement"""
+        if not rows:
+            return
+        try:
+            self.db.bulk_insert_mappings(AuditResult, rows)
+            self.db.commit()
+        except Exception as e:
+            logger.error(f"Failed to save {len(rows)} audit findings: {e}")
+            self.db.rollback()
+            raise
+    
+    def _get_device_configuration(self, device: NetworkDevice, device_service: Optional[DeviceService] = None) -> Optional[str]:
         """Retrieve current device configuration"""
         
         try:
             # Try to get fresh configuration via SSH
-            config = self.device_service.get_device_config(device.id)
+            config = (device_service or self.device_service).get_device_config(device.id)
             if config:
                 return config
             
@@ -214,123 +401,121 @@ class CiscoAuditService:
             return device.config_backup if device.config_backup else None
     
     def _analyze_configuration_with_ai(
+        self, 
+        parsed: ParsedConfig, 
+        device: NetworkDevice, 
+        audit_type: str
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Use AI to analyze the whole device configuration
+        
+        The config is split into section-aligned chunks that are analyzed
+        concurrently. Returns the merged findings and whether every chunk
+        was analyzed successfully.
+        """
+        
+        chunks = chunk_config(parsed, config.AUDIT_AI_CHUNK_TOKENS)
+        if not chunks:
+            return [], True
+        
+        futures = []
+        for chunk in chunks:
+            chunk_text = chunk.text
+            if len(chunks) > 1:
+                chunk_text = f"! Part {chunk.index + 1} of {len(chunks)}; other sections are reviewed separately\n{chunk_text}"
+            futures.append(_llm_executor.submit(self._analyze_chunk_with_ai, chunk_text, device, audit_type))
+        
+        chunk_findings = [future.result() for future in futures]
+        failed = sum(1 for findings in chunk_findings if findings is None)
+        if failed:
+            logger.warning(f"AI analysis failed for {failed}/{len(chunks)} config chunks of {device.name}")
+        
+        return self._merge_chunk_findings([f for f in chunk_findings if f]), not failed
+    
+    def _analyze_chunk_with_ai(
         self, 
         config: str, 
         device: NetworkDevice, 
         audit_type: str
-    ) -> List[Dict[str, Any]]:
-        """Use AI to analyze device configuration"""
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Analyze one configuration chunk, returning None if the analysis failed"""
         
         try:
             # Prepare AI prompt based on audit type
-            if audit_type == 'security':
-                prompt = self._get_security_audit_prompt(config, device)
-            elif audit_type == 'compliance':
-                prompt = self._get_compliance_audit_prompt(config, device)
-            elif audit_type == 'performance':
-                prompt = self._get_performance_audit_prompt(config, device)
-            else:  # comprehensive
-                prompt = self._get_comprehensive_audit_prompt(config, device)
-            
-            # Get AI analysis
-            ai_response = self.ai_service.get_configuration_analysis(prompt)
+            if audit_type not in AUDIT_INSTRUCTIONS:
+                audit_type = 'comprehensive'
+            prompt = self._get_audit_prompt(config, device, audit_type)
+            
+            # Get AI analysis; raises when no provider answers
+            ai_response = self.ai_service.analyze_configuration(prompt, AUDIT_INSTRUCTIONS[audit_type])
             
             # Parse AI response into structured findings
             findings = self._parse_ai_audit_response(ai_response, device)
             
             return findings
             
+        except LLMUnavailableError as e:
+            logger.warning(f"AI configuration analysis unavailable: {e}")
+            return None
         except Exception as e:
             logger.error(f"AI configuration analysis failed: {e}")
-            return []
+            return None
     
-    def _get_comprehensive_audit_prompt(self, config: str, device: NetworkDevice) -> str:
-        """Generate comprehensive audit prompt for AI"""
+    def _merge_chunk_findings(self, chunk_findings: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Merge findings from config chunks, keeping the riskiest copy of each duplicate"""
         
-        return f"""
-        Analyze the following Cisco {device.model} configuration for a comprehensive audit.
-        Device: {device.name} ({device.ip_address})
-        
-        Please analyze for:
-        1. Security vulnerabilities and misconfigurations
-        2. Performance optimization opportunities
-        3. Best practice violations
-        4. Compliance issues (PCI-DSS, SOX, NIST)
-        5. Configuration drift from industry standards
-        6. Potential reliability issues
-        
-        Configuration:
-        ```
-        {config[:8000]}  # Limit to avoid token limits
-        ```
-        
-        For each finding, provide:
-        - Severity level (critical, high, medium, low, info)
-        - Finding type and title
-        - Detailed description
-        - Current problematic configuration
-        - Recommended configuration fix
-        - Step-by-step remediation
-        - Risk score (0-10)
-        - Compliance framework if applicable
-        
-        Format the response as JSON with an array of findings.
-        """
+        merged: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for findings in chunk_findings:
+            for finding in findings:
+                key = (finding.get('type', ''), ' '.join(finding.get('title', '').lower().split()))
+                current = merged.get(key)
+                if current is None:
+                    merged[key] = finding
+                elif finding.get('risk_score', 0.0) > current.get('risk_score', 0.0):
+                    merged[key] = finding
+        return list(merged.values())
     
-    def _get_security_audit_prompt(self, config: str, device: NetworkDevice) -> str:
-        """Generate security-focused audit prompt"""
+    def _get_audit_prompt(self, config: str, device: NetworkDevice, audit_type: str) -> str:
+        """Per-device part of an audit request; the instructions are in AUDIT_INSTRUCTIONS"""
         
-        return f"""
-        Perform a security audit on this Cisco {device.model} configuration.
+        return f"""Audit the following Cisco {device.model} configuration ({audit_type} audit).
         Device: {device.name} ({device.ip_address})
         
-        Focus on identifying:
-        1. Weak or default passwords
-        2. Unencrypted protocols
-        3. Missing access controls
-        4. Insecure service configurations
-        5. Authentication vulnerabilities
-        6. Authorization bypass risks
-        7. Logging and monitoring gaps
-        
         Configuration:
         ```
-        {config[:8000]}
-        ```
-        
-        Provide detailed security findings with remediation steps.
-        Format as JSON array of security findings.
-        """
+        {config}
+        ```"""
     
     def _analyze_configuration_patterns(
         self, 
-        config: str, 
-        device: NetworkDevice
+        parsed: ParsedConfig, 
+        device: NetworkDevice,
+        audit_type: str = 'comprehensive'
     ) -> List[Dict[str, Any]]:
         """Analyze configuration using predefined patterns"""
         
         findings = []
         
+        # Evaluate every pattern category in one pass over the config
+        report = self.pattern_matcher.scan(parsed)
+        
         # Check for security issues
-        for pattern in self.cisco_patterns['security_issues']:
-            matches = re.findall(pattern, config, re.IGNORECASE)
-            if matches:
-                findings.append({
-                    'severity': 'high',
-                    'type': 'security_vulnerability',
-                    'title': f'Security Issue: {pattern}',
-                    'description': f'Found security vulnerability pattern: {pattern}',
-                    'section': 'security',
-                    'current_config': '\n'.join(matches),
-                    'risk_score': 7.0,
-                    'remediation_steps': [f'Remove or fix: {pattern}']
-                })
+        for pattern, matches in report.found('security_issues').items():
+            sections = {m.section for m in matches if m.section}
+            line_numbers = ', '.join(str(m.line_number) for m in matches)
+            findings.append({
+                'severity': 'high',
+                'type': 'security_vulnerability',
+                'title': f'Security Issue: {pattern}',
+                'description': f'Found security vulnerability pattern: {pattern} (line {line_numbers})',
+                'section': ', '.join(sorted(sections))[:100] if sections else 'security',
+                'current_config': '\n'.join(m.matched for m in matches),
+                'line_numbers': [m.line_number for m in matches],
+                'risk_score': 7.0,
+                'remediation_steps': [f'Remove or fix: {pattern}']
+            })
         
         # Check for missing best practices
-        missing_practices = []
-        for pattern in self.cisco_patterns['best_practices']:
-            if not re.search(pattern, config, re.IGNORECASE):
-                missing_practices.append(pattern)
+        missing_practices = report.missing('best_practices', self.cisco_patterns['best_practices'])
         
         if missing_practices:
             findings.append({
@@ -344,6 +529,22 @@ class CiscoAuditService:
                 'remediation_steps': [f'Add configuration: {practice}' for practice in missing_practices]
             })
         
+        # Check for missing PCI controls on compliance audits
+        missing_controls = report.missing('compliance_pci', self.cisco_patterns['compliance_pci'])
+        
+        if audit_type == 'compliance' and missing_controls:
+            findings.append({
+                'severity': 'medium',
+                'type': 'compliance_violation',
+                'title': 'Missing PCI-DSS Controls',
+                'description': f'Missing required configurations: {", ".join(missing_controls)}',
+                'section': 'compliance',
+                'recommended_config': '\n'.join(missing_controls),
+                'risk_score': 5.0,
+                'compliance_framework': 'pci-dss',
+                'remediation_steps': [f'Add configuration: {control}' for control in missing_controls]
+            })
+        
         return findings
     
     def _combine_findings(
@@ -441,34 +642,40 @@ class CiscoAuditService:
             return []
     
     def _generate_audit_summary(self, audit_session_id: str) -> Dict[str, Any]:
-        """Generate summary statistics for an audit session"""
+        """Generate summary statistics for an audit session with GROUP BY queries"""
         
         try:
-            # Get all findings for this audit session
-            findings = self.db.query(AuditResult).filter(
-                AuditResult.audit_session_id == audit_session_id
-            ).all()
-            
-            total_findings = len(findings)
-            severity_counts = {}
-            type_counts = {}
-            device_counts = {}
+            in_session = AuditResult.audit_session_id == audit_session_id
             
-            for finding in findings:
-                # Count by severity
-                severity = finding.severity
-                severity_counts[severity] = severity_counts.get(severity, 0) + 1
-                
-                # Count by type
-                finding_type = finding.finding_type
-                type_counts[finding_type] = type_counts.get(finding_type, 0) + 1
-                
-                # Count by device
-                device_name = finding.device.name if finding.device else 'Unknown'
-                device_counts[device_name] = device_counts.get(device_name, 0) + 1
+            severity_counts = dict(
+                self.db.query(AuditResult.severity, func.count(AuditResult.id))
+                .filter(in_session)
+                .group_by(AuditResult.severity)
+                .all()
+            )
+            
+            type_counts = dict(
+                self.db.query(AuditResult.finding_type, func.count(AuditResult.id))
+                .filter(in_session)
+                .group_by(AuditResult.finding_type)
+                .all()
+            )
+            
+            device_counts = {}
+            device_rows = (
+                self.db.query(NetworkDevice.name, func.count(AuditResult.id))
+                .select_from(AuditResult)
+                .outerjoin(NetworkDevice, NetworkDevice.id == AuditResult.device_id)
+                .filter(in_session)
+                .group_by(AuditResult.device_id, NetworkDevice.name)
+                .all()
+            )
+            for device_name, count in device_rows:
+                device_name = device_name or 'Unknown'
+                device_counts[device_name] = device_counts.get(device_name, 0) + count
             
             return {
-                'total_findings': total_findings,
+                'total_findings': sum(severity_counts.values()),
                 'critical_findings': severity_counts.get('critical', 0),
                 'high_findings': severity_counts.get('high', 0),
                 'medium_findings': severity_counts.get('medium', 0),
@@ -491,34 +698,60 @@ class CiscoAuditService:
         self, 
         audit_session_id: str, 
         severity_filter: Optional[str] = None,
-        device_filter: Optional[str] = None
+        device_filter: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_summary: bool = True
     ) -> Dict[str, Any]:
-        """Get detailed audit results with optional filtering"""
+        """Get detailed audit results with optional filtering
+        
+        Findings are ordered by severity, then risk score. Pass the returned
+        next_cursor back as cursor to page through large sessions without OFFSET.
+        """
         
         try:
-            query = self.db.query(AuditResult).filter(
-                AuditResult.audit_session_id == audit_session_id
-            )
+            severity_rank = case(SEVERITY_ORDER, value=AuditResult.severity, else_=len(SEVERITY_ORDER))
+            risk_score = func.coalesce(AuditResult.risk_score, 0.0)
             
-            # Apply filters
+            filters = [AuditResult.audit_session_id == audit_session_id]
             if severity_filter:
-                query = query.filter(AuditResult.severity == severity_filter)
-            
+                filters.append(AuditResult.severity == severity_filter)
             if device_filter:
-                query = query.filter(AuditResult.device_id == device_filter)
+                filters.append(AuditResult.device_id == device_filter)
+            
+            query = (
+                self.db.query(AuditResult, NetworkDevice.name, NetworkDevice.ip_address)
+                .outerjoin(NetworkDevice, NetworkDevice.id == AuditResult.device_id)
+                .filter(*filters)
+            )
             
-            findings = query.order_by(
-                AuditResult.severity.desc(),
-                AuditResult.risk_score.desc()
-            ).all()
+            if cursor:
+                last_rank, last_risk, last_id = decode_results_cursor(cursor)
+                query = query.filter(or_(
+                    severity_rank > last_rank,
+                    and_(severity_rank == last_rank, risk_score < last_risk),
+                    and_(severity_rank == last_rank, risk_score == last_risk, AuditResult.id > last_id)
+                ))
+            elif offset:
+                query = query.offset(offset)
+            
+            query = query.order_by(severity_rank, risk_score.desc(), AuditResult.id)
+            if limit:
+                # One extra row tells whether another page exists
+                query = query.limit(limit + 1)
+            rows = query.all()
+            
+            has_more = bool(limit) and len(rows) > limit
+            rows = rows[:limit] if limit else rows
             
             # Convert to dictionaries
             results = []
-            for finding in findings:
+            for finding, device_name, device_ip in rows:
                 result = {
                     'id': finding.id,
-                    'device_name': finding.device.name if finding.device else 'Unknown',
-                    'device_ip': finding.device.ip_address if finding.device else '',
+                    'device_name': device_name or 'Unknown',
+                    'device_ip': device_ip or '',
                     'severity': finding.severity,
                     'finding_type': finding.finding_type,
                     'title': finding.finding_title,
@@ -535,15 +768,28 @@ class CiscoAuditService:
                 }
                 results.append(result)
             
-            summary = self._generate_audit_summary(audit_session_id)
+            next_cursor = None
+            if has_more:
+                last = rows[-1][0]
+                next_cursor = encode_results_cursor(
+                    SEVERITY_ORDER.get(last.severity, len(SEVERITY_ORDER)), last.risk_score or 0.0, last.id
+                )
+            
+            if not limit and not offset and not cursor:
+                total_count = len(results)
+            else:
+                total_count = self.db.query(func.count(AuditResult.id)).filter(*filters).scalar()
             
             return {
                 'audit_session_id': audit_session_id,
-                'summary': summary,
+                'summary': self._generate_audit_summary(audit_session_id) if include_summary else None,
                 'findings': results,
-                'total_count': len(results)
+                'total_count': total_count,
+                'next_cursor': next_cursor
             }
             
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Failed to get audit results: {e}")
             raise Exception(f"Failed to retrieve audit results: {str(e)}")
@@ -553,59 +799,18 @@ class CiscoAuditService:
         audit_session_id: str, 
         export_format: str = 'json'
     ) -> Dict[str, Any]:
-        """Export audit results in various formats"""
+        """Describe an export of audit results; the content is streamed by AuditExporter"""
         
-        try:
-            results = self.get_audit_results(audit_session_id)
-            
-            if export_format.lower() == 'json':
-                return {
-                    'format': 'json',
-                    'data': results,
-                    'filename': f'audit_results_{audit_session_id}.json'
-                }
-            elif export_format.lower() == 'csv':
-                # Convert to CSV format
-                csv_data = self._convert_to_csv(results['findings'])
-                return {
-                    'format': 'csv',
-                    'data': csv_data,
-                    'filename': f'audit_results_{audit_session_id}.csv'
-                }
-            else:
-                raise Exception(f"Unsupported export format: {export_format}")
-                
-        except Exception as e:
-            logger.error(f"Export failed: {e}")
-            raise
-    
-    def _convert_to_csv(self, findings: List[Dict[str, Any]]) -> str:
-        """Convert findings to CSV format"""
-        
-        import csv
-        import io
-        
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow([
-            'Device Name', 'Device IP', 'Severity', 'Finding Type', 'Title',
-            'Description', 'Risk Score', 'Status', 'Created At'
-        ])
-        
-        # Write data
-        for finding in findings:
-            writer.writerow([
-                finding.get('device_name', ''),
-                finding.get('device_ip', ''),
-                finding.get('severity', ''),
-                finding.get('finding_type', ''),
-                finding.get('title', ''),
-                finding.get('description', '')[:200],  # Limit description length
-                finding.get('risk_score', 0),
-                finding.get('status', ''),
-                finding.get('created_at', '')
-            ])
-        
-        return output.getvalue()
+        export_format = export_format.lower()
+        AuditExporter.check_format(export_format)
+        
+        total_findings = self.db.query(func.count(AuditResult.id)).filter(
+            AuditResult.audit_session_id == audit_session_id
+        ).scalar()
+        
+        return {
+            'format': export_format,
+            'media_type': EXPORT_FORMATS[export_format],
+            'filename': export_filename(audit_session_id, export_format),
+            'total_findings': total_findings
+        }
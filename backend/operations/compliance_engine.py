@@ -0,0 +1,340 @@
+"""
+Compliance Rule Engine
+Compiles ComplianceRule.rule_logic into Python predicates once and
+evaluates rule packs against parsed device configurations without the LLM
+
+Rule logic is a JSON tree of nodes:
+    {"type": "must_contain", "pattern": "service password-encryption"}
+    {"type": "must_not_contain", "pattern": "^ip http server"}
+    {"type": "value", "pattern": "exec-timeout (\\d+)", "op": "<=", "value": 10}
+    {"type": "section", "section": "^line vty", "rule": {...}, "quantifier": "all"}
+    {"all": [...]}, {"any": [...]}, {"not": {...}}
+Patterns are case-insensitive regular expressions matched per config line.
+"""
+import logging
+import operator
+import re
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.database.models import AuditResult, ComplianceRule, NetworkDevice
+from backend.network.config_parser import ConfigLine, ParsedConfig, parse_config
+
+logger = logging.getLogger(__name__)
+
+COMPARISONS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+SEVERITY_RISK_SCORES = {'critical': 9.0, 'high': 7.0, 'medium': 5.0, 'low': 2.0, 'info': 1.0}
+
+
+class RuleCompileError(ValueError):
+    """Raised when rule_logic is not a valid rule program"""
+
+
+class RuleScope:
+    """Lines a rule node is evaluated against: a whole config or one section's body"""
+
+    __slots__ = ('roots', '_lines')
+
+    def __init__(self, roots: List[ConfigLine], lines: Optional[List[ConfigLine]] = None):
+        self.roots = roots
+        self._lines = lines
+
+    @property
+    def lines(self) -> List[ConfigLine]:
+        if self._lines is None:
+            lines = []
+            for root in self.roots:
+                lines.append(root)
+                lines.extend(root.iter_descendants())
+            self._lines = lines
+        return self._lines
+
+
+# A compiled node returns (passed, evidence lines)
+Predicate = Callable[[RuleScope], Tuple[bool, List[ConfigLine]]]
+
+
+def _compile_regex(node: Dict[str, Any], key: str) -> 're.Pattern':
+    pattern = node.get(key)
+    if not isinstance(pattern, str) or not pattern:
+        raise RuleCompileError(f"'{key}' is required for {node.get('type')} rules")
+    try:
+        return re.compile(pattern, re.IGNORECASE)
+    except re.error as e:
+        raise RuleCompileError(f"Invalid pattern {pattern!r}: {e}")
+
+
+def compile_rule_logic(node: Dict[str, Any]) -> Predicate:
+    """Compile one rule_logic node (recursively) into a predicate"""
+    if not isinstance(node, dict):
+        raise RuleCompileError(f"Rule node must be an object, got {type(node).__name__}")
+
+    if 'all' in node or 'any' in node:
+        combinator = 'all' if 'all' in node else 'any'
+        children = [compile_rule_logic(child) for child in node[combinator]]
+        if not children:
+            raise RuleCompileError(f"'{combinator}' needs at least one rule")
+
+        def combined(scope: RuleScope):
+            outcomes = [child(scope) for child in children]
+            if combinator == 'all':
+                passed = all(ok for ok, _ in outcomes)
+                evidence = [line for ok, lines in outcomes if not ok for line in lines]
+            else:
+                passed = any(ok for ok, _ in outcomes)
+                evidence = [] if passed else [line for _, lines in outcomes for line in lines]
+            return passed, evidence
+        return combined
+
+    if 'not' in node:
+        inner = compile_rule_logic(node['not'])
+
+        def negated(scope: RuleScope):
+            passed, evidence = inner(scope)
+            return not passed, evidence
+        return negated
+
+    rule_type = node.get('type')
+
+    if rule_type == 'must_contain':
+        regex = _compile_regex(node, 'pattern')
+
+        def must_contain(scope: RuleScope):
+            matched = [line for line in scope.lines if regex.search(line.text)]
+            return bool(matched), matched
+        return must_contain
+
+    if rule_type == 'must_not_contain':
+        regex = _compile_regex(node, 'pattern')
+
+        def must_not_contain(scope: RuleScope):
+            matched = [line for line in scope.lines if regex.search(line.text)]
+            return not matched, matched
+        return must_not_contain
+
+    if rule_type == 'value':
+        regex = _compile_regex(node, 'pattern')
+        if regex.groups < 1:
+            raise RuleCompileError("'value' patterns need a capture group")
+        compare = COMPARISONS.get(node.get('op'))
+        if compare is None:
+            raise RuleCompileError(f"Unknown comparison: {node.get('op')}")
+        try:
+            expected = float(node['value'])
+        except (KeyError, TypeError, ValueError):
+            raise RuleCompileError("'value' rules need a numeric 'value'")
+        pass_if_missing = node.get('missing', 'fail') == 'pass'
+
+        def value(scope: RuleScope):
+            found, failing = False, []
+            for line in scope.lines:
+                hit = regex.search(line.text)
+                if not hit:
+                    continue
+                found = True
+                try:
+                    if not compare(float(hit.group(1)), expected):
+                        failing.append(line)
+                except (TypeError, ValueError):
+                    failing.append(line)
+            if not found:
+                return pass_if_missing, []
+            return not failing, failing
+        return value
+
+    if rule_type == 'section':
+        header = _compile_regex(node, 'section')
+        inner = compile_rule_logic(node.get('rule') or {})
+        quantifier = node.get('quantifier', 'all')
+        if quantifier not in ('all', 'any'):
+            raise RuleCompileError(f"Unknown quantifier: {quantifier}")
+        required = bool(node.get('required', False))
+
+        def section(scope: RuleScope):
+            sections = [root for root in scope.roots if header.search(root.text)]
+            if not sections:
+                return not required, []
+            failing = [s for s in sections if not inner(RuleScope(s.children))[0]]
+            if quantifier == 'all':
+                return not failing, failing
+            return len(failing) < len(sections), failing if len(failing) == len(sections) else []
+        return section
+
+    raise RuleCompileError(f"Unknown rule type: {rule_type}")
+
+
+class CompiledRuleCache:
+    """Compiled predicates keyed by rule id and invalidated by updated_at"""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Any, Predicate]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, rule: ComplianceRule) -> Predicate:
+        with self._lock:
+            entry = self._entries.get(rule.id)
+            if entry is not None and entry[0] == rule.updated_at:
+                return entry[1]
+
+        program = compile_rule_logic(rule.rule_logic)
+        with self._lock:
+            self._entries[rule.id] = (rule.updated_at, program)
+        return program
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Global compiled rule cache
+compiled_rule_cache = CompiledRuleCache()
+
+
+class ComplianceEngine:
+    """Evaluates stored compliance rule packs against device configurations"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_rules(self, framework: Optional[str] = None, category: Optional[str] = None) -> List[ComplianceRule]:
+        query = self.db.query(ComplianceRule).filter(ComplianceRule.is_active == True)
+        if framework:
+            query = query.filter(ComplianceRule.framework == framework)
+        if category:
+            query = query.filter(ComplianceRule.category == category)
+        return query.order_by(ComplianceRule.rule_name).all()
+
+    def evaluate(self, parsed: ParsedConfig, rules: List[ComplianceRule]) -> List[Dict[str, Any]]:
+        """Evaluate rules against one parsed configuration"""
+        scope = RuleScope(parsed.roots, parsed.lines)
+        results = []
+        for rule in rules:
+            try:
+                passed, evidence = compiled_rule_cache.get(rule)(scope)
+                results.append({
+                    'rule_id': rule.id,
+                    'rule_name': rule.rule_name,
+                    'status': 'passed' if passed else 'failed',
+                    'evidence': [{'line_number': line.line_number, 'text': line.text} for line in evidence]
+                })
+            except RuleCompileError as e:
+                logger.error(f"Invalid rule_logic for compliance rule {rule.id}: {e}")
+                results.append({'rule_id': rule.id, 'rule_name': rule.rule_name, 'status': 'error', 'error': str(e), 'evidence': []})
+        return results
+
+    def rule_findings(self, results: List[Dict[str, Any]], rules: List[ComplianceRule]) -> List[Dict[str, Any]]:
+        """Failed rules in the finding format used by the audit service"""
+        rules_by_id = {rule.id: rule for rule in rules}
+        findings = []
+        for result in results:
+            if result['status'] != 'failed':
+                continue
+            rule = rules_by_id[result['rule_id']]
+            evidence = result['evidence']
+            findings.append({
+                'severity': rule.severity or 'medium',
+                'type': 'compliance_violation',
+                'title': f'{rule.framework.upper()}: {rule.rule_name}',
+                'description': rule.description,
+                'section': rule.category,
+                'current_config': '\n'.join(e['text'] for e in evidence),
+                'line_numbers': [e['line_number'] for e in evidence],
+                'risk_score': SEVERITY_RISK_SCORES.get(rule.severity, 5.0),
+                'compliance_framework': rule.framework,
+                'remediation_steps': [rule.remediation_guidance] if rule.remediation_guidance else []
+            })
+        return findings
+
+    def evaluate_devices(
+        self,
+        device_ids: Optional[List[str]] = None,
+        framework: Optional[str] = None,
+        user_id: Optional[str] = None,
+        save_results: bool = False
+    ) -> Dict[str, Any]:
+        """Run a rule pack across many devices, optionally recording failures as audit results"""
+        from backend.devices.service import DeviceService
+
+        rules = self.get_rules(framework)
+        device_service = DeviceService(self.db)
+        query = self.db.query(NetworkDevice.id, NetworkDevice.name)
+        if device_ids:
+            query = query.filter(NetworkDevice.id.in_(device_ids))
+        devices = query.all()
+
+        audit_session_id = str(uuid.uuid4())
+        created_at = datetime.now(timezone.utc)
+        device_results = []
+        audit_rows = []
+
+        for device in devices:
+            config_text = device_service.get_device_config(device.id)
+            if not config_text:
+                device_results.append({'device_id': device.id, 'device_name': device.name, 'status': 'no_config'})
+                continue
+
+            parsed = parse_config(config_text)
+            results = self.evaluate(parsed, rules)
+            failed = [r for r in results if r['status'] == 'failed']
+            device_results.append({
+                'device_id': device.id,
+                'device_name': device.name,
+                'status': 'compliant' if not failed else 'non_compliant',
+                'passed': sum(1 for r in results if r['status'] == 'passed'),
+                'failed': len(failed),
+                'results': results
+            })
+
+            if save_results and user_id:
+                audit_rows.extend(
+                    dict(
+                        id=str(uuid.uuid4()),
+                        audit_session_id=audit_session_id,
+                        device_id=device.id,
+                        user_id=user_id,
+                        audit_type='compliance',
+                        severity=finding['severity'],
+                        finding_type=finding['type'],
+                        finding_title=finding['title'],
+                        finding_description=finding['description'],
+                        affected_config_section=finding['section'],
+                        current_config=finding['current_config'],
+                        remediation_steps=finding['remediation_steps'],
+                        risk_score=finding['risk_score'],
+                        compliance_framework=finding['compliance_framework'],
+                        ai_analysis={},
+                        created_at=created_at
+                    )
+                    for finding in self.rule_findings(results, rules)
+                )
+
+        if audit_rows:
+            try:
+                self.db.bulk_insert_mappings(AuditResult, audit_rows)
+                self.db.commit()
+            except Exception as e:
+                logger.error(f"Error saving compliance results: {e}")
+                self.db.rollback()
+                raise
+
+        non_compliant = sum(1 for r in device_results if r['status'] == 'non_compliant')
+        logger.info(f"Compliance run of {len(rules)} rules on {len(devices)} devices: {non_compliant} non-compliant")
+        return {
+            'audit_session_id': audit_session_id if audit_rows else None,
+            'rules_evaluated': len(rules),
+            'devices_evaluated': len(devices),
+            'non_compliant_devices': non_compliant,
+            'devices': device_results
+        }
@@ -0,0 +1,136 @@
+"""
+Configuration Drift Service
+Compares device configurations against a baseline and records the
+differences as ConfigurationDrift rows
+"""
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.database.models import BaselineConfig, ConfigurationDrift, NetworkDevice
+from backend.devices.config_store import ConfigStore, compute_config_hash
+from backend.network.config_diff import CHANGE_ADDED, CHANGE_REMOVED, SectionChange
+
+logger = logging.getLogger(__name__)
+
+# Section header prefixes whose drift is treated as high / medium risk
+HIGH_RISK_SECTIONS = (
+    'aaa ', 'access-list', 'ip access-list', 'username', 'enable ', 'snmp-server',
+    'line vty', 'line con', 'crypto', 'ip ssh', 'service password-encryption', 'ip http'
+)
+MEDIUM_RISK_SECTIONS = ('router ', 'interface ', 'ip route', 'ntp ', 'logging', 'vlan', 'spanning-tree')
+
+# Baseline perspective: lines missing from the device are deletions
+DRIFT_TYPES = {
+    CHANGE_ADDED: 'addition',
+    CHANGE_REMOVED: 'deletion',
+}
+
+
+def assess_risk(section: str) -> str:
+    """Classify a drifted section by what it configures"""
+    if section.startswith(HIGH_RISK_SECTIONS):
+        return 'high'
+    if section.startswith(MEDIUM_RISK_SECTIONS):
+        return 'medium'
+    return 'low'
+
+
+def _describe(change: SectionChange) -> str:
+    if change.change_type == CHANGE_ADDED:
+        return f"Section not in baseline ({len(change.added_lines)} child lines)"
+    if change.change_type == CHANGE_REMOVED:
+        return f"Baseline section missing from device ({len(change.removed_lines)} child lines)"
+    return f"{len(change.added_lines)} lines added, {len(change.removed_lines)} lines removed"
+
+
+class DriftService:
+    """Detects configuration drift using the cached config diff engine"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.config_store = ConfigStore(db)
+
+    def detect_baseline_drift(self, baseline_id: str, device_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Diff each device's latest config against a baseline and replace its open drift records"""
+        baseline = self.db.query(BaselineConfig).filter(BaselineConfig.id == baseline_id).first()
+        if not baseline:
+            raise ValueError("Baseline not found")
+
+        query = self.db.query(NetworkDevice)
+        if device_ids:
+            query = query.filter(NetworkDevice.id.in_(device_ids))
+        elif baseline.device_model:
+            query = query.filter(NetworkDevice.model == baseline.device_model)
+        devices = query.all()
+
+        baseline_hash = compute_config_hash(baseline.config_template)
+        detected_at = datetime.now(timezone.utc)
+        results = []
+
+        try:
+            for device in devices:
+                latest = self.config_store.get_latest_version(device.id)
+                if latest:
+                    current_hash, current_text = latest.content_hash, None
+                elif device.config_backup:
+                    current_hash, current_text = compute_config_hash(device.config_backup), device.config_backup
+                else:
+                    results.append({'device_id': device.id, 'device_name': device.name, 'status': 'no_config'})
+                    continue
+
+                change_set = self.config_store.get_change_set(
+                    baseline_hash, current_hash,
+                    old_text=baseline.config_template, new_text=current_text
+                )
+                if change_set is None:
+                    # The stored version's content is missing; keep its open drift as is
+                    logger.warning(f"Stored configuration {current_hash[:12]} of {device.name} could not be loaded")
+                    results.append({'device_id': device.id, 'device_name': device.name, 'status': 'no_config'})
+                    continue
+
+                # Only unresolved drift is replaced; acknowledged history is kept
+                self.db.query(ConfigurationDrift).filter(
+                    ConfigurationDrift.device_id == device.id,
+                    ConfigurationDrift.baseline_id == baseline_id,
+                    ConfigurationDrift.resolved_at.is_(None)
+                ).delete(synchronize_session=False)
+
+                self.db.add_all([
+                    ConfigurationDrift(
+                        device_id=device.id,
+                        baseline_id=baseline_id,
+                        drift_type=DRIFT_TYPES.get(change.change_type, 'modification'),
+                        config_section=change.section[:100],
+                        original_config='\n'.join(change.removed_lines),
+                        current_config='\n'.join(change.added_lines),
+                        drift_description=_describe(change),
+                        risk_level=assess_risk(change.section),
+                        detected_at=detected_at
+                    )
+                    for change in change_set.changes
+                ])
+
+                results.append({
+                    'device_id': device.id,
+                    'device_name': device.name,
+                    'status': 'drifted' if change_set.changes else 'compliant',
+                    'summary': change_set.summary()
+                })
+
+            self.db.commit()
+        except Exception as e:
+            logger.error(f"Error detecting drift for baseline {baseline_id}: {e}")
+            self.db.rollback()
+            raise
+
+        drifted = sum(1 for r in results if r['status'] == 'drifted')
+        logger.info(f"Drift detection for baseline {baseline_id}: {drifted}/{len(results)} devices drifted")
+        return {
+            'baseline_id': baseline_id,
+            'devices_checked': len(results),
+            'devices_drifted': drifted,
+            'results': results
+        }
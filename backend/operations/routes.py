@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
@@ -10,7 +11,12 @@ import json
 from backend.database.database import get_db
 from backend.operations.service import OperationService
 from backend.operations.cisco_audit_service import CiscoAuditService
-from backend.database.models import OperationLog, NetworkDevice, AuditResult
+from backend.operations.audit_jobs import audit_job_manager
+from backend.operations.audit_export import EXPORT_FORMATS, AuditExporter, export_filename
+from backend.operations.drift_service import DriftService
+from backend.operations.compliance_engine import ComplianceEngine, RuleCompileError, compile_rule_logic
+from backend.network.config_parser import parse_config
+from backend.database.models import OperationLog, NetworkDevice, AuditResult, ComplianceRule
 from backend.websocket_manager import connection_manager, command_executor
 
 router = APIRouter()
@@ -27,6 +33,20 @@ class TroubleshootRequest(BaseModel):
     affected_devices: List[str]
     symptoms: List[str] = []
 
+class ComplianceRuleRequest(BaseModel):
+    rule_name: str
+    framework: str  # pci-dss, sox, nist, cis
+    category: str
+    description: str
+    rule_logic: Dict[str, Any]
+    severity: str = "medium"
+    remediation_guidance: Optional[str] = None
+
+class ComplianceRunRequest(BaseModel):
+    device_ids: Optional[List[str]] = None
+    framework: Optional[str] = None
+    save_results: bool = True
+
 class BaselineRequest(BaseModel):
     name: str
     description: Optional[str] = ""
@@ -178,13 +198,12 @@ async def start_audit(
                 detail="One or more devices not found"
             )
         
-        audit_service = CiscoAuditService(db)
-        
         # For now, use a default user_id - in production this would come from authentication
         user_id = "admin-user-id"  # TODO: Get from current_user when auth is implemented
         
-        # Start audit asynchronously
-        result = await audit_service.start_comprehensive_audit(
+        # Run the audit in the background; progress is pushed to 'audit' websocket subscribers
+        job = audit_job_manager.submit(
+            audit_session_id=str(uuid.uuid4()),
             device_ids=audit_request.device_ids,
             audit_type=audit_request.audit_type,
             user_id=user_id,
@@ -194,10 +213,10 @@ async def start_audit(
         return {
             "status": "success",
             "message": "Audit started successfully",
-            "audit_session_id": result["audit_session_id"],
-            "operation_id": result["operation_id"],
-            "devices_audited": result["devices_audited"],
-            "estimated_completion_time": result["estimated_completion_time"]
+            "audit_session_id": job.audit_session_id,
+            "job_status": job.status,
+            "total_devices": len(job.device_ids),
+            "status_url": f"/api/v1/operations/audit/{job.audit_session_id}/status"
         }
         
     except HTTPException:
@@ -208,57 +227,77 @@ async def start_audit(
 @router.get("/audit/{audit_id}/status")
 async def get_audit_status(
     audit_id: str,
+    include_devices: bool = Query(False),
     db: Session = Depends(get_db)
 ):
     """Get real-time audit progress"""
+    job = audit_job_manager.get_job(audit_id)
+    if job:
+        return job.to_dict(include_devices=include_devices)
+    
     try:
-        # Get audit results count
+        # Jobs are kept in memory; older sessions are reported from their operation log
+        operation = db.query(OperationLog).filter(
+            OperationLog.id == audit_id,
+            OperationLog.operation_type.like('audit_%')
+        ).first()
+        if operation is None:
+            raise HTTPException(status_code=404, detail="Audit session not found")
         findings_count = db.query(AuditResult).filter(
             AuditResult.audit_session_id == audit_id
         ).count()
-        
-        # Check if audit is complete (simplified check)
-        operation = db.query(OperationLog).filter(
-            OperationLog.operation_type.like("audit_%")
-        ).order_by(OperationLog.created_at.desc()).first()
-        
-        status = "completed" if operation and operation.status == "success" else "running"
-        
-        return {
-            "audit_session_id": audit_id,
-            "status": status,
-            "progress_percentage": 100 if status == "completed" else 75,
-            "findings_count": findings_count,
-            "current_device": "Analysis complete" if status == "completed" else "Processing..."
-        }
-        
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    status = 'completed' if operation.status == 'success' else operation.status
+    return {
+        "audit_session_id": audit_id,
+        "status": status,
+        "progress_percentage": 100 if status in ('completed', 'failed') else None,
+        "findings_count": findings_count,
+        "current_device": None,
+        "error": operation.error_message
+    }
 
 @router.get("/audit/{audit_id}/results")
 async def get_audit_results(
     audit_id: str,
     severity_filter: Optional[str] = Query(None),
     device_filter: Optional[str] = Query(None),
+    limit: int = Query(1000, ge=1, le=5000),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
+    include_summary: bool = Query(True),
     db: Session = Depends(get_db)
 ):
-    """Get detailed audit results"""
+    """Get detailed audit results, one page at a time
+    
+    Follow next_cursor for keyset pagination; offset is kept for simple paging.
+    """
     try:
         audit_service = CiscoAuditService(db)
         results = audit_service.get_audit_results(
             audit_session_id=audit_id,
             severity_filter=severity_filter,
-            device_filter=device_filter
+            device_filter=device_filter,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            include_summary=include_summary
         )
         return results
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/audit/{audit_id}/export")
 async def export_audit_results(
     audit_id: str,
-    export_format: str = Query("json", regex="^(json|csv)$"),
+    export_format: str = Query("json", regex="^(json|csv|ndjson|parquet)$"),
     db: Session = Depends(get_db)
 ):
     """Export audit results to various formats"""
@@ -273,12 +312,34 @@ async def export_audit_results(
             "status": "success",
             "format": export_data["format"],
             "filename": export_data["filename"],
+            "total_findings": export_data["total_findings"],
             "download_url": f"/api/operations/audit/{audit_id}/download/{export_data['filename']}"
         }
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/audit/{audit_id}/download/{filename}")
+async def download_audit_results(audit_id: str, filename: str):
+    """Stream an audit export; the format is taken from the file extension"""
+    export_format = filename.rsplit(".", 1)[-1].lower()
+    if filename != export_filename(audit_id, export_format):
+        raise HTTPException(status_code=404, detail="Export not found")
+    
+    try:
+        # The exporter opens its own session, which outlives this request handler
+        content = AuditExporter().stream(audit_id, export_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 # GENAI Operations - Troubleshooting Endpoints
 @router.post("/troubleshoot/start")
 async def start_troubleshooting(
@@ -300,7 +361,8 @@ async def start_troubleshooting(
         }
         
         # Get AI analysis
-        analysis_result = ai_service.analyze_troubleshooting_scenario(scenario_data)
+        # Blocking client call; run it off the event loop
+        analysis_result = await asyncio.to_thread(ai_service.analyze_troubleshooting_scenario, scenario_data)
         
         # Create troubleshooting session record
         from backend.database.models import TroubleshootingSession
@@ -391,16 +453,20 @@ async def create_baseline(
         
         # Generate AI-powered baseline recommendations
         ai_service = AIService()
-        recommendations = ai_service.generate_baseline_recommendations(devices_data)
+        recommendations = await asyncio.to_thread(ai_service.generate_baseline_recommendations, devices_data)
         
         # Create baseline configuration
+        config_template = recommendations.get("recommendations", "")
         baseline = BaselineConfig(
             name=baseline_request.name,
             description=baseline_request.description,
             baseline_type=baseline_request.baseline_type,
             environment=baseline_request.environment,
-            config_template=recommendations.get("recommendations", ""),
-            config_sections={"ai_generated": True},
+            config_template=config_template,
+            config_sections={
+                "ai_generated": True,
+                "sections": [section.text for section in parse_config(config_template).roots]
+            },
             user_id="admin-user-id",  # TODO: Get from current_user
             created_at=datetime.now(timezone.utc)
         )
@@ -483,6 +549,52 @@ async def get_baseline_drift(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/baseline/{baseline_id}/drift/detect")
+async def detect_baseline_drift(
+    baseline_id: str,
+    device_ids: Optional[List[str]] = None,
+    db: Session = Depends(get_db)
+):
+    """Diff device configurations against a baseline and record the drift"""
+    try:
+        return DriftService(db).detect_baseline_drift(baseline_id, device_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/compliance/rules")
+async def create_compliance_rule(rule_request: ComplianceRuleRequest, db: Session = Depends(get_db)):
+    """Create a compliance rule after checking that its logic compiles"""
+    try:
+        compile_rule_logic(rule_request.rule_logic)
+    except RuleCompileError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid rule_logic: {e}")
+    
+    try:
+        rule = ComplianceRule(**rule_request.dict())
+        db.add(rule)
+        db.commit()
+        db.refresh(rule)
+        return {"status": "success", "rule_id": rule.id}
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/compliance/run")
+async def run_compliance_rules(run_request: ComplianceRunRequest, db: Session = Depends(get_db)):
+    """Evaluate stored compliance rules against device configurations without the LLM"""
+    try:
+        engine = ComplianceEngine(db)
+        return engine.evaluate_devices(
+            device_ids=run_request.device_ids,
+            framework=run_request.framework,
+            user_id="admin-user-id",  # TODO: Get from current_user
+            save_results=run_request.save_results
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # WebSocket endpoint for real-time updates
 @router.websocket("/ws/operations")
 async def websocket_endpoint(websocket: WebSocket):
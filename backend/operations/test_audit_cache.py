@@ -0,0 +1,122 @@
+"""
+Simple tests to verify audits of unchanged configs are replayed from the cache
+"""
+import asyncio
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.database.models import AuditCacheEntry, AuditResult, Base, NetworkDevice
+from backend.devices.config_store import ConfigStore
+from backend.ai.ai_service import AIService
+from backend.operations.cisco_audit_service import CiscoAuditService
+
+CONFIG = """hostname R15
+enable password cisco
+ip ssh version 2
+"""
+
+
+class FakeAIService:
+    active_model = 'openai:test-model'
+
+    def __init__(self, response='[{"severity": "high", "title": "Weak enable password"}]', error=None):
+        self.response = response
+        self.error = error
+        self.calls = 0
+
+    def analyze_configuration(self, prompt, instructions=None):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+def make_service(ai_service, tmp_path):
+    # File-backed so worker sessions see the same database
+    engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    device = NetworkDevice(name='R15', ip_address='10.0.0.15', model='ISR4331')
+    db.add(device)
+    db.flush()
+    ConfigStore(db).save_config(device.id, CONFIG)
+    db.commit()
+
+    service = CiscoAuditService(db, session_factory=session_factory)
+    service.ai_service = ai_service
+    return service, db, device
+
+
+def test_second_audit_replays_cached_findings(tmp_path):
+    """Test that an unchanged config skips the LLM and copies findings into the new session"""
+    ai_service = FakeAIService()
+    service, db, device = make_service(ai_service, tmp_path)
+
+    first = asyncio.run(service.start_comprehensive_audit([device.id], 'security', 'user-1'))
+    second = asyncio.run(service.start_comprehensive_audit([device.id], 'security', 'user-1'))
+
+    first_saved = db.query(AuditResult).filter(AuditResult.audit_session_id == first['audit_session_id']).count()
+    second_saved = db.query(AuditResult).filter(AuditResult.audit_session_id == second['audit_session_id']).count()
+    assert ai_service.calls == 1
+    assert (first['cached_devices'], second['cached_devices']) == (0, 1)
+    assert second['total_findings'] == first['total_findings'] == second_saved == first_saved > 0
+    assert db.query(AuditCacheEntry).one().hit_count == 1
+
+
+def test_cache_key_includes_audit_type_and_model(tmp_path):
+    """Test that a different audit type or model is analyzed afresh"""
+    ai_service = FakeAIService()
+    service, db, device = make_service(ai_service, tmp_path)
+
+    service._audit_single_device(device.id, 'session-1', 'security', 'user-1', {})
+    service._audit_single_device(device.id, 'session-2', 'performance', 'user-1', {})
+    ai_service.active_model = 'anthropic:test-model'
+    service._audit_single_device(device.id, 'session-3', 'security', 'user-1', {})
+
+    assert ai_service.calls == 3
+
+
+def test_failed_ai_analysis_is_not_cached(tmp_path):
+    """Test that LLM errors are retried on the next audit"""
+    ai_service = FakeAIService(error=TimeoutError('timeout'))
+    service, db, device = make_service(ai_service, tmp_path)
+
+    service._audit_single_device(device.id, 'session-1', 'security', 'user-1', {})
+    result = service._audit_single_device(device.id, 'session-2', 'security', 'user-1', {})
+
+    assert ai_service.calls == 2
+    assert not result['from_cache']
+    assert db.query(AuditCacheEntry).count() == 0
+
+
+def test_unavailable_provider_is_not_cached(tmp_path):
+    """Test that an audit with no configured LLM provider records no AI finding and is not cached"""
+    service, db, device = make_service(AIService(configure_clients=False), tmp_path)
+
+    result = service._audit_single_device(device.id, 'session-1', 'security', 'user-1', {})
+
+    assert not any(f.get('title') == 'AI Configuration Analysis' for f in result['findings'])
+    assert db.query(AuditCacheEntry).count() == 0
+
+
+def test_parallel_audit_uses_worker_sessions_and_batches_inserts(tmp_path):
+    """Test that many devices are audited concurrently and findings are saved in batches"""
+    ai_service = FakeAIService()
+    service, db, device = make_service(ai_service, tmp_path)
+    device_ids = [device.id]
+    for i in range(5):
+        other = NetworkDevice(name=f'R{i}', ip_address=f'10.0.1.{i}', model='ISR4331')
+        db.add(other)
+        db.flush()
+        ConfigStore(db).save_config(other.id, CONFIG.replace('R15', f'R{i}'))
+        device_ids.append(other.id)
+    db.commit()
+    service.batch_size = 2
+
+    result = asyncio.run(service.start_comprehensive_audit(device_ids, 'security', 'user-1'))
+
+    assert (result['devices_audited'], result['failed_devices']) == (6, 0)
+    saved = db.query(AuditResult).filter(AuditResult.audit_session_id == result['audit_session_id']).count()
+    assert ai_service.calls == 6
+    assert saved == result['total_findings'] > 0
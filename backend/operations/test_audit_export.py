@@ -0,0 +1,90 @@
+"""
+Simple tests to verify audit exports are streamed in every format
+"""
+import csv
+import io
+import json
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.database.models import AuditResult, Base, NetworkDevice
+from backend.operations.audit_export import COLUMN_NAMES, AuditExporter
+
+
+def make_exporter(tmp_path, findings=25, batch_size=10):
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    device = NetworkDevice(name='R1', ip_address='10.0.4.1', model='ISR4331')
+    db.add(device)
+    db.flush()
+    db.bulk_insert_mappings(AuditResult, [
+        dict(
+            id=str(uuid.uuid4()),
+            audit_session_id='session-1',
+            device_id=device.id,
+            user_id='user-1',
+            audit_type='security',
+            severity='high',
+            finding_type='security_vulnerability',
+            finding_title=f'Finding {i}',
+            finding_description='Line one, "quoted"\nline two',
+            remediation_steps=['step 1', 'step 2'],
+            risk_score=7.0
+        )
+        for i in range(findings)
+    ])
+    db.commit()
+    db.close()
+    return AuditExporter(session_factory=session_factory, batch_size=batch_size)
+
+
+def test_csv_export_is_written_per_batch(tmp_path):
+    """Test that CSV rows arrive in one chunk per batch and round-trip"""
+    exporter = make_exporter(tmp_path)
+
+    chunks = list(exporter.stream('session-1', 'csv'))
+    rows = list(csv.reader(io.StringIO(b''.join(chunks).decode('utf-8'))))
+
+    assert len(chunks) == 3
+    assert rows[0] == COLUMN_NAMES
+    assert len(rows) == 26
+    record = dict(zip(COLUMN_NAMES, rows[1]))
+    assert record['device_name'] == 'R1'
+    assert record['description'] == 'Line one, "quoted"\nline two'
+    assert json.loads(record['remediation_steps']) == ['step 1', 'step 2']
+
+
+def test_json_and_ndjson_exports(tmp_path):
+    """Test that JSON is one valid document and NDJSON one finding per line"""
+    exporter = make_exporter(tmp_path)
+
+    document = json.loads(b''.join(exporter.stream('session-1', 'json')))
+    lines = b''.join(exporter.stream('session-1', 'ndjson')).decode('utf-8').splitlines()
+
+    assert document['audit_session_id'] == 'session-1'
+    assert len(document['findings']) == len(lines) == 25
+    assert json.loads(lines[0])['device_ip'] == '10.0.4.1'
+    assert json.loads(b''.join(exporter.stream('session-2', 'json'))) == {'audit_session_id': 'session-2', 'findings': []}
+
+
+def test_parquet_export(tmp_path):
+    """Test that the Parquet export reads back with every finding"""
+    pq = pytest.importorskip('pyarrow.parquet')
+    exporter = make_exporter(tmp_path)
+
+    table = pq.read_table(io.BytesIO(b''.join(exporter.stream('session-1', 'parquet'))))
+
+    assert table.num_rows == 25
+    assert table.column_names == COLUMN_NAMES
+    assert set(table.column('risk_score').to_pylist()) == {7.0}
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    exporter = make_exporter(tmp_path, findings=1)
+
+    with pytest.raises(ValueError):
+        exporter.stream('session-1', 'xlsx')
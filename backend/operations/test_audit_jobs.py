@@ -0,0 +1,132 @@
+"""
+Simple tests to verify background audit jobs report per-device progress
+"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.database.models import AuditResult, Base, NetworkDevice
+from backend.devices.config_store import ConfigStore
+from backend.operations import audit_jobs, cisco_audit_service, routes
+from backend.operations.audit_jobs import AuditJobManager
+
+CONFIG = """hostname {name}
+enable password cisco
+ip http server
+"""
+
+
+class FakeAIService:
+    active_model = 'openai:test-model'
+
+    def analyze_configuration(self, prompt, instructions=None):
+        return '[{"severity": "high", "title": "Weak enable password"}]'
+
+
+def make_session_factory(tmp_path, device_count=3):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    device_ids = []
+    for i in range(device_count):
+        device = NetworkDevice(name=f'R{i}', ip_address=f'10.0.2.{i}', model='ISR4331')
+        db.add(device)
+        db.flush()
+        ConfigStore(db).save_config(device.id, CONFIG.format(name=device.name))
+        device_ids.append(device.id)
+    db.commit()
+    db.close()
+    return session_factory, device_ids
+
+
+def test_audit_job_returns_immediately_and_tracks_progress(tmp_path, monkeypatch):
+    """Test that submit does not wait for the audit and progress reaches every device"""
+    session_factory, device_ids = make_session_factory(tmp_path)
+    updates = []
+
+    async def record_update(**update):
+        updates.append(update)
+
+    monkeypatch.setattr(audit_jobs.connection_manager, 'send_operation_update', record_update)
+    monkeypatch.setattr(cisco_audit_service, 'AIService', FakeAIService)
+
+    async def run():
+        manager = AuditJobManager(session_factory=session_factory)
+        job = manager.submit('session-1', device_ids + ['missing-device'], 'security', 'user-1')
+        assert job.status == 'queued' and job.completed == 0
+        await job.wait()
+        return manager, job
+
+    manager, job = asyncio.run(run())
+
+    status = job.to_dict(include_devices=True)
+    assert manager.get_job('session-1') is job
+    assert (status['status'], status['progress_percentage']) == ('completed', 100)
+    assert (status['devices_completed'], status['devices_failed']) == (4, 1)
+    assert status['devices']['missing-device']['status'] == 'failed'
+    assert status['operation_id']
+
+    db = session_factory()
+    assert db.query(AuditResult).filter(AuditResult.audit_session_id == 'session-1').count() == job.findings_count > 0
+
+    progress = [u['progress'] for u in updates]
+    assert all(u['operation_type'] == 'audit' and u['operation_id'] == 'session-1' for u in updates)
+    assert progress == sorted(progress) and progress[-1] == 100
+    assert len(updates) == len(device_ids) + 3
+
+
+def test_jobs_beyond_the_limit_wait_for_a_slot(tmp_path, monkeypatch):
+    """Test that only max_concurrent_jobs audits run at once"""
+    session_factory, device_ids = make_session_factory(tmp_path, device_count=1)
+    running = []
+
+    async def record_update(**update):
+        if update['message'].startswith('Auditing'):
+            running.append(sum(1 for job in manager.list_jobs() if job.status == 'running'))
+
+    monkeypatch.setattr(audit_jobs.connection_manager, 'send_operation_update', record_update)
+    monkeypatch.setattr(cisco_audit_service, 'AIService', FakeAIService)
+    manager = None
+
+    async def run():
+        nonlocal manager
+        manager = AuditJobManager(max_concurrent_jobs=1, session_factory=session_factory)
+        jobs = [manager.submit(f'session-{i}', device_ids, 'security', 'user-1') for i in range(3)]
+        await asyncio.gather(*(job.wait() for job in jobs))
+        return jobs
+
+    jobs = asyncio.run(run())
+
+    assert all(job.status == 'completed' for job in jobs)
+    assert running == [1, 1, 1]
+
+
+def test_finished_audit_status_survives_the_job(tmp_path, monkeypatch):
+    """Test that a finished audit with no findings is still reported once its job is gone"""
+    session_factory, device_ids = make_session_factory(tmp_path, device_count=1)
+
+    async def ignore_update(**update):
+        pass
+
+    monkeypatch.setattr(audit_jobs.connection_manager, 'send_operation_update', ignore_update)
+    monkeypatch.setattr(cisco_audit_service, 'AIService', FakeAIService)
+
+    async def run():
+        job = AuditJobManager(session_factory=session_factory).submit('session-1', device_ids, 'security', 'user-1')
+        await job.wait()
+
+    asyncio.run(run())
+    db = session_factory()
+    db.query(AuditResult).delete()
+    db.commit()
+    monkeypatch.setattr(routes, 'audit_job_manager', AuditJobManager(session_factory=session_factory))
+
+    status = asyncio.run(routes.get_audit_status('session-1', include_devices=False, db=db))
+    assert (status['status'], status['progress_percentage'], status['findings_count']) == ('completed', 100, 0)
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(routes.get_audit_status('unknown-session', include_devices=False, db=db))
+    assert exc.value.status_code == 404
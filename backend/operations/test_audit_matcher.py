@@ -0,0 +1,56 @@
+"""
+Simple tests to verify the single-pass audit pattern matcher
+"""
+from backend.network.config_parser import ParsedConfig
+from backend.operations.audit_matcher import PatternMatcher, get_pattern_matcher, required_literal
+
+PATTERNS = {
+    'security_issues': [r'enable password \w+', r'username \w+ password \w+', r'ip http server'],
+    'best_practices': [r'service password-encryption', r'ip ssh version 2', r'ntp server'],
+    'compliance_pci': [r'access-list \d+ (permit|deny)', r'login block-for'],
+}
+
+CONFIG = """hostname R15
+enable password cisco
+username admin password admin123
+no ip http server
+ip ssh version 2
+access-list 10 permit 10.0.0.0 0.0.0.255
+line vty 0 4
+ password weak
+ login
+"""
+
+
+def test_required_literal_skips_optional_parts():
+    """Test the prefilter literal for common pattern shapes"""
+    assert required_literal(r'enable password \w+') == 'enable password '
+    assert required_literal(r'access-list \d+ (permit|deny)') == 'access-list '
+    assert required_literal(r'[Ss]ervice timestamps?') == 'ervice timestamp'
+    assert required_literal(r'ip address \d{1,3}') == 'ip address '
+    assert required_literal(r'permit|deny') == ''
+
+
+def test_scan_reports_line_numbers_and_missing_patterns():
+    """Test that one scan covers every category"""
+    report = PatternMatcher(PATTERNS).scan(ParsedConfig(CONFIG))
+
+    assert [m.line_number for m in report.get('security_issues', r'enable password \w+')] == [2]
+    assert report.get('security_issues', r'ip http server')[0].text == 'no ip http server'
+    assert report.missing('best_practices', PATTERNS['best_practices']) == [
+        'service password-encryption', 'ntp server'
+    ]
+    assert report.missing('compliance_pci', PATTERNS['compliance_pci']) == ['login block-for']
+
+
+def test_unanchored_patterns_are_checked_on_every_line():
+    """Test that patterns without a literal still match, with their section"""
+    report = PatternMatcher({'custom': [r'^(password|secret) \w+']}).scan(ParsedConfig(CONFIG))
+
+    match = report.get('custom', r'^(password|secret) \w+')[0]
+    assert (match.line_number, match.section) == (8, 'line vty 0 4')
+
+
+def test_matchers_are_compiled_once_per_pattern_set():
+    """Test that identical pattern sets share a compiled matcher"""
+    assert get_pattern_matcher(PATTERNS) is get_pattern_matcher({k: list(v) for k, v in PATTERNS.items()})
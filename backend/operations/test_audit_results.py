@@ -0,0 +1,85 @@
+"""
+Simple tests to verify audit summaries and paginated results are computed in SQL
+"""
+import uuid
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from backend.database.models import AuditResult, Base, NetworkDevice
+from backend.operations.cisco_audit_service import CiscoAuditService
+
+SEVERITIES = ['low', 'critical', 'medium', 'high', 'info']
+
+
+def make_service(findings_per_device=10):
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    devices = [NetworkDevice(name=f'R{i}', ip_address=f'10.0.3.{i}', model='ISR4331') for i in range(3)]
+    db.add_all(devices)
+    db.flush()
+    rows = [
+        dict(
+            id=str(uuid.uuid4()),
+            audit_session_id='session-1',
+            device_id=device.id,
+            user_id='user-1',
+            audit_type='security',
+            severity=SEVERITIES[i % len(SEVERITIES)],
+            finding_type='security_vulnerability' if i % 2 else 'best_practice',
+            finding_title=f'Finding {i}',
+            finding_description='',
+            risk_score=float(i % 4)
+        )
+        for device in devices
+        for i in range(findings_per_device)
+    ]
+    db.bulk_insert_mappings(AuditResult, rows)
+    db.commit()
+
+    statements = []
+    event.listen(engine, 'before_cursor_execute', lambda conn, cursor, statement, *args: statements.append(statement))
+    return CiscoAuditService(db), statements
+
+
+def test_summary_uses_grouped_queries():
+    """Test that summary counts match and don't depend on the number of findings"""
+    service, statements = make_service()
+
+    summary = service._generate_audit_summary('session-1')
+
+    assert summary['total_findings'] == 30
+    assert summary['critical_findings'] == 6
+    assert summary['finding_types'] == {'security_vulnerability': 15, 'best_practice': 15}
+    assert summary['device_distribution'] == {'R0': 10, 'R1': 10, 'R2': 10}
+    assert len(statements) == 3
+
+
+def test_results_join_device_names_in_one_query():
+    """Test that device names are loaded with the findings rather than per row"""
+    service, statements = make_service()
+
+    results = service.get_audit_results('session-1', include_summary=False)
+
+    assert results['total_count'] == 30
+    assert {f['device_name'] for f in results['findings']} == {'R0', 'R1', 'R2'}
+    assert len(statements) == 1
+
+
+def test_keyset_pages_cover_every_finding_in_severity_order():
+    """Test that following next_cursor returns each finding once, most severe first"""
+    service, _ = make_service()
+
+    seen, cursor = [], None
+    while True:
+        page = service.get_audit_results('session-1', limit=7, cursor=cursor, include_summary=False)
+        seen.extend(page['findings'])
+        assert page['total_count'] == 30
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+
+    order = ['critical', 'high', 'medium', 'low', 'info']
+    keys = [(order.index(f['severity']), -f['risk_score']) for f in seen]
+    assert len(seen) == len({f['id'] for f in seen}) == 30
+    assert keys == sorted(keys)
@@ -0,0 +1,75 @@
+"""
+Simple tests to verify large configs are audited in full across AI chunks
+"""
+import threading
+import time
+
+from backend.database.models import NetworkDevice
+from backend.network.config_parser import ParsedConfig
+from backend.operations import cisco_audit_service
+from backend.operations.cisco_audit_service import CiscoAuditService
+
+
+class RecordingAIService:
+    active_model = 'openai:test-model'
+
+    def __init__(self, fail_on=None):
+        self.prompts = []
+        self.fail_on = fail_on
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def analyze_configuration(self, prompt, instructions=None):
+        with self._lock:
+            self.prompts.append(prompt)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.01)
+        with self._lock:
+            self.active -= 1
+        if self.fail_on and self.fail_on in prompt:
+            raise TimeoutError('timeout')
+        return '[{"severity": "medium", "type": "best_practice", "title": "Missing  interface description"}]'
+
+
+def make_service(ai_service, monkeypatch, chunk_tokens=300):
+    monkeypatch.setattr(cisco_audit_service.config, 'AUDIT_AI_CHUNK_TOKENS', chunk_tokens)
+    service = CiscoAuditService(db=None)
+    service.ai_service = ai_service
+    return service
+
+
+def large_config():
+    lines = ['hostname CORE1']
+    for i in range(120):
+        lines.extend([f'interface GigabitEthernet0/{i}', f' ip address 10.0.{i}.1 255.255.255.0'])
+    lines.append('snmp-server community LAST-LINE RO')
+    return '\n'.join(lines)
+
+
+def test_whole_config_is_analyzed_and_findings_deduplicated(monkeypatch):
+    """Test that no part of a large config is truncated and repeated findings merge"""
+    ai_service = RecordingAIService()
+    service = make_service(ai_service, monkeypatch)
+    device = NetworkDevice(name='CORE1', ip_address='10.0.0.1', model='ASR1001')
+
+    findings, complete = service._analyze_configuration_with_ai(ParsedConfig(large_config()), device, 'security')
+
+    assert complete
+    assert len(ai_service.prompts) > 1
+    assert any('snmp-server community LAST-LINE RO' in prompt for prompt in ai_service.prompts)
+    assert len(findings) == 1
+    assert ai_service.peak <= cisco_audit_service.config.AUDIT_AI_MAX_CONCURRENCY
+
+
+def test_failed_chunk_marks_analysis_incomplete(monkeypatch):
+    """Test that findings of good chunks are kept but the analysis is not complete"""
+    ai_service = RecordingAIService(fail_on='LAST-LINE')
+    service = make_service(ai_service, monkeypatch)
+    device = NetworkDevice(name='CORE1', ip_address='10.0.0.1', model='ASR1001')
+
+    findings, complete = service._analyze_configuration_with_ai(ParsedConfig(large_config()), device, 'security')
+
+    assert not complete
+    assert len(findings) == 1
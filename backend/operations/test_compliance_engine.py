@@ -0,0 +1,94 @@
+"""
+Simple tests to verify compliance rule compilation and evaluation
+"""
+from datetime import datetime, timezone
+import pytest
+from backend.database.models import ComplianceRule
+from backend.network.config_parser import ParsedConfig
+from backend.operations.compliance_engine import (
+    ComplianceEngine, CompiledRuleCache, RuleCompileError, RuleScope, compile_rule_logic
+)
+
+CONFIG = """hostname R15
+service password-encryption
+ip http server
+line con 0
+ exec-timeout 5 0
+line vty 0 4
+ exec-timeout 30 0
+ transport input ssh telnet
+"""
+
+
+def evaluate(logic):
+    parsed = ParsedConfig(CONFIG)
+    return compile_rule_logic(logic)(RuleScope(parsed.roots, parsed.lines))
+
+
+def make_rule(logic, rule_id='rule-1'):
+    return ComplianceRule(
+        id=rule_id, rule_name='No HTTP server', framework='cis', category='services',
+        description='Disable the HTTP server', rule_logic=logic, severity='high',
+        updated_at=datetime(2026, 1, 1, tzinfo=timezone.utc)
+    )
+
+
+def test_contains_rules():
+    """Test must_contain and must_not_contain with evidence lines"""
+    assert evaluate({'type': 'must_contain', 'pattern': '^service password-encryption'})[0]
+    passed, evidence = evaluate({'type': 'must_not_contain', 'pattern': '^ip http server'})
+    assert not passed
+    assert [line.line_number for line in evidence] == [3]
+
+
+def test_section_scoped_numeric_rule():
+    """Test a per-section numeric comparison reports the failing section"""
+    passed, evidence = evaluate({
+        'type': 'section', 'section': '^line (con|vty)',
+        'rule': {'type': 'value', 'pattern': r'exec-timeout (\d+)', 'op': '<=', 'value': 10}
+    })
+
+    assert not passed
+    assert [line.text for line in evidence] == ['line vty 0 4']
+
+
+def test_combinators():
+    """Test all/any/not nodes"""
+    assert evaluate({'any': [
+        {'type': 'must_contain', 'pattern': 'ntp server'},
+        {'type': 'must_contain', 'pattern': 'hostname'}
+    ]})[0]
+    assert not evaluate({'not': {'section': '^line vty', 'type': 'section',
+                                 'rule': {'type': 'must_contain', 'pattern': 'transport input ssh'}}})[0]
+
+
+def test_invalid_logic_is_rejected():
+    """Test that malformed rules fail at compile time"""
+    with pytest.raises(RuleCompileError):
+        compile_rule_logic({'type': 'value', 'pattern': 'exec-timeout', 'op': '<=', 'value': 10})
+    with pytest.raises(RuleCompileError):
+        compile_rule_logic({'type': 'unknown'})
+
+
+def test_compiled_rules_are_cached_until_updated():
+    """Test that the cache recompiles only when updated_at changes"""
+    cache = CompiledRuleCache()
+    rule = make_rule({'type': 'must_not_contain', 'pattern': '^ip http server'})
+
+    first = cache.get(rule)
+    assert cache.get(rule) is first
+
+    rule.updated_at = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    assert cache.get(rule) is not first
+
+
+def test_failed_rules_become_findings():
+    """Test conversion of failed rules into audit findings"""
+    engine = ComplianceEngine(db=None)
+    rules = [make_rule({'type': 'must_not_contain', 'pattern': '^ip http server'})]
+
+    findings = engine.rule_findings(engine.evaluate(ParsedConfig(CONFIG), rules), rules)
+
+    assert findings[0]['title'] == 'CIS: No HTTP server'
+    assert findings[0]['line_numbers'] == [3]
+    assert findings[0]['risk_score'] == 7.0
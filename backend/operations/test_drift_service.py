@@ -0,0 +1,83 @@
+"""
+Simple tests to verify drift detection against a baseline
+"""
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.database.models import (
+    Base, BaselineConfig, ConfigBlob, ConfigurationDrift, ConfigDiff, NetworkDevice, User
+)
+from backend.devices.config_store import ConfigStore
+from backend.network.config_diff import change_set_cache
+from backend.operations.drift_service import DriftService
+
+BASELINE = """hostname BASE
+service password-encryption
+interface GigabitEthernet0/0
+ no ip http server
+"""
+
+DEVICE_CONFIG = """hostname BASE
+interface GigabitEthernet0/0
+ no ip http server
+ description uplink
+"""
+
+
+def make_session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    user = User(email='ops@example.com', password_hash='x')
+    device = NetworkDevice(name='R15', ip_address='10.0.0.15', model='ISR4331')
+    db.add_all([user, device])
+    db.flush()
+    baseline = BaselineConfig(name='golden', baseline_type='golden', config_template=BASELINE, user_id=user.id)
+    db.add(baseline)
+    ConfigStore(db).save_config(device.id, DEVICE_CONFIG)
+    db.commit()
+    change_set_cache.clear()
+    return db, baseline, device
+
+
+def test_drift_rows_are_recorded_per_section():
+    """Test that missing and modified sections become drift records"""
+    db, baseline, device = make_session()
+
+    result = DriftService(db).detect_baseline_drift(baseline.id)
+
+    assert result['devices_drifted'] == 1
+    drifts = {d.config_section: d for d in db.query(ConfigurationDrift).all()}
+    assert drifts['service password-encryption'].drift_type == 'deletion'
+    assert drifts['service password-encryption'].risk_level == 'high'
+    assert drifts['interface GigabitEthernet0/0'].drift_type == 'modification'
+    assert drifts['interface GigabitEthernet0/0'].current_config == 'description uplink'
+
+
+def test_repeated_detection_reuses_stored_diff_and_replaces_open_drift():
+    """Test that re-running detection does not duplicate drift or diffs"""
+    db, baseline, device = make_session()
+    service = DriftService(db)
+
+    service.detect_baseline_drift(baseline.id)
+    change_set_cache.clear()
+    service.detect_baseline_drift(baseline.id)
+
+    assert db.query(ConfigDiff).count() == 1
+    assert db.query(ConfigurationDrift).count() == 2
+
+
+def test_unloadable_config_does_not_abort_other_devices():
+    """Test that a device whose stored config is missing is reported without failing the run"""
+    db, baseline, device = make_session()
+    broken = NetworkDevice(name='R16', ip_address='10.0.0.16', model='ISR4331')
+    db.add(broken)
+    db.flush()
+    missing_hash = ConfigStore(db).save_config(broken.id, DEVICE_CONFIG.replace('uplink', 'core'))['content_hash']
+    db.query(ConfigBlob).filter(ConfigBlob.content_hash == missing_hash).delete()
+    db.commit()
+
+    result = DriftService(db).detect_baseline_drift(baseline.id)
+
+    statuses = {r['device_name']: r['status'] for r in result['results']}
+    assert statuses == {'R15': 'drifted', 'R16': 'no_config'}
+    assert db.query(ConfigurationDrift).filter(ConfigurationDrift.device_id == device.id).count() == 2
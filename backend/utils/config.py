@@ -37,6 +37,41 @@ class Config:
     DEFAULT_LLM_MODEL = os.getenv("DEFAULT_LLM_MODEL", "gpt-3.5-turbo")
     DEFAULT_TEMPERATURE = float(os.getenv("DEFAULT_TEMPERATURE", "0.7"))
     DEFAULT_MAX_TOKENS = int(os.getenv("DEFAULT_MAX_TOKENS", "2000"))
+    # Defaults for the concurrent_requests / response_timeout core settings
+    LLM_CONCURRENT_REQUESTS = int(os.getenv("LLM_CONCURRENT_REQUESTS", "5"))
+    LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "120"))
+    # Defaults for the cache_* core settings; LLM_CACHE_PATH keeps responses on disk
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "True").lower() == "true"
+    LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "3600"))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "")
+    # Provider failover: circuit breaker and optional p95-based hedging
+    LLM_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    LLM_CIRCUIT_RESET_TIMEOUT = float(os.getenv("LLM_CIRCUIT_RESET_TIMEOUT", "30"))
+    LLM_HEALTH_EWMA_ALPHA = float(os.getenv("LLM_HEALTH_EWMA_ALPHA", "0.2"))
+    LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "False").lower() == "true"
+    LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "2"))
+    # Pooled HTTP transport for HTTP-based providers (OpenRouter)
+    OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+    LLM_HTTP_CONNECT_TIMEOUT = float(os.getenv("LLM_HTTP_CONNECT_TIMEOUT", "10"))
+    LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100"))
+    LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20"))
+    LLM_HTTP_MAX_RETRIES = int(os.getenv("LLM_HTTP_MAX_RETRIES", "3"))
+    LLM_HTTP_BACKOFF_BASE = float(os.getenv("LLM_HTTP_BACKOFF_BASE", "0.5"))
+    # Offline deterministic LLM for load tests and benchmarks (no provider calls)
+    LLM_OFFLINE_MODE = os.getenv("LLM_OFFLINE_MODE", "False").lower() == "true"
+    LLM_OFFLINE_LATENCY = float(os.getenv("LLM_OFFLINE_LATENCY", "0.05"))
+    LLM_OFFLINE_TOKENS_PER_SECOND = float(os.getenv("LLM_OFFLINE_TOKENS_PER_SECOND", "0"))
+    # Provider-side prompt prefix caching (Anthropic cache_control; OpenAI caches automatically)
+    LLM_PROMPT_CACHE_ENABLED = os.getenv("LLM_PROMPT_CACHE_ENABLED", "True").lower() == "true"
+    # Chat history: recent turns kept verbatim within a token budget, older ones summarized
+    CHAT_CONTEXT_TOKEN_BUDGET = int(os.getenv("CHAT_CONTEXT_TOKEN_BUDGET", "4000"))
+    CHAT_SUMMARY_MAX_TOKENS = int(os.getenv("CHAT_SUMMARY_MAX_TOKENS", "400"))
+    CHAT_CONTEXT_MAX_SESSIONS = int(os.getenv("CHAT_CONTEXT_MAX_SESSIONS", "1000"))
+    # Chat system context: per-user device/operation snapshot shown in the system prompt
+    SYSTEM_CONTEXT_CACHE_TTL = int(os.getenv("SYSTEM_CONTEXT_CACHE_TTL", "300"))
+    SYSTEM_CONTEXT_MAX_USERS = int(os.getenv("SYSTEM_CONTEXT_MAX_USERS", "1000"))
+    SYSTEM_CONTEXT_MAX_DEVICES = int(os.getenv("SYSTEM_CONTEXT_MAX_DEVICES", "25"))
     
     # Chat settings
     MAX_CHAT_HISTORY = int(os.getenv("MAX_CHAT_HISTORY", "50"))
@@ -45,6 +80,29 @@ class Config:
     # Device settings
     DEFAULT_POLLING_INTERVAL = int(os.getenv("DEFAULT_POLLING_INTERVAL", "300"))  # 5 minutes
     MAX_CONCURRENT_CONNECTIONS = int(os.getenv("MAX_CONCURRENT_CONNECTIONS", "10"))
+    DEVICE_USERNAME = os.getenv("DEVICE_USERNAME", "admin")
+    DEVICE_PASSWORD = os.getenv("DEVICE_PASSWORD", "admin")
+    
+    # SSH session pool settings
+    SSH_POOL_MAX_PER_DEVICE = int(os.getenv("SSH_POOL_MAX_PER_DEVICE", "2"))
+    SSH_POOL_MAX_TOTAL = int(os.getenv("SSH_POOL_MAX_TOTAL", "100"))
+    SSH_POOL_IDLE_TIMEOUT = int(os.getenv("SSH_POOL_IDLE_TIMEOUT", "300"))  # 5 minutes
+    
+    # Connectivity sweep settings
+    SWEEP_MAX_CONCURRENCY = int(os.getenv("SWEEP_MAX_CONCURRENCY", "200"))
+    SWEEP_PROBE_TIMEOUT = float(os.getenv("SWEEP_PROBE_TIMEOUT", "3"))
+    
+    # Bulk device operation settings
+    BULK_OPERATION_MAX_WORKERS = int(os.getenv("BULK_OPERATION_MAX_WORKERS", "64"))
+    BULK_OPERATION_PARALLELISM = int(os.getenv("BULK_OPERATION_PARALLELISM", "32"))
+    
+    # Configuration audit settings
+    AUDIT_MAX_WORKERS = int(os.getenv("AUDIT_MAX_WORKERS", "16"))
+    AUDIT_INSERT_BATCH_SIZE = int(os.getenv("AUDIT_INSERT_BATCH_SIZE", "500"))
+    AUDIT_MAX_CONCURRENT_JOBS = int(os.getenv("AUDIT_MAX_CONCURRENT_JOBS", "4"))
+    AUDIT_EXPORT_BATCH_SIZE = int(os.getenv("AUDIT_EXPORT_BATCH_SIZE", "1000"))
+    AUDIT_AI_CHUNK_TOKENS = int(os.getenv("AUDIT_AI_CHUNK_TOKENS", "4000"))
+    AUDIT_AI_MAX_CONCURRENCY = int(os.getenv("AUDIT_AI_MAX_CONCURRENCY", "8"))
     
     # Logging settings
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
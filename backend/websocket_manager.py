@@ -22,7 +22,8 @@ class ConnectionManager:
             'audit': set(),
             'troubleshoot': set(),
             'baseline': set(),
-            'command_execution': set()
+            'command_execution': set(),
+            'bulk_operation': set()
         }
 
     async def connect(self, websocket: WebSocket, client_id: str, operation_type: str = None):
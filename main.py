@@ -35,32 +35,66 @@ def startup_event():
     """
     print("Initializing LLM providers...")
     
-    # Configure OpenAI
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    if openai_api_key and openai_api_key != "your_openai_api_key":
-        print("Found OpenAI API key. Configuring provider...")
-        openai_settings = LLMSettings(provider="openai", api_key=openai_api_key, model="gpt-4")
-        llm_manager.add_provider("openai", openai_settings)
+    from backend.utils.config import config
+    if config.LLM_OFFLINE_MODE:
+        # Load testing: only the deterministic local provider, no API calls
+        print("LLM_OFFLINE_MODE is set. Configuring offline provider only.")
+        llm_manager.add_provider("offline", LLMSettings(provider="offline", api_key="", model="offline-deterministic"))
     else:
-        print("OpenAI API key not found or is a placeholder. Skipping.")
-
-    # Configure Groq
-    groq_api_key = os.getenv("GROQ_API_KEY")
-    if groq_api_key and groq_api_key != "your_groq_api_key":
-        print("Found Groq API key. Configuring provider...")
-        groq_settings = LLMSettings(provider="groq", api_key=groq_api_key, model="llama3-70b-8192")
-        llm_manager.add_provider("groq", groq_settings)
-    else:
-        print("Groq API key not found or is a placeholder. Skipping.")
-
-    # Configure OpenRouter
-    openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
-    if openrouter_api_key and openrouter_api_key != "your_openrouter_api_key":
-        print("Found OpenRouter API key. Configuring provider...")
-        openrouter_settings = LLMSettings(provider="openrouter", api_key=openrouter_api_key, model="openai/gpt-4")
-        llm_manager.add_provider("openrouter", openrouter_settings)
-    else:
-        print("OpenRouter API key not found or is a placeholder. Skipping.")
+        # Configure OpenAI
+        openai_api_key = os.getenv("OPENAI_API_KEY")
+        if openai_api_key and openai_api_key != "your_openai_api_key":
+            print("Found OpenAI API key. Configuring provider...")
+            openai_settings = LLMSettings(provider="openai", api_key=openai_api_key, model="gpt-4")
+            llm_manager.add_provider("openai", openai_settings)
+        else:
+            print("OpenAI API key not found or is a placeholder. Skipping.")
+
+        # Configure Groq
+        groq_api_key = os.getenv("GROQ_API_KEY")
+        if groq_api_key and groq_api_key != "your_groq_api_key":
+            print("Found Groq API key. Configuring provider...")
+            groq_settings = LLMSettings(provider="groq", api_key=groq_api_key, model="llama3-70b-8192")
+            llm_manager.add_provider("groq", groq_settings)
+        else:
+            print("Groq API key not found or is a placeholder. Skipping.")
+
+        # Configure OpenRouter
+        openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
+        if openrouter_api_key and openrouter_api_key != "your_openrouter_api_key":
+            print("Found OpenRouter API key. Configuring provider...")
+            openrouter_settings = LLMSettings(provider="openrouter", api_key=openrouter_api_key, model="openai/gpt-4")
+            llm_manager.add_provider("openrouter", openrouter_settings)
+        else:
+            print("OpenRouter API key not found or is a placeholder. Skipping.")
+
+    # Apply stored LLM concurrency, timeout and response cache settings
+    from backend.ai.request_gate import llm_request_gate
+    from backend.ai.response_cache import llm_response_cache
+    from backend.database.connection import SessionLocal
+    from backend.database.models import SystemConfig
+    db = SessionLocal()
+    try:
+        core_settings = db.query(SystemConfig).filter(SystemConfig.config_key == "core_settings").first()
+        if core_settings:
+            llm_request_gate.apply_core_settings(core_settings.config_value)
+            llm_response_cache.apply_core_settings(core_settings.config_value)
+        print(f"LLM request limits: {llm_request_gate.get_stats()}")
+        print(f"LLM response cache: {llm_response_cache.get_stats()}")
+    except Exception as e:
+        print(f"Could not load core settings: {e}")
+    finally:
+        db.close()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    """
+    Closes pooled device SSH sessions and LLM HTTP connections on application shutdown.
+    """
+    from backend.ai.http_client import close_http_clients
+    from backend.devices.ssh_pool import ssh_pool
+    ssh_pool.close_all()
+    close_http_clients()
 
 # Add CORS middleware
 app.add_middleware(
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Offline LLM benchmark
+Measures chat, configuration pipeline and audit analysis throughput against
+the deterministic offline LLM, so no tokens are spent and no network is used.
+Exits non-zero if a path's p95 exceeds --max-p95, for CI regression checks.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+SAMPLE_CONFIG = "\n".join(
+    ["hostname BENCH-R1", "ip http server", "snmp-server community public RO"]
+    + [f"interface GigabitEthernet0/{i}\n description port {i}\n ip address 10.0.{i}.1 255.255.255.0" for i in range(40)]
+    + ["line vty 0 4", " transport input telnet", "end"]
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per path")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="Synthetic time to first token (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=0, help="Synthetic generation rate (0 = instant)")
+    parser.add_argument("--cache", action="store_true", help="Keep the LLM response cache enabled")
+    parser.add_argument("--max-p95", type=float, default=None, help="Fail if any path's p95 latency exceeds this (s)")
+    return parser.parse_args()
+
+
+def report(name, durations, elapsed):
+    durations = sorted(durations)
+    p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+    print(f"{name:<10} {len(durations) / elapsed:8.1f} req/s  p50 {statistics.median(durations) * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms")
+    return p95
+
+
+async def run_async(count, concurrency, make_request):
+    semaphore = asyncio.Semaphore(concurrency)
+    durations = []
+
+    async def one(i):
+        async with semaphore:
+            started = time.monotonic()
+            await make_request(i)
+            durations.append(time.monotonic() - started)
+
+    started = time.monotonic()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return durations, time.monotonic() - started
+
+
+def run_threads(count, concurrency, make_request):
+    def one(i):
+        started = time.monotonic()
+        make_request(i)
+        return time.monotonic() - started
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        durations = list(executor.map(one, range(count)))
+    return durations, time.monotonic() - started
+
+
+def main():
+    args = parse_args()
+    os.environ["LLM_OFFLINE_MODE"] = "true"
+    os.environ["LLM_OFFLINE_LATENCY"] = str(args.latency)
+    os.environ["LLM_OFFLINE_TOKENS_PER_SECOND"] = str(args.tokens_per_second)
+    os.environ["LLM_CACHE_ENABLED"] = "true" if args.cache else "false"
+    os.environ["LLM_CONCURRENT_REQUESTS"] = str(args.concurrency)
+    os.environ.setdefault("DB_URL", "sqlite:///:memory:")
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from backend.ai.ai_service import ai_service
+    from backend.database.models import Base
+    from backend.network.config_parser import parse_config
+    from backend.network_automation.pipeline import NetworkAutomationPipeline
+    from backend.operations.cisco_audit_service import CiscoAuditService
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    print(f"Model: {ai_service.active_model}, {args.requests} requests per path, concurrency {args.concurrency}")
+
+    results = {}
+
+    durations, elapsed = asyncio.run(run_async(
+        args.requests, args.concurrency,
+        lambda i: ai_service.get_response_async(f"Why is OSPF down on R{i}?", f"bench-{i}", "bench", db)
+    ))
+    results["chat"] = report("chat", durations, elapsed)
+
+    pipeline = NetworkAutomationPipeline(db)
+    durations, elapsed = asyncio.run(run_async(
+        args.requests, args.concurrency,
+        lambda i: pipeline.execute_config_generation_pipeline(f"VLAN {i} with SVI", "ios", "bench")
+    ))
+    results["pipeline"] = report("pipeline", durations, elapsed)
+
+    audit_service = CiscoAuditService(db)
+    device = SimpleNamespace(name="BENCH-R1", model="ISR4431", ip_address="10.0.0.1")
+    durations, elapsed = run_threads(
+        args.requests, args.concurrency,
+        lambda i: audit_service._analyze_configuration_with_ai(
+            parse_config(f"{SAMPLE_CONFIG}\n! run {i}"), device, "security"
+        )
+    )
+    results["audit"] = report("audit", durations, elapsed)
+
+    if args.max_p95 is not None:
+        slow = [name for name, p95 in results.items() if p95 > args.max_p95]
+        if slow:
+            print(f"p95 above {args.max_p95}s: {', '.join(slow)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()